@@ -1,43 +1,75 @@
 # Run: uv run uvicorn api:app --reload --port 8000
 # Then open http://localhost:8000
 
-import os
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import date
 
-import anthropic
 from dotenv import load_dotenv
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from google import genai
-from openai import AsyncOpenAI
 
-from src import advisor_log, demo, portfolios
+from src import (
+    advisor_log,
+    conditional,
+    demo,
+    jobs,
+    llm_clients,
+    market_data,
+    metrics,
+    portfolios,
+    store,
+    symbols,
+)
 from src import config as exclusions
-from src.advisor import ask_committee
+from src.advisor import ask_committee, ask_committee_batch
 from src.models import TrackedPortfolio
-from src.performance import portfolio_vs_benchmarks, tracked_portfolios_performance
-from src.runner import load_all_runs, load_latest_run, run_committee
+from src.performance import (
+    DEFAULT_RANGE,
+    RANGES,
+    columnar,
+    history_start,
+    portfolio_vs_benchmarks,
+    tracked_portfolios_performance,
+    tracked_version,
+)
+from src.runner import list_runs, load_latest_run, load_run, run_committee, runs_version
 
 load_dotenv()
-exclusions.load()
-demo.ensure_demo_data()
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Kept out of import time so a cold start only pays for what the first request uses
+    demo.ensure_demo_data()
+    # One set of pooled provider clients for every request; built on first use
+    app.state.llm_clients = llm_clients.LLMClients()
+    try:
+        yield
+    finally:
+        await app.state.llm_clients.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
+# Level 6: most of level 9's ratio on JSON at a fraction of the CPU
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
+_ADVISOR_BATCH_MAX_TICKERS = 100
+_MAX_CHART_POINTS = 5000
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 
-def _clients():
+def _clients(request: Request) -> llm_clients.Clients:
     if demo.is_demo_mode():
         raise HTTPException(
             status_code=503,
             detail=f"Demo mode: add {', '.join(demo._REQUIRED_KEYS)} to .env to enable live AI runs",
         )
-    return (
-        anthropic.AsyncAnthropic(),
-        AsyncOpenAI(),
-        genai.Client(api_key=os.environ["GOOGLE_API_KEY"]),
-    )
+    return request.app.state.llm_clients.get()
 
 
 @app.get("/")
@@ -50,48 +82,159 @@ async def favicon():
     return FileResponse("static/favicon.svg", media_type="image/svg+xml")
 
 
+# (runs directory mtime_ns, settings (change count, saved at))
+RunsVersion = tuple[int, tuple[int, float]]
+
+
+def _runs_version() -> RunsVersion:
+    # Run summaries and run payloads both filter by the current exclusions
+    return runs_version(), exclusions.version()
+
+
+def _runs_last_modified() -> float:
+    runs_mtime_ns, (_, settings_saved_at) = _runs_version()
+    return max(runs_mtime_ns / 1e9, settings_saved_at)
+
+
 @app.get("/api/runs")
-async def get_runs():
-    runs = load_all_runs()
-    return [r.model_dump(mode="json") for r in runs]
+async def get_runs(
+    request: Request,
+    limit: int = Query(20, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+):
+    return await conditional.json_response(
+        request.headers,
+        lambda: ("runs", *_runs_version(), limit, offset),
+        lambda: list_runs(limit, offset),
+        _runs_last_modified(),
+    )
 
 
 @app.get("/api/runs/latest")
-async def get_latest_run():
-    run = load_latest_run()
+async def get_latest_run(request: Request):
+    def build() -> dict:
+        run = load_latest_run()
+        if not run:
+            raise HTTPException(status_code=404, detail="No runs yet")
+        return run.model_dump(mode="json")
+
+    return await conditional.json_response(
+        request.headers,
+        lambda: ("latest", *_runs_version()),
+        build,
+        _runs_last_modified(),
+    )
+
+
+@app.get("/api/runs/{run_id}")
+async def get_run(run_id: str):
+    run = load_run(run_id)
     if not run:
-        raise HTTPException(status_code=404, detail="No runs yet")
+        raise HTTPException(status_code=404, detail=f"Run '{run_id}' not found")
     return run.model_dump(mode="json")
 
 
-@app.post("/api/runs")
-async def trigger_run():
-    ac, oc, gc = _clients()
-    run = await run_committee(ac, oc, gc)
-    return run.model_dump(mode="json")
+@app.post("/api/runs", status_code=202)
+async def trigger_run(request: Request):
+    ac, oc, gc = _clients(request)
+
+    async def work() -> dict:
+        run = await run_committee(ac, oc, gc)
+        return run.model_dump(mode="json")
+
+    job, created = jobs.submit(work)
+    return {**job.snapshot(), "coalesced": not created}
+
+
+@app.get("/api/runs/jobs/current")
+async def get_current_run_job():
+    job = jobs.current()
+    if not job:
+        raise HTTPException(status_code=404, detail="No run in progress")
+    return job.snapshot()
+
+
+@app.get("/api/runs/jobs/{job_id}")
+async def get_run_job(job_id: str):
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job.snapshot()
+
+
+@app.get("/api/runs/jobs/{job_id}/events")
+async def stream_run_job(job_id: str, request: Request):
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    # EventSource resends the last id it saw when it reconnects
+    last_id = request.headers.get("last-event-id", "")
+    start = int(last_id) + 1 if last_id.isdigit() else 0
+
+    async def events():
+        async for i, event in job.follow(start):
+            yield f"id: {i}\nevent: {event['stage']}\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _check_range(range_: str) -> None:
+    if range_ not in RANGES:
+        raise HTTPException(
+            status_code=400, detail=f"range must be one of {', '.join(RANGES)}"
+        )
 
 
 @app.get("/api/performance")
-async def get_performance(tickers: str, weights: str):
+async def get_performance(
+    tickers: str,
+    weights: str,
+    range_: str = Query(DEFAULT_RANGE, alias="range"),
+    max_points: int | None = Query(None, ge=3, le=_MAX_CHART_POINTS),
+):
     if not tickers or not weights:
         raise HTTPException(status_code=400, detail="No portfolio holdings to analyze")
+    _check_range(range_)
     try:
         ticker_list = tickers.split(",")
         weight_list = [float(w) for w in weights.split(",")]
-        data = portfolio_vs_benchmarks(ticker_list, weight_list)
+        # Downloads and backs off with time.sleep: keep it off the event loop,
+        # which also runs committee jobs and their progress streams
+        data = await asyncio.to_thread(
+            portfolio_vs_benchmarks, ticker_list, weight_list, since=history_start(range_)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    return data
+    return columnar(data, range_, max_points)
+
+
+@app.get("/api/symbols")
+async def get_symbols(q: str = "", limit: int = Query(10, ge=1, le=50)):
+    return symbols.search(q, limit)
+
+
+@app.get("/api/market-data/stats")
+async def get_market_data_stats():
+    return market_data.stats()
+
+
+@app.get("/api/metrics")
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.post("/api/advisor")
-async def get_advisor_opinion(payload: dict):
+async def get_advisor_opinion(request: Request, payload: dict):
     ticker = payload.get("ticker", "").upper().strip()
     if not ticker:
         raise HTTPException(status_code=400, detail="ticker required")
     latest = load_latest_run()
     portfolio = latest.portfolio if latest else []
-    ac, oc, gc = _clients()
+    ac, oc, gc = _clients(request)
     try:
         advice = await ask_committee(ticker, ac, oc, gc, portfolio)
     except Exception as e:
@@ -100,34 +243,97 @@ async def get_advisor_opinion(payload: dict):
     return advice.model_dump(mode="json")
 
 
+@app.post("/api/advisor/batch")
+async def get_advisor_batch(request: Request, payload: dict):
+    tickers = payload.get("tickers") or []
+    if not isinstance(tickers, list) or not all(isinstance(t, str) for t in tickers):
+        raise HTTPException(status_code=400, detail="tickers must be a list of strings")
+    if not any(t.strip() for t in tickers):
+        raise HTTPException(status_code=400, detail="tickers required")
+    if len(tickers) > _ADVISOR_BATCH_MAX_TICKERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {_ADVISOR_BATCH_MAX_TICKERS} tickers per batch",
+        )
+    latest = load_latest_run()
+    portfolio = latest.portfolio if latest else []
+    ac, oc, gc = _clients(request)
+
+    async def results():
+        # One NDJSON line per ticker as it completes; the log is written once
+        # at the end, including when the client disconnects part-way through.
+        answered = []
+        try:
+            async for query, result in ask_committee_batch(tickers, ac, oc, gc, portfolio):
+                if isinstance(result, Exception):
+                    line = {"query": query, "error": str(result)}
+                else:
+                    answered.append(result)
+                    line = {"query": query, "result": result.model_dump(mode="json")}
+                yield json.dumps(line) + "\n"
+        finally:
+            advisor_log.append_many(answered)
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
 @app.get("/api/advisor/log")
-async def get_advisor_log():
-    return advisor_log.load()
+async def get_advisor_log(
+    request: Request,
+    ticker: str | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    recommendation: str | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+):
+    changes, changed_at = store.version("advisor_log")
+    return await conditional.json_response(
+        request.headers,
+        lambda: ("advisor_log", changes, str(request.query_params)),
+        lambda: advisor_log.query(ticker, start, end, recommendation, limit, offset),
+        changed_at,
+    )
+
+
+@app.get("/api/advisor/log.csv")
+async def export_advisor_log(
+    ticker: str | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    recommendation: str | None = None,
+):
+    return StreamingResponse(
+        advisor_log.iter_csv(ticker, start, end, recommendation),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="advisor_log.csv"'},
+    )
 
 
 @app.get("/api/settings")
 async def get_settings():
+    current = exclusions.current()
     return {
-        "excluded_tickers": sorted(exclusions.EXCLUDED_TICKERS),
-        "excluded_sectors": sorted(exclusions.EXCLUDED_SECTORS),
+        "excluded_tickers": sorted(current.tickers),
+        "excluded_sectors": sorted(current.sectors),
     }
 
 
 @app.put("/api/settings")
 async def update_settings(payload: dict):
-    if "excluded_tickers" in payload:
-        exclusions.EXCLUDED_TICKERS.clear()
-        exclusions.EXCLUDED_TICKERS.update(payload["excluded_tickers"])
-    if "excluded_sectors" in payload:
-        exclusions.EXCLUDED_SECTORS.clear()
-        exclusions.EXCLUDED_SECTORS.update(payload["excluded_sectors"])
-    exclusions.save()
+    exclusions.update(
+        tickers=payload.get("excluded_tickers"), sectors=payload.get("excluded_sectors")
+    )
     return {"ok": True}
 
 
 @app.get("/api/portfolios")
-async def get_portfolios():
-    return await portfolios.get_enriched_portfolios()
+async def get_portfolios(request: Request):
+    return await conditional.json_response(
+        request.headers,
+        portfolios.enriched_version,
+        portfolios.get_enriched_portfolios,
+    )
 
 
 @app.put("/api/portfolios")
@@ -138,11 +344,8 @@ async def save_portfolios(payload: list[TrackedPortfolio]):
 
 @app.delete("/api/portfolios/{name}")
 async def delete_portfolio(name: str):
-    tracked = portfolios.load()
-    updated = [p for p in tracked if p.name != name]
-    if len(updated) == len(tracked):
+    if not portfolios.delete(name):
         raise HTTPException(status_code=404, detail=f"Portfolio '{name}' not found")
-    portfolios.save(updated)
     return {"ok": True}
 
 
@@ -161,25 +364,66 @@ async def import_portfolio(name: str = Form(...), file: UploadFile = File(...)):
     if not positions:
         raise HTTPException(status_code=400, detail="No valid positions found in file")
 
-    tracked = portfolios.load()
-    tracked = [p for p in tracked if p.name != name]
-    tracked.append(TrackedPortfolio(name=name, positions=positions))
-    portfolios.save(tracked)
+    portfolios.upsert(TrackedPortfolio(name=name, positions=positions))
     return {"name": name, "count": len(positions)}
 
 
+# Parsing the latest run dominates a conditional GET; it only changes with the
+# runs directory or the exclusions
+_committee_memo: dict[RunsVersion, dict | None] = {}
+
+
+def _committee_holdings() -> dict | None:
+    stamp = _runs_version()
+    if stamp not in _committee_memo:
+        latest = load_latest_run()
+        _committee_memo.clear()
+        _committee_memo[stamp] = (
+            {
+                "tickers": [h.ticker for h in latest.portfolio],
+                "weights": [h.weight for h in latest.portfolio],
+            }
+            if latest
+            else None
+        )
+    return _committee_memo[stamp]
+
+
 @app.get("/api/portfolios/performance")
-async def get_portfolios_performance():
+async def get_portfolios_performance(
+    request: Request,
+    range_: str = Query(DEFAULT_RANGE, alias="range"),
+    max_points: int | None = Query(None, ge=3, le=_MAX_CHART_POINTS),
+):
+    _check_range(range_)
     tracked = portfolios.load()
-    latest = load_latest_run()
-    committee = None
-    if latest:
-        committee = {
-            "tickers": [h.ticker for h in latest.portfolio],
-            "weights": [h.weight for h in latest.portfolio],
-        }
-    try:
-        data = tracked_portfolios_performance(tracked, committee=committee)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    return data
+    since = history_start(range_)
+    committee = _committee_holdings()
+
+    def version() -> tuple | None:
+        computed = tracked_version(tracked, since=since, committee=committee)
+        return computed and (computed, range_, max_points, date.today())
+
+    async def build() -> dict:
+        try:
+            data = await asyncio.to_thread(
+                tracked_portfolios_performance, tracked, since=since, committee=committee
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        return columnar(data, range_, max_points)
+
+    return await conditional.json_response(request.headers, version, build)
+
+
+@app.get("/api/portfolios/tracker")
+async def get_tracker(
+    intraday: bool = False,
+    range_: str = Query(DEFAULT_RANGE, alias="range"),
+    max_points: int | None = Query(None, ge=3, le=_MAX_CHART_POINTS),
+):
+    """Enriched portfolios + performance from a single price acquisition."""
+    _check_range(range_)
+    return await portfolios.get_tracker(
+        _committee_holdings(), intraday=intraday, range_=range_, max_points=max_points
+    )
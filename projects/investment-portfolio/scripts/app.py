@@ -23,7 +23,6 @@ from src.performance import portfolio_vs_benchmarks
 from src.runner import load_all_runs, load_latest_run, run_committee
 
 load_dotenv()
-exclusions.load()
 
 st.set_page_config(page_title="Investment Committee", layout="wide")
 
@@ -849,38 +848,35 @@ with tab_settings:
 
     with col_tickers:
         st.subheader("Excluded Tickers")
-        for _ticker in sorted(exclusions.EXCLUDED_TICKERS):
+        _excluded = exclusions.current()
+        for _ticker in sorted(_excluded.tickers):
             _c1, _c2 = st.columns([5, 1])
             _c1.text(_ticker)
             if _c2.button("✕", key=f"rm_ticker_{_ticker}"):
-                exclusions.EXCLUDED_TICKERS.discard(_ticker)
-                exclusions.save()
+                exclusions.update(tickers=_excluded.tickers - {_ticker})
                 st.rerun()
         with st.form("add_excluded_ticker", clear_on_submit=True):
             _new_ticker = (
                 st.text_input("", placeholder="Add ticker, e.g. AAPL").upper().strip()
             )
             if st.form_submit_button("Add ticker") and _new_ticker:
-                exclusions.EXCLUDED_TICKERS.add(_new_ticker)
-                exclusions.save()
+                exclusions.update(tickers=_excluded.tickers | {_new_ticker})
                 st.rerun()
 
     with col_sectors:
         st.subheader("Excluded Sectors")
-        for _sector in sorted(exclusions.EXCLUDED_SECTORS):
+        for _sector in sorted(_excluded.sectors):
             _c1, _c2 = st.columns([5, 1])
             _c1.text(_sector)
             if _c2.button("✕", key=f"rm_sector_{_sector}"):
-                exclusions.EXCLUDED_SECTORS.discard(_sector)
-                exclusions.save()
+                exclusions.update(sectors=_excluded.sectors - {_sector})
                 st.rerun()
         with st.form("add_excluded_sector", clear_on_submit=True):
             _new_sector = st.text_input(
                 "", placeholder="Add sector, e.g. Utilities"
             ).strip()
             if st.form_submit_button("Add sector") and _new_sector:
-                exclusions.EXCLUDED_SECTORS.add(_new_sector)
-                exclusions.save()
+                exclusions.update(sectors=_excluded.sectors | {_new_sector})
                 st.rerun()
 
 # ── Advisor panel ─────────────────────────────────────────────────────────────
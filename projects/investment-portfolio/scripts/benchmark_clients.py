@@ -0,0 +1,120 @@
+"""
+Provider client benchmark: fresh SDK clients per request vs the app's pooled clients.
+
+Serves the fake providers on localhost and times each member's advisor
+opinion call ``--calls`` times, one at a time, two ways. Cold builds a new
+set of SDK clients for every call — what the API did on every /api/runs and
+/api/advisor request — so each call also pays client construction and a new
+connection. Warm reuses one ``LLMClients`` set whose keep-alive pools stay
+open between calls, as every request does now. Reports median and p95
+per-call latency per provider. The fake server speaks plain HTTP, so the TLS
+handshake a cold call pays against the real APIs is not included.
+
+    uv run python scripts/benchmark_clients.py
+    uv run python scripts/benchmark_clients.py --calls 100 --latency claude=0,gpt=0,gemini=0
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import fake_providers
+
+from src.committee import claude_member, gemini_member, gpt_member
+from src.llm_clients import LLMClients
+
+MEMBERS = ("claude", "gpt", "gemini")
+_OPINION = {
+    "claude": claude_member.get_stock_opinion,
+    "gpt": gpt_member.get_stock_opinion,
+    "gemini": gemini_member.get_stock_opinion,
+}
+
+
+async def close(clients) -> None:
+    anthropic_client, openai_client, gemini_client = clients
+    await anthropic_client.close()
+    await openai_client.close()
+    await gemini_client.aio.aclose()
+
+
+async def cold(url: str, member: str, calls: int) -> list[float]:
+    """Seconds per call with a fresh client set per call (closed untimed)."""
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        clients = fake_providers.clients(url)
+        await _OPINION[member](clients[MEMBERS.index(member)], "NVDA")
+        latencies.append(time.perf_counter() - start)
+        await close(clients)
+    return latencies
+
+
+async def warm(url: str, member: str, calls: int) -> list[float]:
+    """Seconds per call on one shared pool, after an untimed first call."""
+    pool = LLMClients(url, api_key="fake")
+    client = pool.get()[MEMBERS.index(member)]
+    await _OPINION[member](client, "NVDA")
+    latencies = []
+    try:
+        for _ in range(calls):
+            start = time.perf_counter()
+            await _OPINION[member](client, "NVDA")
+            latencies.append(time.perf_counter() - start)
+    finally:
+        await pool.aclose()
+    return latencies
+
+
+def p95(values: list[float]) -> float:
+    return statistics.quantiles(values, n=20)[-1]
+
+
+async def run(args) -> dict[str, dict[str, list[float]]]:
+    config = fake_providers.FakeConfig(latency=fake_providers.parse_latency(args.latency))
+    results = {}
+    with fake_providers.serve(config) as url:
+        for member in MEMBERS:
+            results[member] = {
+                "cold": await cold(url, member, args.calls),
+                "warm": await warm(url, member, args.calls),
+            }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=50, help="timed calls per provider and mode")
+    parser.add_argument(
+        "--latency",
+        default="claude=0.01,gpt=0.01,gemini=0.01",
+        help="fake provider latency, e.g. claude=0.05,gpt=0.05",
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    print(f"\n{'─' * 72}")
+    print(f"  advisor opinion call, {args.calls} sequential calls per provider")
+    print(f"{'─' * 72}")
+    print(f"  {'provider':<10}{'cold p50':>12}{'cold p95':>12}{'warm p50':>12}{'warm p95':>12}")
+    for member, modes in results.items():
+        cold_s, warm_s = modes["cold"], modes["warm"]
+        print(
+            f"  {member:<10}"
+            f"{statistics.median(cold_s) * 1e3:>10.1f}ms{p95(cold_s) * 1e3:>10.1f}ms"
+            f"{statistics.median(warm_s) * 1e3:>10.1f}ms{p95(warm_s) * 1e3:>10.1f}ms"
+        )
+    print(f"\n{'═' * 72}")
+    for member, modes in results.items():
+        saved = statistics.median(modes["cold"]) - statistics.median(modes["warm"])
+        print(f"  {member}: warm pool saves {saved * 1e3:.1f}ms per call (median)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Offline end-to-end performance benchmark.
+
+Drives run_committee, ask_committee and tracked_portfolios_performance against
+the fake provider server (scripts/fake_providers.py) and replayed market data
+(scripts/market_fixtures.py), in a throwaway data directory, and reports
+per-stage timings. No API keys or network needed.
+
+    uv run python scripts/benchmark_e2e.py
+    uv run python scripts/benchmark_e2e.py --latency claude=2,gpt=3 --json out.json
+    uv run python scripts/benchmark_e2e.py --baseline baseline.json   # CI gate
+
+Market data comes from scripts/fixtures/e2e/market.json when one has been
+recorded, else from a synthetic fixture of ``--universe`` tickers. With
+``--baseline``, exits non-zero when any stage is slower than the baseline by
+more than ``--tolerance`` (relative) plus ``--slack`` seconds.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import fake_providers
+import market_fixtures
+
+from src import performance, price_store, runner, screener, store
+from src.advisor import ask_committee
+from src.models import PortfolioPosition, TrackedPortfolio
+from src.runner import run_committee
+
+ADVISOR_TICKERS = 10
+TRACKED_PORTFOLIOS = 3
+TRACKED_POSITIONS = 15
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile; 0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+def isolate(root: Path) -> None:
+    """Points every on-disk cache and store at ``root``."""
+    store._DATA_DIR = root
+    screener._SCREENER_CACHE_PATH = root / "screener_cache.json"
+    runner.RUNS_DIR = root / "runs"
+    price_store._STORE_DIR = root / "prices"
+    performance._PERF_CACHE_DIR = root / "perf_cache"
+
+
+async def timed(coro) -> tuple[object, float]:
+    start = time.perf_counter()
+    value = await coro
+    return value, time.perf_counter() - start
+
+
+async def bench_committee(clients, stages: dict[str, float], label: str):
+    run, elapsed = await timed(run_committee(*clients))
+    stages[f"committee.{label}.total"] = elapsed
+    for node in run.timeline:
+        stages[f"committee.{label}.{node.node}"] = node.end_s - node.start_s
+    return run
+
+
+async def bench_advisor(clients, portfolio, tickers, stages: dict[str, float], label: str):
+    latencies = []
+    for ticker in tickers:
+        _, elapsed = await timed(ask_committee(ticker, *clients, portfolio))
+        latencies.append(elapsed)
+    stages[f"advisor.{label}.p50"] = percentile(latencies, 50)
+    stages[f"advisor.{label}.p95"] = percentile(latencies, 95)
+    stages[f"advisor.{label}.total"] = sum(latencies)
+
+
+def bench_performance(portfolios, committee, stages: dict[str, float], label: str):
+    start = time.perf_counter()
+    performance.tracked_portfolios_performance(portfolios, committee=committee)
+    stages[f"performance.{label}"] = time.perf_counter() - start
+
+
+async def run(args) -> dict[str, float]:
+    fixture = market_fixtures.load(args.fixture) or market_fixtures.synthesize(args.universe)
+    print(
+        f"Market fixture: {fixture['source']}, "
+        f"{len(fixture['finviz']['financial']['rows'])} tickers"
+    )
+    universe = [r["Ticker"] for r in fixture["finviz"]["financial"]["rows"]]
+    rng = random.Random(0)
+    advisor_tickers = rng.sample(universe, min(args.advisor_tickers, len(universe)))
+    tracked = [
+        TrackedPortfolio(
+            name=f"Tracked {i + 1}",
+            positions=[
+                PortfolioPosition(ticker=t, shares=rng.randint(1, 100))
+                for t in rng.sample(universe, min(TRACKED_POSITIONS, len(universe)))
+            ],
+        )
+        for i in range(TRACKED_PORTFOLIOS)
+    ]
+
+    stages: dict[str, float] = {}
+    config = fake_providers.FakeConfig(
+        latency=fake_providers.parse_latency(args.latency), jitter=args.jitter
+    )
+    with (
+        tempfile.TemporaryDirectory() as tmp,
+        fake_providers.serve(config) as url,
+        market_fixtures.replay(fixture, args.market_latency_scale),
+    ):
+        isolate(Path(tmp))
+        clients = fake_providers.clients(url)
+
+        committee_run = await bench_committee(clients, stages, "cold")
+        await bench_committee(clients, stages, "cached")
+
+        portfolio = committee_run.portfolio
+        await bench_advisor(clients, portfolio, advisor_tickers, stages, "cold")
+        await bench_advisor(clients, portfolio, advisor_tickers, stages, "cached")
+
+        committee = {
+            "tickers": [h.ticker for h in portfolio],
+            "weights": [h.weight for h in portfolio],
+        }
+        bench_performance(tracked, committee, stages, "cold")
+        bench_performance(tracked, committee, stages, "cached")
+    print(f"Provider calls: {config.calls}")
+    return stages
+
+
+def regressions(
+    stages: dict[str, float], baseline: dict[str, float], tolerance: float, slack: float
+) -> list[str]:
+    return [
+        f"{name}: {stages[name]:.3f}s vs baseline {base:.3f}s"
+        for name, base in baseline.items()
+        if name in stages and stages[name] > base * (1 + tolerance) + slack
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n\n")[0])
+    parser.add_argument("--fixture", type=Path, default=market_fixtures.FIXTURE_PATH)
+    parser.add_argument("--universe", type=int, default=300, help="synthetic universe size")
+    parser.add_argument("--latency", default="", help="LLM latency, e.g. claude=2,gpt=3")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--market-latency-scale", type=float, default=1.0)
+    parser.add_argument("--advisor-tickers", type=int, default=ADVISOR_TICKERS)
+    parser.add_argument("--json", type=Path, help="write stage timings as JSON")
+    parser.add_argument("--baseline", type=Path, help="fail on regression against this JSON")
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    parser.add_argument("--slack", type=float, default=0.25, help="absolute seconds allowed")
+    args = parser.parse_args()
+
+    stages = asyncio.run(run(args))
+
+    print(f"\n{'─' * 60}")
+    print("  STAGE TIMINGS")
+    print(f"{'─' * 60}")
+    for name, seconds in stages.items():
+        print(f"  {seconds:8.3f}s  {name}")
+
+    if args.json:
+        args.json.write_text(json.dumps(stages, indent=2))
+
+    if args.baseline:
+        failed = regressions(
+            stages, json.loads(args.baseline.read_text()), args.tolerance, args.slack
+        )
+        print(f"\n{'═' * 60}")
+        if failed:
+            print("  REGRESSIONS")
+            print(f"{'═' * 60}")
+            for line in failed:
+                print(f"  ✗ {line}")
+            sys.exit(1)
+        print(f"  ✓ within {args.tolerance:.0%} + {args.slack:.2f}s of baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Performance payload benchmark: timestamp-keyed series vs columnar arrays.
+
+Builds a synthetic tracked-portfolios result (``--portfolios`` series over
+``--years`` of business days) in the shape ``performance`` computes and caches,
+then compares JSON size and encode time of the raw result against
+``performance.columnar`` for each chart range.
+
+    uv run python scripts/benchmark_payloads.py
+    uv run python scripts/benchmark_payloads.py --portfolios 20 --years 5 --max-points 500
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import performance
+
+
+def synthetic_result(n_series: int, years: int) -> dict:
+    idx = pd.bdate_range(end=date.today(), periods=years * 252)
+    rng = np.random.default_rng(0)
+    walks = np.exp(np.cumsum(rng.normal(0.0004, 0.012, (len(idx), n_series)), axis=0))
+    result = {}
+    for j in range(n_series):
+        series = pd.Series(walks[:, j] / walks[0, j], index=idx)
+        result[f"Portfolio {j + 1}"] = {
+            "type": "portfolio",
+            "total_return_pct": round(float((series.iloc[-1] - 1) * 100), 2),
+            "series": performance._series_dict(series),
+        }
+    return result
+
+
+def encode(payload: dict, repeat: int) -> tuple[int, float]:
+    """(bytes, seconds per encode) of ``payload`` as the API serializes it."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = json.dumps(payload).encode()
+    return len(body), (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n\n")[0])
+    parser.add_argument("--portfolios", type=int, default=10)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--max-points", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    result = synthetic_result(args.portfolios, args.years)
+    raw_bytes, raw_s = encode(result, args.repeat)
+
+    print(f"\n{'─' * 72}")
+    print(f"  {args.portfolios} series × {args.years}y daily, max_points={args.max_points}")
+    print(f"{'─' * 72}")
+    print(f"  {'payload':<18}{'bytes':>12}{'encode':>12}{'slice':>12}{'size ×':>10}{'time ×':>8}")
+    print(f"  {'raw series dict':<18}{raw_bytes:>12,}{raw_s * 1e3:>10.2f}ms{'':>12}")
+    for range_ in ("1M", "YTD", "1Y", "5Y"):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            payload = performance.columnar(result, range_, args.max_points)
+        slice_s = (time.perf_counter() - start) / args.repeat
+        size, encode_s = encode(payload, args.repeat)
+        print(
+            f"  {'columnar ' + range_:<18}{size:>12,}{encode_s * 1e3:>10.2f}ms"
+            f"{slice_s * 1e3:>10.2f}ms{raw_bytes / size:>9.1f}×{raw_s / encode_s:>7.1f}×"
+        )
+
+
+if __name__ == "__main__":
+    main()
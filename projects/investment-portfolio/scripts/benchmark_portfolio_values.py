@@ -0,0 +1,121 @@
+"""
+Benchmark tracked-portfolio valuation: per-ticker Series loop vs one matmul.
+
+Synthetic workload: 50 portfolios × 200 tickers × 5 years of daily bars,
+plus the committee and the SPY/VTI benchmarks, valued the way
+tracked_portfolios_performance does it.
+
+    uv run python scripts/benchmark_portfolio_values.py
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from src.performance import _holding_values
+
+REPEATS = 5
+POSITIONS_PER_PORTFOLIO = 120
+
+
+def synthetic_closes(tickers: int, years: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=252 * years)
+    walks = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(idx), tickers)), axis=0))
+    columns = [f"T{i:03d}" for i in range(tickers)]
+    closes = pd.DataFrame(walks, index=idx, columns=columns)
+    closes["SPY"] = walks.mean(axis=1)
+    closes["VTI"] = walks.mean(axis=1) * 0.5
+    # Sprinkle holidays/halts so forward-fill has work to do
+    holes = rng.random(closes.shape) < 0.01
+    holes[0] = False
+    return closes.mask(holes)
+
+
+def synthetic_holdings(
+    tickers: list[str], portfolios: int, seed: int = 42
+) -> list[tuple[str, dict[str, float]]]:
+    rng = np.random.default_rng(seed)
+    # Fewer tickers than positions: every portfolio holds the whole universe
+    positions = min(POSITIONS_PER_PORTFOLIO, len(tickers))
+    holdings = []
+    for i in range(portfolios):
+        chosen = rng.choice(tickers, positions, replace=False)
+        holdings.append((f"P{i}", {t: float(rng.integers(1, 500)) for t in chosen}))
+    committee = rng.choice(tickers, min(25, len(tickers)), replace=False)
+    holdings.append(("committee", {t: 4.0 for t in committee}))
+    holdings.append(("spy", {"SPY": 1.0}))
+    holdings.append(("vti", {"VTI": 1.0}))
+    return holdings
+
+
+def legacy_values(
+    closes: pd.DataFrame, holdings: list[tuple[str, dict[str, float]]]
+) -> dict[str, pd.Series]:
+    out = {}
+    for name, shares in holdings:
+        daily_value = pd.Series(0.0, index=closes.index)
+        for t, s in shares.items():
+            daily_value += s * closes[t].ffill()
+        out[name] = daily_value
+    return out
+
+
+def matrix_values(
+    closes: pd.DataFrame, holdings: list[tuple[str, dict[str, float]]]
+) -> dict[str, pd.Series]:
+    values = _holding_values(closes.ffill(), [h for _, h in holdings])
+    return {
+        name: pd.Series(values[:, j], index=closes.index)
+        for j, (name, _) in enumerate(holdings)
+    }
+
+
+def time_it(fn, *args) -> tuple[float, dict]:
+    timings = []
+    result = {}
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn(*args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def main(portfolios: int, tickers: int, years: int) -> None:
+    closes = synthetic_closes(tickers, years)
+    names = [c for c in closes.columns if c.startswith("T")]
+    holdings = synthetic_holdings(names, portfolios)
+    print(
+        f"{portfolios} portfolios × {tickers} tickers × {len(closes)} bars "
+        f"(+ committee, SPY, VTI), {REPEATS} repeats\n"
+    )
+
+    legacy_med, legacy = time_it(legacy_values, closes, holdings)
+    matrix_med, matrix = time_it(matrix_values, closes, holdings)
+
+    for name in legacy:
+        if not np.allclose(legacy[name], matrix[name], equal_nan=True):
+            raise SystemExit(f"✗ Matrix valuation disagrees with legacy loop for {name}")
+
+    print(f"{'─' * 60}")
+    print(f"  Series loop (legacy)   median {legacy_med * 1000:8.1f}ms")
+    print(f"  Single matmul          median {matrix_med * 1000:8.1f}ms")
+    print(f"  Speedup:               {legacy_med / matrix_med:.1f}×")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--portfolios", type=int, default=50)
+    parser.add_argument("--tickers", type=int, default=200)
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+    if args.tickers < 1:
+        parser.error("--tickers must be at least 1")
+    main(args.portfolios, args.tickers, args.years)
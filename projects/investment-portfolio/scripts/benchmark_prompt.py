@@ -0,0 +1,161 @@
+"""
+Prompt encoding benchmark: verbose per-stock lines vs the compact table.
+
+Screens a replayed market fixture (synthetic unless one was recorded), encodes
+the result three ways — the legacy one-line-per-stock format, the compact
+table with no budget and the compact table at ``--budget`` tokens — and sends
+each to all three members' picks calls on the fake providers, whose latency
+grows with prompt size (``--prefill`` seconds per 1k prompt tokens, standing
+in for time-to-first-token). Reports input tokens per member and the picks
+round latency.
+
+    uv run python scripts/benchmark_prompt.py
+    uv run python scripts/benchmark_prompt.py --universe 1500 --budget 3000 --prefill 0.4
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import fake_providers
+import market_fixtures
+from benchmark_e2e import isolate
+
+from src import screener
+from src.committee import claude_member, gemini_member, gpt_member
+from src.screener import ScreenedStock
+
+MEMBERS = ("claude", "gpt", "gemini")
+
+
+# ── Legacy: one English line per stock (pre-table format_for_prompt) ───────
+
+
+def legacy_format(stocks: list[ScreenedStock]) -> str:
+    if not stocks:
+        return ""
+
+    def stock_line(s: ScreenedStock) -> str:
+        metrics: list[str] = []
+        if s.gross_margin is not None:
+            metrics.append(f"gross margin {s.gross_margin:.0%}")
+        if s.roe is not None:
+            metrics.append(f"ROE {s.roe:.0%}")
+        if s.roic is not None:
+            metrics.append(f"ROIC {s.roic:.0%}")
+        if s.operating_margin is not None:
+            metrics.append(f"oper margin {s.operating_margin:.0%}")
+        if s.earnings_date is not None:
+            metrics.append(f"earnings {s.earnings_date}")
+        metric_str = ", ".join(metrics) if metrics else "metrics unavailable"
+        industry_str = f" [{s.industry}]" if s.industry else ""
+        return f"{s.ticker} ({s.company_name}){industry_str} — {metric_str}"
+
+    suggestions = sorted([s for s in stocks if s.tier == "suggestion"], key=lambda x: x.ticker)
+    opportunities = sorted([s for s in stocks if s.tier == "opportunity"], key=lambda x: x.ticker)
+    lines: list[str] = []
+    if suggestions:
+        lines.append("SUGGESTIONS — quality compounders (ROE ≥ 20%, pick primarily from here):")
+        lines.extend(stock_line(s) for s in suggestions)
+    if opportunities:
+        if lines:
+            lines.append("")
+        lines.append(
+            "OPPORTUNITIES — turnaround/recovery plays (negative ROE but strong FCF; higher risk, use sparingly):"
+        )
+        lines.extend(stock_line(s) for s in opportunities)
+    lines.append("")
+    lines.append("Pick only from the stocks listed above.")
+    return "\n".join(lines)
+
+
+# ── Benchmark ──────────────────────────────────────────────────────────────
+
+
+async def picks_round(clients, section: str) -> float:
+    """Seconds for all three members' picks calls, run concurrently as in a
+    committee run."""
+    anthropic_client, openai_client, gemini_client = clients
+    start = time.perf_counter()
+    await asyncio.gather(
+        claude_member.get_picks(anthropic_client, section),
+        gpt_member.get_picks(openai_client, section),
+        gemini_member.get_picks(gemini_client, section),
+    )
+    return time.perf_counter() - start
+
+
+async def run(args) -> list[dict]:
+    fixture = market_fixtures.load(args.fixture) or market_fixtures.synthesize(args.universe)
+    config = fake_providers.FakeConfig(
+        latency=fake_providers.parse_latency(args.latency), prefill_per_1k=args.prefill
+    )
+    results = []
+    with (
+        tempfile.TemporaryDirectory() as tmp,
+        fake_providers.serve(config) as url,
+        market_fixtures.replay(fixture, latency_scale=0),
+    ):
+        isolate(Path(tmp))
+        stocks = await screener.screen_universe()
+        encodings = {
+            "verbose lines": legacy_format(stocks),
+            "compact table": screener.format_for_prompt(stocks, max_tokens=10**9),
+            f"compact @{args.budget}": screener.format_for_prompt(stocks, args.budget),
+        }
+        print(f"Screened {len(stocks)} stocks from a {fixture['source']} fixture")
+        clients = fake_providers.clients(url)
+        for name, section in encodings.items():
+            before = dict(config.input_tokens)
+            latencies = [await picks_round(clients, section) for _ in range(args.repeat)]
+            results.append(
+                {
+                    "encoding": name,
+                    "chars": len(section),
+                    "tokens": {
+                        m: (config.input_tokens.get(m, 0) - before.get(m, 0)) // args.repeat
+                        for m in MEMBERS
+                    },
+                    "latency": statistics.median(latencies),
+                }
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n\n")[0])
+    parser.add_argument("--fixture", type=Path, default=market_fixtures.FIXTURE_PATH)
+    parser.add_argument("--universe", type=int, default=800, help="synthetic universe size")
+    parser.add_argument("--budget", type=int, default=screener.DEFAULT_PROMPT_TOKEN_BUDGET)
+    parser.add_argument("--latency", default="", help="LLM latency, e.g. claude=2,gpt=3")
+    parser.add_argument("--prefill", type=float, default=0.25, help="seconds per 1k prompt tokens")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    base = results[0]
+
+    print(f"\n{'─' * 78}")
+    print(f"  picks prompts, {args.prefill}s per 1k prompt tokens, median of {args.repeat}")
+    print(f"{'─' * 78}")
+    print(f"  {'encoding':<18}{'chars':>9}" + "".join(f"{m + ' tok':>12}" for m in MEMBERS) + f"{'picks':>10}")
+    for r in results:
+        tokens = "".join(f"{r['tokens'][m]:>12,}" for m in MEMBERS)
+        print(f"  {r['encoding']:<18}{r['chars']:>9,}{tokens}{r['latency']:>9.2f}s")
+    print(f"\n{'═' * 78}")
+    for r in results[1:]:
+        saved = 1 - sum(r["tokens"].values()) / max(1, sum(base["tokens"].values()))
+        print(
+            f"  {r['encoding']}: {saved:.0%} fewer input tokens, "
+            f"{base['latency'] - r['latency']:.2f}s faster than {base['encoding']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
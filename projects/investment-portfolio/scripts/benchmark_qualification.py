@@ -0,0 +1,160 @@
+"""
+Benchmark screener qualification: legacy row-wise iterrows vs vectorized masks.
+
+Runs both implementations over a synthetic Finviz financial+overview frame
+(10k rows by default) and checks they qualify the same tickers.
+
+    uv run python scripts/benchmark_qualification.py --rows 10000
+"""
+
+import argparse
+import math
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from src.screener import (
+    OPPORTUNITIES_ROE_FLOOR,
+    SUGGESTIONS_ROE_MIN,
+    ScreenedStock,
+    _qualify,
+)
+
+REPEATS = 5
+INDUSTRIES = [
+    "Software - Application",
+    "Software - Infrastructure",
+    "Semiconductors",
+    "Medical Devices",
+    "Internet Content & Information",
+    "Specialty Retail",
+    None,
+]
+
+
+def synthetic_finviz(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Merged financial+overview frame with the gaps Finviz actually returns."""
+    rng = np.random.default_rng(seed)
+    random.seed(seed)
+
+    def with_gaps(values: np.ndarray, frac: float) -> np.ndarray:
+        values = values.astype(object)
+        values[rng.random(len(values)) < frac] = None
+        return values
+
+    tickers = [f"T{i:05d}" for i in range(rows)]
+    return pd.DataFrame(
+        {
+            "Ticker": tickers,
+            "ROE": with_gaps(rng.normal(0.12, 0.2, rows).round(4), 0.03),
+            "Gross M": with_gaps(rng.uniform(0.4, 0.9, rows).round(4), 0.05),
+            "ROIC": with_gaps(rng.normal(0.1, 0.15, rows).round(4), 0.1),
+            "Oper M": with_gaps(rng.normal(0.15, 0.1, rows).round(4), 0.1),
+            "Earnings": with_gaps(
+                np.array([f"May {random.randint(1, 28)} AMC" for _ in tickers]), 0.2
+            ),
+            "Company": with_gaps(np.array([f"{t} Corp" for t in tickers]), 0.01),
+            "Sector": "Technology",
+            "Industry": [random.choice(INDUSTRIES) for _ in tickers],
+        }
+    )
+
+
+# ── Legacy: row-wise iterrows (pre-vectorization screen_universe) ──────────
+
+
+def _to_float(val) -> float | None:
+    if val is None:
+        return None
+    try:
+        f = float(val)
+        return None if math.isnan(f) else f
+    except (TypeError, ValueError):
+        return None
+
+
+def _text_or(raw, default):
+    return (
+        str(raw)
+        if raw and not (isinstance(raw, float) and math.isnan(raw))
+        else default
+    )
+
+
+def legacy_qualify(
+    merged: pd.DataFrame,
+) -> tuple[list[ScreenedStock], list[ScreenedStock]]:
+    suggestions: list[ScreenedStock] = []
+    needs_fcf: list[ScreenedStock] = []
+    for _, row in merged.iterrows():
+        ticker = str(row["Ticker"])
+        roe = _to_float(row.get("ROE"))
+        if roe is None:
+            continue
+        if roe >= SUGGESTIONS_ROE_MIN:
+            tier, bucket = "suggestion", suggestions
+        elif OPPORTUNITIES_ROE_FLOOR < roe < 0:
+            tier, bucket = "opportunity", needs_fcf
+        else:
+            continue
+        bucket.append(
+            ScreenedStock(
+                ticker=ticker,
+                company_name=_text_or(row.get("Company"), ticker),
+                industry=_text_or(row.get("Industry"), None),
+                gross_margin=_to_float(row.get("Gross M")),
+                roe=roe,
+                roic=_to_float(row.get("ROIC")),
+                operating_margin=_to_float(row.get("Oper M")),
+                earnings_date=_text_or(row.get("Earnings"), None),
+                tier=tier,
+            )
+        )
+    return suggestions, needs_fcf
+
+
+# ── Runner ─────────────────────────────────────────────────────────────────
+
+
+def time_it(fn, merged: pd.DataFrame) -> tuple[list[float], tuple]:
+    timings = []
+    result = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn(merged)
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+
+def main(rows: int) -> None:
+    merged = synthetic_finviz(rows)
+    print(f"Synthetic Finviz frame: {len(merged)} rows, {REPEATS} repeats\n")
+
+    legacy_times, legacy = time_it(legacy_qualify, merged)
+    vector_times, vector = time_it(_qualify, merged)
+
+    if legacy != vector:
+        raise SystemExit("✗ Vectorized qualification disagrees with legacy iterrows")
+
+    legacy_med = statistics.median(legacy_times)
+    vector_med = statistics.median(vector_times)
+    print(f"{'─' * 60}")
+    print(f"  Suggestions:     {len(vector[0])}")
+    print(f"  FCF candidates:  {len(vector[1])}")
+    print(f"{'─' * 60}")
+    print(f"  iterrows (legacy)   median {legacy_med * 1000:8.1f}ms")
+    print(f"  vectorized masks    median {vector_med * 1000:8.1f}ms")
+    print(f"  Speedup:            {legacy_med / vector_med:.1f}×")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    main(parser.parse_args().rows)
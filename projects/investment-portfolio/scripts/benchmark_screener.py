@@ -1,7 +1,7 @@
 # /// script
 # requires-python = ">=3.12"
 # dependencies = [
-#     "finvizfinance>=0.14.0",
+#     "finvizfinance>=1.3.0",
 #     "pytickersymbols>=1.17.10",
 #     "yahooquery>=2.3.0",
 #     "yfinance>=1.4.0",
@@ -9,285 +9,377 @@
 # ///
 
 """
-Benchmark four approaches for fetching S&P 500 + NASDAQ 100 fundamentals.
+Benchmark every fundamentals backend in src/fundamentals.py.
 
-All approaches are timed from first network call to final result.
-For per-ticker approaches (yfinance, yahooquery), a 100-ticker sample is used;
-server-side screeners (yfinance Screener, finviz) run against their full universe.
+Record once against the live upstream, then replay as often as needed:
+
+    uv run scripts/benchmark_screener.py --record      # live, writes fixtures
+    uv run scripts/benchmark_screener.py               # replays fixtures
+    uv run scripts/benchmark_screener.py --backend yahooquery --json out.json
+    uv run scripts/benchmark_screener.py --baseline    # replay + live server-side screens
+
+No fixtures are committed: replay exits with an error until --record has been
+run once on a networked machine.
+
+Recording captures every upstream request a backend makes (tickers, wall time,
+the fields in fundamentals.FIELDS) into scripts/fixtures/fundamentals/. Replay
+serves those requests back with the recorded latency, through the backend's
+own batching, concurrency bounds and — for yfinance — the shared rate-limited
+gateway, so the numbers move when backend code or settings change, not when
+Yahoo has a bad day.
+
+Reported per backend: throughput, per-ticker time-to-result percentiles,
+per-request latency percentiles and field coverage. Set FUNDAMENTALS_BACKEND
+to the winner.
+
+``--baseline`` also times the server-side yfinance Screener and Finviz screens
+live, as a reference for what a whole-universe screen costs. They are single
+requests rather than per-ticker backends, so they are not recorded or replayed
+and their numbers include whatever Yahoo and Finviz are doing at the time.
 """
 
+import argparse
 import asyncio
+import json
 import random
+import sys
 import time
-from dataclasses import dataclass, field
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
 
-from pytickersymbols import PyTickerSymbols
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src import fundamentals, market_data
+from src.fundamentals import FIELDS, FundamentalsBackend
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "fundamentals"
 SAMPLE_SIZE = 100
+
+# Server-side baseline filters, the screener's thresholds
 MIN_REVENUE_GROWTH = 0.15
 MIN_GROSS_MARGIN = 0.40
 MIN_ROE = 0.15
 MAX_DEBT_TO_EQUITY = 150  # yfinance percentage scale = 1.5x ratio
 MIN_MARKET_CAP = 2_000_000_000
 
+Request = Callable[[list[str]], dict[str, dict]]
+
 
 @dataclass
 class BenchResult:
+    backend: str
+    tickers: int
+    fetched: int
+    requests: int
+    elapsed: float
+    throughput: float
+    ttr_p50: float
+    ttr_p95: float
+    ttr_p99: float
+    request_p50: float
+    request_p95: float
+    coverage: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class BaselineResult:
     name: str
     elapsed: float
-    tickers_fetched: int
-    tickers_qualified: int
-    sample_qualified: list[str] = field(default_factory=list)
+    qualified: int
     notes: str = ""
 
 
 def get_universe() -> list[str]:
+    from pytickersymbols import PyTickerSymbols
+
     p = PyTickerSymbols()
     sp500 = [s["symbol"] for s in p.get_stocks_by_index("S&P 500")]
     nasdaq100 = [s["symbol"] for s in p.get_stocks_by_index("NASDAQ 100")]
-    return list(set(sp500) | set(nasdaq100))
+    return sorted(set(sp500) | set(nasdaq100))
 
 
-def passes_filters(info: dict) -> bool:
-    """Lenient: only disqualify when a metric is present AND below threshold."""
-    market_cap = info.get("marketCap")
-    if market_cap is not None and market_cap < MIN_MARKET_CAP:
-        return False
-    revenue_growth = info.get("revenueGrowth")
-    if revenue_growth is not None and revenue_growth < MIN_REVENUE_GROWTH:
-        return False
-    gross_margin = info.get("grossMargins")
-    if gross_margin is not None and gross_margin < MIN_GROSS_MARGIN:
-        return False
-    roe = info.get("returnOnEquity")
-    if roe is not None and roe < MIN_ROE:
-        return False
-    debt_to_equity = info.get("debtToEquity")
-    if debt_to_equity is not None and debt_to_equity > MAX_DEBT_TO_EQUITY:
-        return False
-    return True
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile; 0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
 
 
-# ── Approach 1: yfinance per-ticker (current) ──────────────────────────────
+def _fixture_path(name: str) -> Path:
+    return FIXTURE_DIR / f"{name}.json"
 
 
-async def bench_yfinance(tickers: list[str]) -> BenchResult:
-    import yfinance as yf
+def _trim(info: dict | None) -> dict | None:
+    return {k: info[k] for k in FIELDS if info.get(k) is not None} if info else None
 
-    sem = asyncio.Semaphore(20)
 
-    async def fetch(ticker: str) -> tuple[str, dict] | None:
-        async with sem:
-            try:
-                info = await asyncio.to_thread(lambda: yf.Ticker(ticker).info)
-                return ticker, info
-            except Exception:
-                return None
+# ── Transports ─────────────────────────────────────────────────────────────
 
-    start = time.perf_counter()
-    raw = await asyncio.gather(*[fetch(t) for t in tickers])
-    elapsed = time.perf_counter() - start
 
-    fetched = [r for r in raw if r is not None]
-    qualified = [t for t, info in fetched if passes_filters(info)]
+def _recording(live: Request, calls: list[dict]) -> Request:
+    def request(tickers: list[str]) -> dict[str, dict]:
+        start = time.perf_counter()
+        result = live(tickers)
+        calls.append(
+            {
+                "tickers": list(tickers),
+                "elapsed": time.perf_counter() - start,
+                "result": {t: _trim(result.get(t)) for t in tickers},
+            }
+        )
+        return result
 
-    return BenchResult(
-        name="yfinance per-ticker (current)",
-        elapsed=elapsed,
-        tickers_fetched=len(fetched),
-        tickers_qualified=len(qualified),
-        sample_qualified=sorted(qualified)[:10],
-        notes=f"20 concurrent, {SAMPLE_SIZE}-ticker sample — extrapolate ×{517 // SAMPLE_SIZE} for full universe",
-    )
+    return request
 
 
-# ── Approach 2: yahooquery bulk ────────────────────────────────────────────
+def _replaying(calls: list[dict]) -> Request:
+    by_batch = {tuple(c["tickers"]): c for c in calls}
+    by_ticker = {t: c for c in calls for t in c["tickers"]}
 
+    def request(tickers: list[str]) -> dict[str, dict]:
+        call = by_batch.get(tuple(tickers))
+        # Re-batched since recording: as slow as the slowest call it draws on
+        hits = [call] if call else [by_ticker[t] for t in tickers if t in by_ticker]
+        time.sleep(max((c["elapsed"] for c in hits), default=0.0))
+        return {
+            t: by_ticker[t]["result"][t]
+            for t in tickers
+            if t in by_ticker and by_ticker[t]["result"][t]
+        }
 
-def bench_yahooquery(tickers: list[str]) -> BenchResult:
-    from yahooquery import Ticker
+    return request
 
-    start = time.perf_counter()
-    t = Ticker(tickers, asynchronous=False, max_workers=20)
-    financial = (
-        t.financial_data
-    )  # revenueGrowth, grossMargins, returnOnEquity, debtToEquity
-    key_stats = t.key_stats  # marketCap lives here
-
-    elapsed = time.perf_counter() - start
-
-    qualified: list[str] = []
-    for ticker in tickers:
-        fin = financial.get(ticker, {})
-        stats = key_stats.get(ticker, {})
-        if not isinstance(fin, dict) or not isinstance(stats, dict):
-            continue
-        mapped = {
-            "revenueGrowth": fin.get("revenueGrowth"),
-            "grossMargins": fin.get("grossMargins"),
-            "returnOnEquity": fin.get("returnOnEquity"),
-            "debtToEquity": fin.get("debtToEquity"),
-            "marketCap": stats.get("marketCap"),
-        }
-        if passes_filters(mapped):
-            qualified.append(ticker)
 
+def _timed(request: Request, latencies: list[float]) -> Request:
+    def timed(tickers: list[str]) -> dict[str, dict]:
+        start = time.perf_counter()
+        try:
+            return request(tickers)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    return timed
+
+
+@contextmanager
+def _transport(backend: FundamentalsBackend, wrap: Callable[[Request], Request]):
+    """Routes both upstream paths — ``yf.Ticker(t).info`` behind the gateway
+    and, where the backend has one, its blocking ``_request`` — through
+    ``wrap(live request)``, with a fresh gateway so nothing is served from an
+    earlier run's cache."""
+    real_ticker, real_gateway = market_data.yf.Ticker, market_data._gateway
+    info_request = wrap(lambda tickers: {t: real_ticker(t).info for t in tickers})
+
+    class _Ticker:
+        def __init__(self, ticker: str) -> None:
+            self._ticker = ticker
+
+        @property
+        def info(self) -> dict:
+            return info_request([self._ticker]).get(self._ticker) or {}
+
+    market_data.yf.Ticker = _Ticker
+    market_data._gateway = market_data.MarketDataGateway()
+    if hasattr(backend, "_request"):
+        backend._request = wrap(backend._request)
+    try:
+        yield
+    finally:
+        market_data.yf.Ticker = real_ticker
+        market_data._gateway = real_gateway
+
+
+# ── Runner ─────────────────────────────────────────────────────────────────
+
+
+async def bench(
+    backend: FundamentalsBackend, tickers: list[str], wrap: Callable[[Request], Request]
+) -> BenchResult:
+    latencies: list[float] = []
+    arrivals: list[float] = []
+    infos: dict[str, dict | None] = {}
+
+    with _transport(backend, lambda live: _timed(wrap(live), latencies)):
+        start = time.perf_counter()
+        async for ticker, info in backend.fetch(tickers):
+            arrivals.append(time.perf_counter() - start)
+            infos[ticker] = info
+        elapsed = time.perf_counter() - start
+
+    fetched = [info for info in infos.values() if info]
     return BenchResult(
-        name="yahooquery bulk",
+        backend=backend.name,
+        tickers=len(tickers),
+        fetched=len(fetched),
+        requests=len(latencies),
         elapsed=elapsed,
-        tickers_fetched=len(tickers),
-        tickers_qualified=len(qualified),
-        sample_qualified=sorted(qualified)[:10],
-        notes=f"batch requests, {SAMPLE_SIZE}-ticker sample",
+        throughput=len(tickers) / elapsed if elapsed else 0.0,
+        ttr_p50=percentile(arrivals, 50),
+        ttr_p95=percentile(arrivals, 95),
+        ttr_p99=percentile(arrivals, 99),
+        request_p50=percentile(latencies, 50),
+        request_p95=percentile(latencies, 95),
+        coverage={
+            f: sum(info.get(f) is not None for info in fetched) / max(len(tickers), 1)
+            for f in FIELDS
+        },
+    )
+
+
+async def record(backend: FundamentalsBackend, tickers: list[str]) -> BenchResult:
+    calls: list[dict] = []
+    result = await bench(backend, tickers, lambda live: _recording(live, calls))
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+    _fixture_path(backend.name).write_text(
+        json.dumps(
+            {
+                "backend": backend.name,
+                "recorded_at": datetime.now(timezone.utc).isoformat(),
+                "tickers": tickers,
+                "calls": calls,
+            },
+            indent=1,
+        )
     )
+    return result
 
 
-# ── Approach 3: yfinance Screener (server-side) ────────────────────────────
+async def replay(backend: FundamentalsBackend) -> BenchResult | None:
+    path = _fixture_path(backend.name)
+    if not path.exists():
+        print(f"  no fixture at {path} — run with --record first")
+        return None
+    fixture = json.loads(path.read_text())
+    return await bench(backend, fixture["tickers"], lambda live: _replaying(fixture["calls"]))
 
 
-def bench_yfinance_screener() -> BenchResult:
+# ── Server-side baselines (live only) ──────────────────────────────────────
+
+
+def bench_yfinance_screener() -> BaselineResult:
     from yfinance import EquityQuery, screen
 
+    # Field names from EquityQuery().valid_fields() — units are decimal ratios
+    query = EquityQuery(
+        "and",
+        [
+            EquityQuery("eq", ["region", "us"]),
+            EquityQuery("gt", ["totalrevenues1yrgrowth.lasttwelvemonths", MIN_REVENUE_GROWTH]),
+            EquityQuery("gt", ["grossprofitmargin.lasttwelvemonths", MIN_GROSS_MARGIN]),
+            EquityQuery("gt", ["returnonequity.lasttwelvemonths", MIN_ROE]),
+            EquityQuery("lt", ["totaldebtequity.lasttwelvemonths", MAX_DEBT_TO_EQUITY]),
+            EquityQuery("gt", ["intradaymarketcap", MIN_MARKET_CAP]),
+        ],
+    )
     start = time.perf_counter()
     try:
-        # Field names from EquityQuery().valid_fields() — units are decimal ratios
-        query = EquityQuery(
-            "and",
-            [
-                EquityQuery("eq", ["region", "us"]),
-                EquityQuery("gt", ["totalrevenues1yrgrowth.lasttwelvemonths", MIN_REVENUE_GROWTH]),
-                EquityQuery("gt", ["grossprofitmargin.lasttwelvemonths", MIN_GROSS_MARGIN]),
-                EquityQuery("gt", ["returnonequity.lasttwelvemonths", MIN_ROE]),
-                EquityQuery("lt", ["totaldebtequity.lasttwelvemonths", MAX_DEBT_TO_EQUITY]),
-                EquityQuery("gt", ["intradaymarketcap", MIN_MARKET_CAP]),
-            ],
-        )
-        resp = screen(query, size=250)
-        quotes = resp.get("quotes", [])
-        elapsed = time.perf_counter() - start
-        tickers = [q["symbol"] for q in quotes]
-        return BenchResult(
-            name="yfinance Screener (server-side)",
-            elapsed=elapsed,
-            tickers_fetched=len(tickers),
-            tickers_qualified=len(tickers),
-            sample_qualified=sorted(tickers)[:10],
-            notes="strict filters (missing metrics disqualify), full universe, single request",
-        )
+        quotes = screen(query, size=250).get("quotes", [])
     except Exception as e:
-        elapsed = time.perf_counter() - start
-        return BenchResult(
-            name="yfinance Screener (server-side)",
-            elapsed=elapsed,
-            tickers_fetched=0,
-            tickers_qualified=0,
-            notes=f"FAILED: {e}",
-        )
-
-
-# ── Approach 4: finviz server-side ─────────────────────────────────────────
+        return BaselineResult("yfinance Screener", time.perf_counter() - start, 0, f"FAILED: {e}")
+    return BaselineResult(
+        "yfinance Screener",
+        time.perf_counter() - start,
+        len(quotes),
+        "strict filters (missing metrics disqualify), one request",
+    )
 
 
-def bench_finviz() -> BenchResult:
+def bench_finviz() -> BaselineResult:
     from finvizfinance.screener.overview import Overview
 
-    # finviz uses preset buckets — exact field names and values from filter_dict
+    # Finviz only has preset buckets — exact names from its filter_dict
     filters = {
         "Sales growthqtr over qtr": "Over 15%",
         "Gross Margin": "Over 40%",
         "Return on Equity": "Over +15%",
-        "Debt/Equity": "Under 1",       # stricter than our <1.5x but no closer option
+        "Debt/Equity": "Under 1",  # stricter than our <1.5x but no closer option
         "Market Cap.": "+Mid (over $2bln)",
     }
-
     start = time.perf_counter()
     try:
         overview = Overview()
         overview.set_filter(filters_dict=filters)
         df = overview.screener_view(verbose=0)
-        elapsed = time.perf_counter() - start
-
-        if df is None or df.empty:
-            return BenchResult(
-                name="finviz (server-side)",
-                elapsed=elapsed,
-                tickers_fetched=0,
-                tickers_qualified=0,
-                notes="empty result — filter names may need adjustment",
-            )
-
-        tickers = df["Ticker"].tolist() if "Ticker" in df.columns else []
-        return BenchResult(
-            name="finviz (server-side)",
-            elapsed=elapsed,
-            tickers_fetched=len(tickers),
-            tickers_qualified=len(tickers),
-            sample_qualified=sorted(tickers)[:10],
-            notes=(
-                "bucket filters: QoQ sales growth >15%, gross margin >40%, ROE >15%, "
-                "D/E <1 (stricter than our <1.5x), market cap >$2B"
-            ),
-        )
     except Exception as e:
-        elapsed = time.perf_counter() - start
-        return BenchResult(
-            name="finviz (server-side)",
-            elapsed=elapsed,
-            tickers_fetched=0,
-            tickers_qualified=0,
-            notes=f"FAILED: {e}",
-        )
-
-
-# ── Runner ─────────────────────────────────────────────────────────────────
+        return BaselineResult("Finviz", time.perf_counter() - start, 0, f"FAILED: {e}")
+    return BaselineResult(
+        "Finviz",
+        time.perf_counter() - start,
+        0 if df is None else len(df),
+        "bucket filters, paged HTML crawl",
+    )
 
 
 def print_result(r: BenchResult) -> None:
     print(f"\n{'─' * 60}")
-    print(f"  {r.name}")
+    print(f"  {r.backend}")
     print(f"{'─' * 60}")
-    print(f"  Time:       {r.elapsed:.2f}s")
-    print(f"  Fetched:    {r.tickers_fetched}")
-    print(f"  Qualified:  {r.tickers_qualified}")
-    if r.sample_qualified:
-        print(f"  Sample:     {', '.join(r.sample_qualified)}")
-    if r.notes:
-        print(f"  Notes:      {r.notes}")
+    print(f"  Time:         {r.elapsed:.2f}s  ({r.throughput:.1f} tickers/s)")
+    print(f"  Fetched:      {r.fetched}/{r.tickers} in {r.requests} requests")
+    print(f"  Ticker p50/95/99:  {r.ttr_p50:.2f}s / {r.ttr_p95:.2f}s / {r.ttr_p99:.2f}s")
+    print(f"  Request p50/95:    {r.request_p50:.2f}s / {r.request_p95:.2f}s")
+    print("  Coverage:")
+    for f, share in r.coverage.items():
+        print(f"    {f:<20} {share:6.1%}")
 
 
 async def main() -> None:
-    print("Loading universe...")
-    universe = get_universe()
-    print(f"Universe: {len(universe)} tickers")
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--record", action="store_true", help="hit the live upstream and write fixtures")
+    parser.add_argument("--backend", action="append", choices=sorted(fundamentals.BACKENDS))
+    parser.add_argument("--sample", type=int, default=SAMPLE_SIZE)
+    parser.add_argument("--json", type=Path, help="also write results as JSON")
+    parser.add_argument(
+        "--baseline", action="store_true", help="also time the live server-side screeners"
+    )
+    args = parser.parse_args()
 
-    random.seed(42)
-    sample = random.sample(universe, min(SAMPLE_SIZE, len(universe)))
-    print(f"Sample: {len(sample)} tickers for per-ticker benchmarks\n")
+    names = args.backend or sorted(fundamentals.BACKENDS)
+    tickers: list[str] = []
+    if args.record:
+        universe = get_universe()
+        random.seed(42)
+        tickers = random.sample(universe, min(args.sample, len(universe)))
+        print(f"Recording {len(tickers)} of {len(universe)} tickers")
 
     results: list[BenchResult] = []
-
-    print("▶ Running yfinance per-ticker (current)...")
-    results.append(await bench_yfinance(sample))
-    print_result(results[-1])
-
-    print("\n▶ Running yahooquery bulk...")
-    results.append(bench_yahooquery(sample))
-    print_result(results[-1])
-
-    print("\n▶ Running yfinance Screener (server-side)...")
-    results.append(bench_yfinance_screener())
-    print_result(results[-1])
-
-    print("\n▶ Running finviz (server-side)...")
-    results.append(bench_finviz())
-    print_result(results[-1])
+    for name in names:
+        backend = fundamentals.BACKENDS[name]()
+        print(f"\n▶ {name} ({'record' if args.record else 'replay'})...")
+        result = await (record(backend, tickers) if args.record else replay(backend))
+        if result:
+            results.append(result)
+            print_result(result)
+
+    if not results and not args.record:
+        sys.exit(f"No fixtures in {FIXTURE_DIR} — run with --record first (live, needs network)")
+
+    baselines: list[BaselineResult] = []
+    if args.baseline:
+        for name, run in (("yfinance Screener", bench_yfinance_screener), ("Finviz", bench_finviz)):
+            print(f"\n▶ {name} (live)...")
+            baselines.append(await asyncio.to_thread(run))
 
     print(f"\n{'═' * 60}")
     print("  SUMMARY")
     print(f"{'═' * 60}")
-    for r in results:
-        status = "✓" if r.tickers_fetched > 0 else "✗"
-        print(f"  {status} {r.elapsed:6.2f}s  {r.name}")
+    for r in sorted(results, key=lambda r: r.elapsed):
+        covered = sum(r.coverage.values()) / len(r.coverage) if r.coverage else 0.0
+        print(
+            f"  {r.elapsed:6.2f}s  {r.throughput:6.1f}/s  p95 {r.ttr_p95:5.2f}s  "
+            f"coverage {covered:5.1%}  {r.backend}"
+        )
+    for b in baselines:
+        print(f"  {b.elapsed:6.2f}s  {b.qualified:4d} qualified  {b.name}  ({b.notes})")
+
+    if args.json:
+        args.json.write_text(
+            json.dumps([asdict(r) for r in results] + [asdict(b) for b in baselines], indent=2)
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,97 @@
+"""
+Cold-start benchmark for the FastAPI app.
+
+Imports ``api:app`` in fresh interpreters under ``python -X importtime`` and
+reports the total import time, the slowest top-level imports and any heavy
+dependency (SDKs, pandas, yfinance, ...) that got loaded eagerly — those
+should only load on first use.
+
+    uv run python scripts/benchmark_startup.py
+    uv run python scripts/benchmark_startup.py --runs 10 --max-seconds 1.0   # CI gate
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# Should only be imported by the request that needs them
+HEAVY_MODULES = (
+    "anthropic",
+    "openai",
+    "google.genai",
+    "yfinance",
+    "pandas",
+    "numpy",
+    "finvizfinance",
+    "openpyxl",
+)
+
+
+def import_times() -> list[tuple[int, str, int]]:
+    """(depth, module, cumulative µs) for every module one cold ``import api`` loads."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import api"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, name = line.removeprefix("import time:").split("|")
+        # One leading space, then two per nesting level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        times.append((depth, name.strip(), int(cumulative_us)))
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest direct imports to list")
+    parser.add_argument("--max-seconds", type=float, help="fail when the median exceeds this")
+    args = parser.parse_args()
+
+    runs = [import_times() for _ in range(args.runs)]
+    totals = [next(us for _, name, us in run if name == "api") / 1e6 for run in runs]
+    median = statistics.median(totals)
+    last = runs[-1]
+    imported = {name for _, name, _ in last}
+    loaded = [m for m in HEAVY_MODULES if m in imported]
+
+    print(f"\n{'─' * 60}")
+    print(f"  import api  ({args.runs} cold runs)")
+    print(f"{'─' * 60}")
+    print(f"  Median     : {median:.3f}s")
+    print(f"  Min / max  : {min(totals):.3f}s / {max(totals):.3f}s")
+    print("\n  Slowest direct imports (last run):")
+    # api itself is depth 0; what it imports directly is depth 1
+    direct = sorted(((us, name) for depth, name, us in last if depth == 1), reverse=True)
+    for cumulative, name in direct[: args.top]:
+        print(f"    {cumulative / 1e3:8.1f}ms  {name}")
+
+    print(f"\n{'═' * 60}")
+    failed = False
+    if loaded:
+        print(f"  ✗ loaded eagerly: {', '.join(loaded)}")
+        failed = True
+    else:
+        print("  ✓ no heavy dependencies loaded at import")
+    if args.max_seconds is not None:
+        if median > args.max_seconds:
+            print(f"  ✗ median {median:.3f}s over budget {args.max_seconds:.3f}s")
+            failed = True
+        else:
+            print(f"  ✓ median within {args.max_seconds:.3f}s budget")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""Local stand-in for the Anthropic, OpenAI and Gemini HTTP APIs.
+
+Serves just the endpoints the committee uses, with canned JSON in the exact
+shapes the real SDKs parse, after a configurable per-provider latency:
+
+    POST /v1/messages                                  Anthropic (research, picks, opinion)
+    POST /v1/responses                                 OpenAI Responses (picks)
+    POST /v1/chat/completions                          OpenAI Chat (opinion)
+    POST /v1beta/models/{model}:generateContent        Gemini (picks, opinion)
+
+Picks are drawn deterministically from the tickers listed in the screened
+section of the prompt, so downstream enrichment and aggregation see realistic
+overlap between members. Point real clients at it with ``clients(url)``.
+
+Standalone:
+    uv run python scripts/fake_providers.py --port 8765 --latency claude=2,gpt=3,gemini=1.5
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+# Seconds before each provider answers; picks calls take ``PICKS_FACTOR`` times longer
+DEFAULT_LATENCY = {"claude": 0.5, "gpt": 0.5, "gemini": 0.5}
+# Usage is reported at ~4 characters per token, like the real APIs for English
+CHARS_PER_TOKEN = 4
+PICKS_FACTOR = 4.0
+CORE_PICKS = 12
+MOONSHOT_PICKS = 3
+
+_TICKER_LINE_RE = re.compile(r"^([A-Z][A-Z0-9.\-]{0,6})\b", re.MULTILINE)
+_FALLBACK_TICKERS = ["NVDA", "MSFT", "AAPL", "AMZN", "GOOGL", "META", "AVGO", "ADBE"]
+
+
+@dataclass
+class FakeConfig:
+    latency: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_LATENCY))
+    jitter: float = 0.0  # ± fraction of latency, seeded per request body
+    # Extra seconds per 1000 prompt tokens, standing in for prefill time-to-first-token
+    prefill_per_1k: float = 0.0
+    calls: dict[str, int] = field(default_factory=dict)
+    input_tokens: dict[str, int] = field(default_factory=dict)
+
+
+def _seed(body: bytes) -> int:
+    return int.from_bytes(hashlib.sha256(body).digest()[:8], "big")
+
+
+def _tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN
+
+
+async def _delay(
+    config: FakeConfig, member: str, body: bytes, prompt: str, factor: float = 1.0
+) -> None:
+    config.calls[member] = config.calls.get(member, 0) + 1
+    config.input_tokens[member] = config.input_tokens.get(member, 0) + _tokens(prompt)
+    base = config.latency.get(member, 0.0) * factor
+    spread = random.Random(_seed(body)).uniform(-config.jitter, config.jitter)
+    prefill = config.prefill_per_1k * _tokens(prompt) / 1000
+    await asyncio.sleep(max(0.0, base * (1 + spread)) + prefill)
+
+
+def _picks(member: str, prompt: str) -> dict:
+    """Core and moonshot picks from the screened tickers in ``prompt``; members
+    share a common core so the aggregator's two-nominator rule keeps some."""
+    tickers = list(dict.fromkeys(_TICKER_LINE_RE.findall(prompt))) or _FALLBACK_TICKERS
+    shared = tickers[: CORE_PICKS // 2]
+    rest = tickers[CORE_PICKS // 2 :]
+    rng = random.Random(member)
+    own = rng.sample(rest, min(len(rest), CORE_PICKS - len(shared) + MOONSHOT_PICKS))
+
+    def pick(ticker: str) -> dict:
+        return {
+            "ticker": ticker,
+            "company_name": f"{ticker} Inc.",
+            "rationale": f"{ticker} compounds returns on capital with a widening moat.",
+            "variant_perception": f"The market underrates {ticker}'s reinvestment runway.",
+        }
+
+    core = shared + own[: CORE_PICKS - len(shared)]
+    moonshot = own[CORE_PICKS - len(shared) :] or tickers[-MOONSHOT_PICKS:]
+    return {"core": [pick(t) for t in core], "moonshot": [pick(t) for t in moonshot]}
+
+
+def _opinion(prompt: str) -> dict:
+    match = re.search(r"investing in (\S+)\?", prompt)
+    ticker = match.group(1) if match else "UNKNOWN"
+    rec = random.Random(ticker).choice(["buy", "buy", "watch", "pass"])
+    return {
+        "company_name": f"{ticker} Inc.",
+        "recommendation": rec,
+        "fits_philosophy": rec != "pass",
+        "take": f"{ticker} has durable margins; valuation is the main debate.",
+        "suggested_allocation_pct": {"buy": 4.0, "watch": 1.0, "pass": 0.0}[rec],
+    }
+
+
+def _research() -> str:
+    return (
+        "Macro: disinflation continues and rate cuts are priced in. Sector rotation "
+        "favours software and semiconductors; energy and materials lag. Earnings "
+        "season beat on margins. Catalysts: AI capex, rate path; headwinds: tariffs."
+    )
+
+
+def _text(value) -> str:
+    """Flattens Anthropic/OpenAI/Gemini content (str or nested blocks) to text."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return "\n".join(_text(v) for v in value)
+    if isinstance(value, dict):
+        return "\n".join(_text(value.get(k)) for k in ("text", "content", "parts") if k in value)
+    return ""
+
+
+def create_app(config: FakeConfig | None = None) -> FastAPI:
+    config = config or FakeConfig()
+    app = FastAPI()
+    app.state.config = config
+
+    @app.post("/v1/messages")
+    async def anthropic_messages(request: Request):
+        raw = await request.body()
+        body = json.loads(raw)
+        system = _text(body.get("system", ""))
+        prompt = system + "\n" + _text(body.get("messages", []))
+        if body.get("tools"):
+            await _delay(config, "claude", raw, prompt)
+            text = _research()
+        elif "evaluating a specific stock" in system:
+            await _delay(config, "claude", raw, prompt)
+            text = json.dumps(_opinion(prompt))
+        else:
+            await _delay(config, "claude", raw, prompt, PICKS_FACTOR)
+            text = json.dumps(_picks("claude", prompt))
+        return {
+            "id": "msg_fake",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "fake"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": _tokens(prompt), "output_tokens": _tokens(text)},
+        }
+
+    @app.post("/v1/responses")
+    async def openai_responses(request: Request):
+        raw = await request.body()
+        body = json.loads(raw)
+        prompt = _text(body.get("instructions", "")) + "\n" + _text(body.get("input", ""))
+        await _delay(config, "gpt", raw, prompt, PICKS_FACTOR)
+        text = json.dumps(_picks("gpt", prompt))
+        return {
+            "id": "resp_fake",
+            "object": "response",
+            "created_at": int(time.time()),
+            "model": body.get("model", "fake"),
+            "status": "completed",
+            "output": [
+                {
+                    "type": "message",
+                    "id": "msg_fake",
+                    "role": "assistant",
+                    "status": "completed",
+                    "content": [{"type": "output_text", "text": text, "annotations": []}],
+                }
+            ],
+            "parallel_tool_calls": True,
+            "tool_choice": "auto",
+            "tools": [],
+            "usage": {
+                "input_tokens": _tokens(prompt),
+                "output_tokens": _tokens(text),
+                "total_tokens": _tokens(prompt + text),
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens_details": {"reasoning_tokens": 0},
+            },
+        }
+
+    @app.post("/v1/chat/completions")
+    async def openai_chat(request: Request):
+        raw = await request.body()
+        body = json.loads(raw)
+        prompt = _text(body.get("messages", []))
+        await _delay(config, "gpt", raw, prompt)
+        text = json.dumps(_opinion(prompt))
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text, "refusal": None},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": _tokens(prompt),
+                "completion_tokens": _tokens(text),
+                "total_tokens": _tokens(prompt + text),
+            },
+        }
+
+    @app.post("/v1beta/models/{model}:generateContent")
+    async def gemini_generate(model: str, request: Request):
+        raw = await request.body()
+        body = json.loads(raw)
+        prompt = _text(body.get("systemInstruction", {})) + "\n" + _text(body.get("contents", []))
+        if (body.get("generationConfig") or {}).get("responseMimeType") == "application/json":
+            await _delay(config, "gemini", raw, prompt)
+            text = json.dumps(_opinion(prompt))
+        else:
+            await _delay(config, "gemini", raw, prompt, PICKS_FACTOR)
+            text = json.dumps(_picks("gemini", prompt))
+        return {
+            "candidates": [
+                {
+                    "content": {"role": "model", "parts": [{"text": text}]},
+                    "finishReason": "STOP",
+                    "index": 0,
+                }
+            ],
+            "usageMetadata": {
+                "promptTokenCount": _tokens(prompt),
+                "candidatesTokenCount": _tokens(text),
+                "totalTokenCount": _tokens(prompt + text),
+            },
+            "modelVersion": model,
+        }
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def serve(config: FakeConfig | None = None, port: int | None = None):
+    """Runs the fake server on a background thread; yields its base URL."""
+    port = port or _free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(create_app(config), host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError(f"Fake provider server failed to start on port {port}")
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+
+def clients(url: str):
+    """Real SDK clients pointed at the fake server."""
+    import anthropic
+    from google import genai
+    from google.genai import types
+    from openai import AsyncOpenAI
+
+    return (
+        anthropic.AsyncAnthropic(base_url=url, api_key="fake", max_retries=0),
+        AsyncOpenAI(base_url=f"{url}/v1", api_key="fake", max_retries=0),
+        genai.Client(api_key="fake", http_options=types.HttpOptions(base_url=url)),
+    )
+
+
+def parse_latency(spec: str) -> dict[str, float]:
+    """``claude=2,gpt=3`` → {"claude": 2.0, "gpt": 3.0}, over the defaults."""
+    latency = dict(DEFAULT_LATENCY)
+    for part in filter(None, spec.split(",")):
+        member, _, seconds = part.partition("=")
+        latency[member.strip()] = float(seconds)
+    return latency
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Anthropic/OpenAI/Gemini server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="", help="e.g. claude=2,gpt=3,gemini=1.5")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--prefill", type=float, default=0.0, help="seconds per 1k prompt tokens")
+    args = parser.parse_args()
+    config = FakeConfig(
+        latency=parse_latency(args.latency), jitter=args.jitter, prefill_per_1k=args.prefill
+    )
+    uvicorn.run(create_app(config), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
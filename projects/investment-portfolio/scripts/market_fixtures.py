@@ -0,0 +1,274 @@
+"""Finviz and yfinance responses recorded to disk and replayed offline.
+
+A fixture holds both Finviz screener views, trimmed ``.info`` per ticker and a
+year of daily closes, each with the wall time the live call took. ``replay``
+patches the app's upstream seams — the screener's Finviz calls, the gateway's
+``yf.Ticker``/``yf.Search`` and the price store's ``yf.download`` — to serve
+the fixture after the recorded latency (times ``latency_scale``).
+
+    uv run python scripts/market_fixtures.py --record             # live, needs network
+    uv run python scripts/market_fixtures.py --synthetic 300      # deterministic stand-in
+
+Synthetic fixtures have made-up tickers, metrics and nominal latencies; they
+exist so CI can measure pipeline overhead without a recording checked in.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import fundamentals, market_data, price_store, screener
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "e2e" / "market.json"
+BENCHMARK_TICKERS = ["SPY", "VTI"]
+HISTORY_DAYS = 400
+
+# Nominal wall times (seconds) for synthetic fixtures
+SYNTHETIC_LATENCY = {"finviz": 1.0, "info": 0.05, "download": 0.5}
+
+_INFO_FIELDS = (*fundamentals.FIELDS, "regularMarketPrice", "shortName", "quoteType")
+_SECTORS = [
+    ("Technology", "Software - Application"),
+    ("Technology", "Semiconductors"),
+    ("Healthcare", "Medical Devices"),
+    ("Communication Services", "Internet Content & Information"),
+    ("Consumer Cyclical", "Specialty Retail"),
+    ("Industrials", "Specialty Industrial Machinery"),
+    ("Energy", "Oil & Gas E&P"),
+]
+
+
+def _trim(info: dict) -> dict:
+    return {k: info[k] for k in _INFO_FIELDS if info.get(k) is not None}
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, time.perf_counter() - start
+
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    return json.loads(df.to_json(orient="records"))
+
+
+def _closes_payload(closes: pd.DataFrame, elapsed: float) -> dict:
+    return {
+        "elapsed": elapsed,
+        "dates": [d.date().isoformat() for d in closes.index],
+        "tickers": {t: [None if np.isnan(v) else v for v in closes[t]] for t in closes.columns},
+    }
+
+
+# ── Record ─────────────────────────────────────────────────────────────────
+
+
+def record(limit: int | None = None) -> dict:
+    """Runs every upstream call the committee makes, live, and keeps the answers."""
+    financial, financial_s = _timed(screener._run_financial_screener)
+    overview, overview_s = _timed(screener._run_overview_screener)
+    # The crawl is unfiltered; only tickers the default preset admits get looked up
+    admitted = screener._apply_preset(financial, screener.PRESETS[screener.DEFAULT_PRESET])
+    tickers = admitted["Ticker"].astype(str).tolist()[:limit]
+
+    def info(ticker: str):
+        try:
+            value, elapsed = _timed(lambda: market_data.yf.Ticker(ticker).info)
+            return ticker, {"elapsed": elapsed, "info": _trim(value)}
+        except Exception:
+            return ticker, None
+
+    with ThreadPoolExecutor(8) as pool:
+        infos = {t: entry for t, entry in pool.map(info, tickers) if entry}
+
+    start = date.today() - timedelta(days=HISTORY_DAYS)
+    raw, download_s = _timed(price_store._download_prices, tickers + BENCHMARK_TICKERS, start)
+    closes = raw["Close"] if isinstance(raw.columns, pd.MultiIndex) else raw
+    return {
+        "source": "recorded",
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "finviz": {
+            "financial": {"elapsed": financial_s, "rows": _records(financial[financial["Ticker"].isin(tickers)])},
+            "overview": {"elapsed": overview_s, "rows": _records(overview[overview["Ticker"].isin(tickers)])},
+        },
+        "info": infos,
+        "closes": _closes_payload(closes, download_s),
+    }
+
+
+def synthesize(n_tickers: int = 300, seed: int = 7) -> dict:
+    """Deterministic fixture with ``n_tickers`` made-up names."""
+    rng = random.Random(seed)
+    # Separate stream so the preset columns don't shift the other made-up values
+    preset_rng = random.Random(seed + 1)
+    tickers = [f"Z{i:03d}" for i in range(n_tickers)]
+    financial, overview, infos = [], [], {}
+    for t in tickers:
+        roe = round(rng.uniform(-0.15, 0.6), 3)
+        sector, industry = rng.choice(_SECTORS)
+        financial.append(
+            {
+                "Ticker": t,
+                "ROE": roe,
+                "Gross M": round(rng.uniform(0.4, 0.9), 3),
+                "ROIC": round(rng.uniform(0.0, 0.4), 3),
+                "Oper M": round(rng.uniform(0.05, 0.5), 3),
+                "Earnings": "Feb 26/a",
+                # Inside the default preset, like the filtered screen this stands in for
+                "Market Cap": round(preset_rng.uniform(2.5e9, 5e11), -6),
+                "Debt/Eq": round(preset_rng.uniform(0.0, 0.95), 2),
+                "PEG": round(preset_rng.uniform(0.5, 2.9), 2),
+            }
+        )
+        overview.append({"Ticker": t, "Company": f"{t} Corp", "Sector": sector, "Industry": industry})
+        revenue = rng.uniform(2e9, 80e9)
+        price = rng.uniform(20, 600)
+        infos[t] = {
+            "elapsed": SYNTHETIC_LATENCY["info"],
+            "info": {
+                "freeCashflow": revenue * rng.uniform(-0.05, 0.3),
+                "ebitda": revenue * rng.uniform(0.1, 0.4),
+                "totalRevenue": revenue,
+                "marketCap": revenue * rng.uniform(2, 15),
+                "grossMargins": financial[-1]["Gross M"],
+                "returnOnEquity": roe,
+                "currentPrice": round(price, 2),
+                "targetMeanPrice": round(price * rng.uniform(0.9, 1.4), 2),
+                "targetMedianPrice": round(price * rng.uniform(0.9, 1.35), 2),
+                "longName": f"{t} Corp",
+                "quoteType": "EQUITY",
+            },
+        }
+
+    dates = pd.bdate_range(end=date.today(), periods=HISTORY_DAYS * 5 // 7)
+    np_rng = np.random.default_rng(seed)
+    walks = 100 * np.exp(
+        np.cumsum(np_rng.normal(0.0004, 0.02, (len(dates), n_tickers + 2)), axis=0)
+    )
+    closes = pd.DataFrame(walks.round(4), index=dates, columns=tickers + BENCHMARK_TICKERS)
+    return {
+        "source": "synthetic",
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "finviz": {
+            "financial": {"elapsed": SYNTHETIC_LATENCY["finviz"], "rows": financial},
+            "overview": {"elapsed": SYNTHETIC_LATENCY["finviz"], "rows": overview},
+        },
+        "info": infos,
+        "closes": _closes_payload(closes, SYNTHETIC_LATENCY["download"]),
+    }
+
+
+def load(path: Path = FIXTURE_PATH) -> dict | None:
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def save(fixture: dict, path: Path = FIXTURE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(fixture))
+
+
+# ── Replay ─────────────────────────────────────────────────────────────────
+
+
+@contextmanager
+def replay(fixture: dict, latency_scale: float = 1.0):
+    """Serves ``fixture`` through the app's upstream seams for the duration."""
+    finviz, infos, closes = fixture["finviz"], fixture["info"], fixture["closes"]
+    frame = pd.DataFrame(
+        closes["tickers"], index=pd.DatetimeIndex(closes["dates"]), dtype=float
+    )
+
+    def wait(seconds: float) -> None:
+        time.sleep(seconds * latency_scale)
+
+    def financial_screener() -> pd.DataFrame:
+        wait(finviz["financial"]["elapsed"])
+        return pd.DataFrame(finviz["financial"]["rows"])
+
+    def overview_screener(tickers: list[str] | None = None) -> pd.DataFrame:
+        wait(finviz["overview"]["elapsed"])
+        rows = finviz["overview"]["rows"]
+        if tickers is not None:
+            wanted = set(tickers)
+            rows = [r for r in rows if r["Ticker"] in wanted]
+        return pd.DataFrame(rows, columns=["Ticker", *screener._PROFILE_COLUMNS])
+
+    class Ticker:
+        def __init__(self, ticker: str) -> None:
+            self._ticker = ticker.upper()
+
+        @property
+        def info(self) -> dict:
+            entry = infos.get(self._ticker)
+            if entry is None:
+                return {}
+            wait(entry["elapsed"])
+            return dict(entry["info"])
+
+    class Search:
+        def __init__(self, query: str) -> None:
+            self.quotes: list[dict] = []
+
+    def download_prices(tickers: list[str], start: date) -> pd.DataFrame:
+        wait(closes["elapsed"])
+        sliced = frame.loc[frame.index >= pd.Timestamp(start), [t for t in tickers if t in frame]]
+        sliced.columns = pd.MultiIndex.from_product([["Close"], sliced.columns])
+        return sliced
+
+    saved = (
+        screener._run_financial_screener,
+        screener._run_overview_screener,
+        market_data.yf.Ticker,
+        market_data.yf.Search,
+        market_data._gateway,
+        price_store._download_prices,
+    )
+    screener._run_financial_screener = financial_screener
+    screener._run_overview_screener = overview_screener
+    market_data.yf.Ticker = Ticker
+    market_data.yf.Search = Search
+    market_data._gateway = market_data.MarketDataGateway()
+    price_store._download_prices = download_prices
+    try:
+        yield
+    finally:
+        (
+            screener._run_financial_screener,
+            screener._run_overview_screener,
+            market_data.yf.Ticker,
+            market_data.yf.Search,
+            market_data._gateway,
+            price_store._download_prices,
+        ) = saved
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record or synthesize market fixtures")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--record", action="store_true", help="hit Finviz and Yahoo live")
+    group.add_argument("--synthetic", type=int, metavar="N", help="N made-up tickers")
+    parser.add_argument("--limit", type=int, help="record at most this many tickers")
+    parser.add_argument("--out", type=Path, default=FIXTURE_PATH)
+    args = parser.parse_args()
+
+    fixture = record(args.limit) if args.record else synthesize(args.synthetic)
+    save(fixture, args.out)
+    print(
+        f"Wrote {fixture['source']} fixture: {len(fixture['finviz']['financial']['rows'])} "
+        f"tickers, {len(fixture['closes']['dates'])} days → {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,68 +1,73 @@
+from __future__ import annotations
+
 import asyncio
-import json
+import contextlib
 import logging
 import math
 from datetime import datetime, timezone
-from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable
 
-import anthropic
-import yfinance as yf
-from google import genai
-from openai import AsyncOpenAI
+if TYPE_CHECKING:
+    import anthropic
+    from google import genai
+    from openai import AsyncOpenAI
 
+from . import market_data, metrics, store, symbols
 from .committee import claude_member, gemini_member, gpt_member
 from .models import AdvisorResponse, PortfolioHolding
 
 logger = logging.getLogger(__name__)
 
-_ADVISOR_CACHE_PATH = Path(__file__).parent.parent / "data" / "advisor_cache.json"
 _ADVISOR_CACHE_TTL_SECONDS = 4 * 3600
 
-
-def _load_cache() -> dict:
-    if not _ADVISOR_CACHE_PATH.exists():
-        return {}
-    try:
-        return json.loads(_ADVISOR_CACHE_PATH.read_text())
-    except Exception:
-        return {}
+# Batch mode: tickers resolved/fetched at once, and in-flight opinion
+# requests per provider (the binding limit is each provider's rate limit)
+BATCH_FETCH_CONCURRENCY = 8
+BATCH_MEMBER_CONCURRENCY = {"claude": 4, "gpt": 8, "gemini": 8}
 
 
-def _save_cache(cache: dict) -> None:
+def _get_cached(ticker: str) -> dict | None:
     try:
-        _ADVISOR_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-        _ADVISOR_CACHE_PATH.write_text(json.dumps(cache, indent=2))
+        entry = store.get("advisor_cache", ticker)
     except Exception:
-        pass
-
-
-def _get_cached(ticker: str) -> dict | None:
-    entry = _load_cache().get(ticker)
+        logger.debug("Failed to load advisor cache for %s", ticker, exc_info=True)
+        return None
     if not entry:
+        metrics.cache_lookup("advisor_cache", False)
         return None
     age = (datetime.now(timezone.utc) - datetime.fromisoformat(entry["cached_at"])).total_seconds()
+    metrics.cache_lookup("advisor_cache", age < _ADVISOR_CACHE_TTL_SECONDS)
     return entry if age < _ADVISOR_CACHE_TTL_SECONDS else None
 
 
 def _set_cached(ticker: str, data: dict) -> None:
-    cache = _load_cache()
-    cache[ticker] = {"cached_at": datetime.now(timezone.utc).isoformat(), **data}
-    _save_cache(cache)
+    cached_at = datetime.now(timezone.utc).isoformat()
+    try:
+        store.upsert("advisor_cache", ticker, {"cached_at": cached_at, **data}, cached_at)
+    except Exception:
+        logger.warning("Failed to save advisor cache for %s", ticker, exc_info=True)
 
 
-def _resolve_ticker(query: str) -> str:
+async def _resolve_ticker(query: str) -> str:
     try:
-        equities = [q for q in yf.Search(query).quotes if q.get("quoteType") == "EQUITY"]
-        if equities:
-            return equities[0]["symbol"]
+        symbol = symbols.resolve(query)
+        if symbol:
+            return symbol
+        if symbols.cached_search(query) is None:
+            # Local index miss and never searched: fall back to Yahoo once
+            quotes = await market_data.search(query)
+            equities = [q for q in quotes if q.get("quoteType") == "EQUITY"]
+            symbols.remember_search(query, equities)
+            if equities:
+                return equities[0]["symbol"]
     except Exception:
         pass
     return query.upper().strip()
 
 
-def _fetch_ticker_info(ticker: str) -> tuple[str, dict, str | None]:
+async def _fetch_ticker_info(ticker: str) -> tuple[str, dict, str | None]:
     try:
-        info = yf.Ticker(ticker).info
+        info = await market_data.get_info(ticker)
     except Exception:
         return "", {}, None
 
@@ -134,14 +139,25 @@ def _avg_allocation(results: list[dict]) -> float | None:
     return round(sum(values) / len(values), 1) if values else None
 
 
+async def _limited(limit: asyncio.Semaphore | None, coro: Awaitable):
+    async with limit or contextlib.nullcontext():
+        return await coro
+
+
+@metrics.timed("advisor")
 async def ask_committee(
     ticker: str,
     anthropic_client: anthropic.AsyncAnthropic,
     openai_client: AsyncOpenAI,
     gemini_client: genai.Client,
     current_portfolio: list[PortfolioHolding],
+    *,
+    portfolio_context: str | None = None,
+    fetch_limit: asyncio.Semaphore | None = None,
+    member_limits: dict[str, asyncio.Semaphore] | None = None,
 ) -> AdvisorResponse:
-    ticker = await asyncio.to_thread(_resolve_ticker, ticker.strip())
+    async with fetch_limit or contextlib.nullcontext():
+        ticker = await _resolve_ticker(ticker.strip())
     already_in = ticker in {h.ticker.upper() for h in current_portfolio}
 
     cached = _get_cached(ticker)
@@ -158,10 +174,10 @@ async def ask_committee(
         gemini_result = cached["gemini"] or {}
         upside = cached.get("upside", {})
     else:
-        (fundamentals, upside, yf_company_name), portfolio_context = await asyncio.gather(
-            asyncio.to_thread(_fetch_ticker_info, ticker),
-            asyncio.to_thread(_format_portfolio_context, current_portfolio),
-        )
+        async with fetch_limit or contextlib.nullcontext():
+            fundamentals, upside, yf_company_name = await _fetch_ticker_info(ticker)
+        if portfolio_context is None:
+            portfolio_context = _format_portfolio_context(current_portfolio)
 
         task_map = {}
         if "claude" in members_needed:
@@ -170,6 +186,10 @@ async def ask_committee(
             task_map["gpt"] = gpt_member.get_stock_opinion(openai_client, ticker, fundamentals, portfolio_context)
         if "gemini" in members_needed:
             task_map["gemini"] = gemini_member.get_stock_opinion(gemini_client, ticker, fundamentals, portfolio_context)
+        if member_limits:
+            task_map = {
+                m: _limited(member_limits.get(m), coro) for m, coro in task_map.items()
+            }
 
         gathered = await asyncio.gather(*task_map.values(), return_exceptions=True)
         new_results = {}
@@ -231,3 +251,48 @@ async def ask_committee(
         mean_upside_pct=upside.get("mean_upside_pct"),
         median_upside_pct=upside.get("median_upside_pct"),
     )
+
+
+async def ask_committee_batch(
+    tickers: list[str],
+    anthropic_client: anthropic.AsyncAnthropic,
+    openai_client: AsyncOpenAI,
+    gemini_client: genai.Client,
+    current_portfolio: list[PortfolioHolding],
+) -> AsyncIterator[tuple[str, AdvisorResponse | Exception]]:
+    """Evaluates a watchlist, yielding (query, response or error) per ticker as
+    each completes.
+
+    The portfolio context is formatted once; symbol resolution and fundamentals
+    share one concurrency bound, and member opinions are bounded per provider
+    across the whole batch. Results are not logged here — callers log the
+    batch in one write.
+    """
+    portfolio_context = _format_portfolio_context(current_portfolio)
+    fetch_limit = asyncio.Semaphore(BATCH_FETCH_CONCURRENCY)
+    member_limits = {m: asyncio.Semaphore(n) for m, n in BATCH_MEMBER_CONCURRENCY.items()}
+
+    async def one(query: str) -> tuple[str, AdvisorResponse | Exception]:
+        try:
+            return query, await ask_committee(
+                query,
+                anthropic_client,
+                openai_client,
+                gemini_client,
+                current_portfolio,
+                portfolio_context=portfolio_context,
+                fetch_limit=fetch_limit,
+                member_limits=member_limits,
+            )
+        except Exception as e:
+            logger.warning("Batch advisor failed for %s", query, exc_info=True)
+            return query, e
+
+    queries = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    tasks = [asyncio.create_task(one(q)) for q in queries]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -1,13 +1,11 @@
 import csv
-import json
-from datetime import datetime, timezone
-from pathlib import Path
+import io
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterator
 
+from . import store
 from .models import AdvisorResponse
 
-LOG_PATH = Path(__file__).parent.parent / "data" / "advisor_log.json"
-CSV_PATH = Path(__file__).parent.parent / "data" / "advisor_log.csv"
-
 _CSV_FIELDS = [
     "timestamp",
     "ticker",
@@ -24,18 +22,78 @@ _CSV_FIELDS = [
     "gpt_rec",
     "gemini_rec",
 ]
+_CSV_CHUNK_ROWS = 500
 
 
 def load() -> list[dict]:
-    if not LOG_PATH.exists():
-        return []
-    with LOG_PATH.open() as f:
-        return json.load(f)
+    return store.log_entries()
 
 
-def append(response: AdvisorResponse) -> None:
-    entries = load()
-    entry = {
+def _filters(
+    ticker: str | None,
+    start: date | None,
+    end: date | None,
+    recommendation: str | None,
+) -> dict:
+    return {
+        "ticker": ticker.strip().upper() if ticker else None,
+        "since": start.isoformat() if start else None,
+        "before": (end + timedelta(days=1)).isoformat() if end else None,
+        "recommendation": recommendation.lower() if recommendation else None,
+    }
+
+
+def query(
+    ticker: str | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    recommendation: str | None = None,
+    limit: int = 100,
+    offset: int = 0,
+) -> dict:
+    """One page of log entries, newest first, plus the total matching count.
+
+    ``start`` and ``end`` are inclusive calendar dates (UTC).
+    """
+    filters = _filters(ticker, start, end, recommendation)
+    rows = store.log_query(**filters, newest_first=True, limit=limit, offset=offset)
+    return {
+        "entries": [entry for _, entry in rows],
+        "total": store.log_count(**filters),
+        "limit": limit,
+        "offset": offset,
+    }
+
+
+def iter_csv(
+    ticker: str | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    recommendation: str | None = None,
+) -> Iterator[str]:
+    """CSV export generated lazily, a chunk of rows at a time.
+
+    Chunks are fetched by id (keyset pagination) with a fresh query each, so
+    the generator holds no cursor and can be resumed from any worker thread.
+    """
+    filters = _filters(ticker, start, end, recommendation)
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=_CSV_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    last_id = None
+    while True:
+        rows = store.log_query(**filters, after_id=last_id, limit=_CSV_CHUNK_ROWS)
+        writer.writerows(entry for _, entry in rows)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+        if len(rows) < _CSV_CHUNK_ROWS:
+            return
+        last_id = rows[-1][0]
+
+
+def _entry(response: AdvisorResponse) -> dict:
+    return {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "ticker": response.ticker,
         "company_name": response.company_name,
@@ -51,13 +109,13 @@ def append(response: AdvisorResponse) -> None:
         "gpt_rec": response.gpt_rec,
         "gemini_rec": response.gemini_rec,
     }
-    entries.append(entry)
 
-    LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with LOG_PATH.open("w") as f:
-        json.dump(entries, f, indent=2)
 
-    with CSV_PATH.open("w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=_CSV_FIELDS)
-        writer.writeheader()
-        writer.writerows(entries)
+def append(response: AdvisorResponse) -> None:
+    store.log_append(_entry(response))
+
+
+def append_many(responses: list[AdvisorResponse]) -> None:
+    """Logs a batch in a single transaction."""
+    if responses:
+        store.log_append_many([_entry(r) for r in responses])
@@ -1,12 +1,15 @@
+from __future__ import annotations
+
 import json
 import logging
-import time
+from typing import TYPE_CHECKING
 
-import anthropic
+if TYPE_CHECKING:
+    import anthropic
 
 logger = logging.getLogger(__name__)
 
-from ..config import EXCLUDED_TICKERS
+from .. import config, metrics
 from ..models import Pick, WebSource
 from .philosophy import ADVISOR_PHILOSOPHY, MANDATE
 
@@ -156,7 +159,6 @@ def _parse_picks(response) -> list[Pick]:
 
 
 async def get_research(client: anthropic.AsyncAnthropic) -> tuple[str, list[WebSource]]:
-    t0 = time.monotonic()
     messages: list[dict] = [
         {
             "role": "user",
@@ -166,24 +168,27 @@ async def get_research(client: anthropic.AsyncAnthropic) -> tuple[str, list[WebS
     all_content_blocks: list = []
     response = None
     container_id: str | None = None
+    elapsed = 0.0
 
     while True:
-        response = await client.messages.create(
-            model="claude-sonnet-4-6",
-            max_tokens=2048,
-            system=RESEARCH_SYSTEM_PROMPT,
-            tools=[
-                {
-                    "type": "web_search_20260209",
-                    "name": "web_search",
-                    "max_uses": WEB_SEARCH_MAX_USES,
-                    "blocked_domains": WEB_SEARCH_BLOCKED_DOMAINS,
-                }
-            ],
-            messages=messages,
-            timeout=600.0,
-            **({"container_id": container_id} if container_id else {}),
-        )
+        with metrics.call("anthropic", "research") as call:
+            response = await client.messages.create(
+                model="claude-sonnet-4-6",
+                max_tokens=2048,
+                system=RESEARCH_SYSTEM_PROMPT,
+                tools=[
+                    {
+                        "type": "web_search_20260209",
+                        "name": "web_search",
+                        "max_uses": WEB_SEARCH_MAX_USES,
+                        "blocked_domains": WEB_SEARCH_BLOCKED_DOMAINS,
+                    }
+                ],
+                messages=messages,
+                timeout=600.0,
+                **({"container_id": container_id} if container_id else {}),
+            )
+        elapsed += call.elapsed
         container_id = getattr(response, "container_id", None) or container_id
         all_content_blocks.extend(response.content)
         messages.append({"role": "assistant", "content": response.content})
@@ -209,7 +214,7 @@ async def get_research(client: anthropic.AsyncAnthropic) -> tuple[str, list[WebS
         "Research: %d searches, %d sources in %.1fs",
         search_count,
         len(sources),
-        time.monotonic() - t0,
+        elapsed,
     )
     return research_text, sources
 
@@ -217,27 +222,34 @@ async def get_research(client: anthropic.AsyncAnthropic) -> tuple[str, list[WebS
 async def get_picks(
     client: anthropic.AsyncAnthropic, screened_section: str = "", research: str = ""
 ) -> list[Pick]:
-    excluded = ", ".join(sorted(EXCLUDED_TICKERS))
+    excluded = ", ".join(sorted(config.current().tickers))
     system = SYSTEM_PROMPT.replace("{excluded_tickers}", excluded)
     if research:
         system = system + "\n\n## Current Market Research\n\n" + research
     if screened_section:
         system = system + "\n\n" + screened_section
 
-    t0 = time.monotonic()
-    response = await client.messages.create(
-        model="claude-sonnet-4-6",
-        max_tokens=4096,
-        system=system,
-        messages=[
-            {
-                "role": "user",
-                "content": "Based on the market research and screened stock list provided, generate your best portfolio picks with variant perception for each.",
-            }
-        ],
-        timeout=120.0,
+    with metrics.call("anthropic", "picks") as call:
+        response = await client.messages.create(
+            model="claude-sonnet-4-6",
+            max_tokens=4096,
+            system=system,
+            messages=[
+                {
+                    "role": "user",
+                    "content": "Based on the market research and screened stock list provided, generate your best portfolio picks with variant perception for each.",
+                }
+            ],
+            timeout=120.0,
+        )
+    usage = response.usage
+    metrics.tokens("anthropic", "picks", usage.input_tokens, usage.output_tokens)
+    logger.info(
+        "Picks generation: %.1fs, %d input / %d output tokens",
+        call.elapsed,
+        usage.input_tokens,
+        usage.output_tokens,
     )
-    logger.info("Picks generation: %.1fs", time.monotonic() - t0)
     return _parse_picks(response)
 
 
@@ -254,12 +266,13 @@ async def get_stock_opinion(
         content = f"{content}\n\n{fundamentals}"
     if portfolio_context:
         content = f"{content}\n\n{portfolio_context}"
-    message = await client.messages.create(
-        model="claude-sonnet-4-6",
-        max_tokens=1024,
-        system=ADVISOR_SYSTEM_PROMPT,
-        messages=[{"role": "user", "content": content}],
-    )
+    with metrics.call("anthropic", "opinion"):
+        message = await client.messages.create(
+            model="claude-sonnet-4-6",
+            max_tokens=1024,
+            system=ADVISOR_SYSTEM_PROMPT,
+            messages=[{"role": "user", "content": content}],
+        )
 
     raw = message.content[0].text
     start, end = raw.find("{"), raw.rfind("}") + 1
@@ -1,12 +1,15 @@
+from __future__ import annotations
+
 import json
 import logging
+from typing import TYPE_CHECKING
 
-from google import genai
-from google.genai import types
+if TYPE_CHECKING:
+    from google import genai
 
 logger = logging.getLogger(__name__)
 
-from ..config import EXCLUDED_TICKERS
+from .. import config, metrics
 from ..models import Pick
 from .philosophy import ADVISOR_PHILOSOPHY, MANDATE
 
@@ -64,25 +67,38 @@ suggested_allocation_pct: if recommendation is "buy", suggest a portfolio alloca
 
 
 async def get_picks(client: genai.Client, screened_section: str = "") -> list[Pick]:
-    excluded = ", ".join(sorted(EXCLUDED_TICKERS))
+    from google.genai import types
+
+    excluded = ", ".join(sorted(config.current().tickers))
     system = SYSTEM_PROMPT.replace("{excluded_tickers}", excluded)
     if screened_section:
         system = system + "\n\n" + screened_section
-    response = await client.aio.models.generate_content(
-        model="gemini-2.5-flash",
-        contents="Research current macro conditions and sector momentum using Google Search, then generate your best portfolio picks with variant perception for each.",
-        config=types.GenerateContentConfig(
-            tools=[types.Tool(google_search=types.GoogleSearch())],
-            system_instruction=system,
-            max_output_tokens=16384,
-        ),
-    )
+    with metrics.call("gemini", "picks") as call:
+        response = await client.aio.models.generate_content(
+            model="gemini-2.5-flash",
+            contents="Research current macro conditions and sector momentum using Google Search, then generate your best portfolio picks with variant perception for each.",
+            config=types.GenerateContentConfig(
+                tools=[types.Tool(google_search=types.GoogleSearch())],
+                system_instruction=system,
+                max_output_tokens=16384,
+            ),
+        )
 
     grounding = (
         response.candidates[0].grounding_metadata if response.candidates else None
     )
     search_used = bool(grounding and grounding.grounding_chunks)
-    logger.info("Gemini search grounding used: %s", search_used)
+    usage = response.usage_metadata
+    input_tokens = usage.prompt_token_count if usage else None
+    output_tokens = usage.candidates_token_count if usage else None
+    metrics.tokens("gemini", "picks", input_tokens, output_tokens)
+    logger.info(
+        "Gemini picks: search grounding=%s, %.1fs, %s input / %s output tokens",
+        search_used,
+        call.elapsed,
+        input_tokens,
+        output_tokens,
+    )
 
     if not response.text:
         finish_reason = (
@@ -134,6 +150,8 @@ async def get_stock_opinion(
     fundamentals: str = "",
     portfolio_context: str = "",
 ) -> dict:
+    from google.genai import types
+
     content = (
         f"What do you think about investing in {ticker}? Give me your honest opinion."
     )
@@ -141,14 +159,15 @@ async def get_stock_opinion(
         content = f"{content}\n\n{fundamentals}"
     if portfolio_context:
         content = f"{content}\n\n{portfolio_context}"
-    response = await client.aio.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=content,
-        config=types.GenerateContentConfig(
-            system_instruction=ADVISOR_SYSTEM_PROMPT,
-            response_mime_type="application/json",
-            max_output_tokens=2048,
-        ),
-    )
+    with metrics.call("gemini", "opinion"):
+        response = await client.aio.models.generate_content(
+            model="gemini-2.5-flash",
+            contents=content,
+            config=types.GenerateContentConfig(
+                system_instruction=ADVISOR_SYSTEM_PROMPT,
+                response_mime_type="application/json",
+                max_output_tokens=2048,
+            ),
+        )
 
     return json.loads(response.text)
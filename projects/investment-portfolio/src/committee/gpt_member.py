@@ -1,11 +1,14 @@
+from __future__ import annotations
+
 import json
 import logging
 import re
-import time
+from typing import TYPE_CHECKING
 
-from openai import AsyncOpenAI
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
 
-from ..config import EXCLUDED_TICKERS
+from .. import config, metrics
 from ..models import Pick
 from .philosophy import ADVISOR_PHILOSOPHY, MANDATE
 
@@ -100,31 +103,41 @@ def _strip_citations(text: str | None) -> str | None:
 
 
 async def get_picks(client: AsyncOpenAI, screened_section: str = "") -> list[Pick]:
-    excluded = ", ".join(sorted(EXCLUDED_TICKERS))
+    excluded = ", ".join(sorted(config.current().tickers))
     system = SYSTEM_PROMPT.replace("{excluded_tickers}", excluded)
     if screened_section:
         system = system + "\n\n" + screened_section
 
-    t0 = time.monotonic()
-    response = await client.responses.create(
-        model="gpt-5",
-        instructions=system,
-        input="Research current macro conditions and sector momentum using web search, then generate your best portfolio picks with variant perception for each.",
-        tools=[{"type": "web_search_preview"}],
-        text={
-            "format": {
-                "type": "json_schema",
-                "name": "portfolio_picks",
-                "schema": PICKS_SCHEMA,
-                "strict": True,
-            }
-        },
-    )
+    with metrics.call("openai", "picks") as call:
+        response = await client.responses.create(
+            model="gpt-5",
+            instructions=system,
+            input="Research current macro conditions and sector momentum using web search, then generate your best portfolio picks with variant perception for each.",
+            tools=[{"type": "web_search_preview"}],
+            text={
+                "format": {
+                    "type": "json_schema",
+                    "name": "portfolio_picks",
+                    "schema": PICKS_SCHEMA,
+                    "strict": True,
+                }
+            },
+        )
 
     search_used = any(
         getattr(item, "type", None) == "web_search_call" for item in response.output
     )
-    logger.info("GPT picks: web_search=%s, %.1fs", search_used, time.monotonic() - t0)
+    usage = response.usage
+    input_tokens = usage.input_tokens if usage else None
+    output_tokens = usage.output_tokens if usage else None
+    metrics.tokens("openai", "picks", input_tokens, output_tokens)
+    logger.info(
+        "GPT picks: web_search=%s, %.1fs, %s input / %s output tokens",
+        search_used,
+        call.elapsed,
+        input_tokens,
+        output_tokens,
+    )
 
     data = json.loads(response.output_text)
 
@@ -162,16 +175,17 @@ async def get_stock_opinion(
         content = f"{content}\n\n{fundamentals}"
     if portfolio_context:
         content = f"{content}\n\n{portfolio_context}"
-    response = await client.chat.completions.create(
-        model="gpt-5.4-mini",
-        max_completion_tokens=4096,
-        reasoning_effort="low",
-        messages=[
-            {"role": "system", "content": ADVISOR_SYSTEM_PROMPT},
-            {"role": "user", "content": content},
-        ],
-        response_format={"type": "json_object"},
-    )
+    with metrics.call("openai", "opinion"):
+        response = await client.chat.completions.create(
+            model="gpt-5.4-mini",
+            max_completion_tokens=4096,
+            reasoning_effort="low",
+            messages=[
+                {"role": "system", "content": ADVISOR_SYSTEM_PROMPT},
+                {"role": "user", "content": content},
+            ],
+            response_format={"type": "json_object"},
+        )
 
     choice = response.choices[0]
     msg = choice.message
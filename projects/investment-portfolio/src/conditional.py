@@ -0,0 +1,80 @@
+"""Conditional GET for JSON routes whose inputs carry a cheap version.
+
+A route names what its payload is built from — store table versions, file
+mtimes, cache keys, query parameters — and ``json_response`` turns that into
+an ETag. When the client already holds that ETag (or, lacking one, a copy no
+older than ``last_modified``), it answers ``304 Not Modified`` without
+building the payload at all.
+
+ETags are weak: the same payload may go out gzip-encoded or not.
+"""
+
+import hashlib
+import inspect
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Mapping
+
+from fastapi.responses import JSONResponse, Response
+
+
+def etag(*parts: object) -> str:
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _opaque(tag: str) -> str:
+    return tag.strip().removeprefix("W/")
+
+
+def not_modified(
+    headers: Mapping[str, str], tag: str, last_modified: float | None = None
+) -> bool:
+    """RFC 9110 precedence: If-None-Match (weak comparison) wins; If-Modified-Since
+    only counts when it is absent. HTTP dates have whole-second resolution."""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return _opaque(tag) in {_opaque(t) for t in if_none_match.split(",")}
+    if_modified_since = headers.get("if-modified-since")
+    if not if_modified_since or not last_modified:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(last_modified) <= since
+
+
+async def json_response(
+    headers: Mapping[str, str],
+    version: Callable[[], tuple | None],
+    build: Callable[[], Any],
+    last_modified: float | None = None,
+) -> Response:
+    """``build()`` (sync or async) as JSON, or a bodiless 304 if the client's
+    copy is current.
+
+    ``version()`` returns None when the inputs can't be named without
+    building (e.g. a cache entry this process hasn't seen); the payload is
+    then built first and ``version()`` asked again, so the response still
+    carries an ETag whenever one exists.
+    """
+    response_headers = {"Cache-Control": "no-cache"}
+    if last_modified:
+        response_headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+
+    current = version()
+    if current is not None:
+        tag = etag(*current)
+        if not_modified(headers, tag, last_modified):
+            return Response(status_code=304, headers={**response_headers, "ETag": tag})
+
+    payload = build()
+    if inspect.isawaitable(payload):
+        payload = await payload
+    if current is None:
+        current = version()
+    if current is not None:
+        response_headers["ETag"] = etag(*current)
+    return JSONResponse(payload, headers=response_headers)
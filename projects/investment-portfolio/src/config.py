@@ -1,41 +1,80 @@
-import json
-from pathlib import Path
-
-_EXCLUSIONS_FILE = Path(__file__).parent.parent / "data" / "exclusions.json"
-
-EXCLUDED_TICKERS: set[str] = {
-    "BRK.B",
-    "DJT",
-    "TSLA",
-}
-
-EXCLUDED_SECTORS: set[str] = {
-    "Basic Materials",
-    "Energy",
-}
-
-_DEFAULT_TICKERS: frozenset[str] = frozenset(EXCLUDED_TICKERS)
-_DEFAULT_SECTORS: frozenset[str] = frozenset(EXCLUDED_SECTORS)
-
-
-def load() -> None:
-    if not _EXCLUSIONS_FILE.exists():
-        return
-    data = json.loads(_EXCLUSIONS_FILE.read_text())
-    EXCLUDED_TICKERS.clear()
-    EXCLUDED_TICKERS.update(data.get("tickers", _DEFAULT_TICKERS))
-    EXCLUDED_SECTORS.clear()
-    EXCLUDED_SECTORS.update(data.get("sectors", _DEFAULT_SECTORS))
-
-
-def save() -> None:
-    _EXCLUSIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    _EXCLUSIONS_FILE.write_text(
-        json.dumps(
-            {
-                "tickers": sorted(EXCLUDED_TICKERS),
-                "sectors": sorted(EXCLUDED_SECTORS),
-            },
-            indent=2,
-        )
+"""Exclusion settings shared by every API worker.
+
+The excluded tickers and sectors live in the app database's ``settings``
+table, one row per list, so a save is a single atomic upsert and two workers
+saving different lists can't clobber each other. Readers get an immutable
+``Exclusions`` snapshot: ``current()`` compares the table's change counter
+(one primary-key lookup) with the snapshot it handed out last and only
+re-reads the rows when another request — in this process or any other — has
+saved since. A reader holding a snapshot never sees it change underneath it.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable
+
+from . import store
+
+DEFAULT_TICKERS: frozenset[str] = frozenset({"BRK.B", "DJT", "TSLA"})
+DEFAULT_SECTORS: frozenset[str] = frozenset({"Basic Materials", "Energy"})
+
+
+@dataclass(frozen=True)
+class Exclusions:
+    version: int
+    tickers: frozenset[str]
+    sectors: frozenset[str]
+
+
+# (store.version("settings"), snapshot) as last read by this process
+_snapshot: tuple[tuple[int, float], Exclusions] | None = None
+
+
+def current() -> Exclusions:
+    """The latest saved exclusions; defaults until the first save."""
+    global _snapshot
+    # Counter first: a save landing between the two reads leaves the snapshot
+    # tagged older than its rows, which only costs one extra re-read.
+    stamp = store.version("settings")
+    cached = _snapshot
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    rows = store.get_many("settings", ("excluded_tickers", "excluded_sectors"))
+    snapshot = Exclusions(
+        version=stamp[0],
+        tickers=_tickers(rows["excluded_tickers"]["values"])
+        if "excluded_tickers" in rows
+        else DEFAULT_TICKERS,
+        sectors=_sectors(rows["excluded_sectors"]["values"])
+        if "excluded_sectors" in rows
+        else DEFAULT_SECTORS,
     )
+    _snapshot = (stamp, snapshot)
+    return snapshot
+
+
+def version() -> tuple[int, float]:
+    """(change count, unix time of the last save); (0, 0.0) before the first."""
+    return store.version("settings")
+
+
+def update(
+    tickers: Iterable[str] | None = None, sectors: Iterable[str] | None = None
+) -> Exclusions:
+    """Replace whichever lists are given (in one transaction) and return the
+    new snapshot. Tickers are upper-cased; blanks are dropped."""
+    items = {}
+    if tickers is not None:
+        items["excluded_tickers"] = {"values": sorted(_tickers(tickers))}
+    if sectors is not None:
+        items["excluded_sectors"] = {"values": sorted(_sectors(sectors))}
+    if items:
+        store.upsert_many("settings", items)
+    return current()
+
+
+def _tickers(values: Iterable[str]) -> frozenset[str]:
+    return frozenset(t.strip().upper() for t in values if t.strip())
+
+
+def _sectors(values: Iterable[str]) -> frozenset[str]:
+    return frozenset(s.strip() for s in values if s.strip())
@@ -1,50 +1,40 @@
 import asyncio
-import json
+import logging
 from datetime import datetime, timezone
-from pathlib import Path
-
-import yfinance as yf
 
+from . import market_data, metrics, store
 from .models import Pick
 
-_SEMAPHORE = asyncio.Semaphore(5)
-_ENRICHMENT_CACHE_PATH = Path(__file__).parent.parent / "data" / "enrichment_cache.json"
+logger = logging.getLogger(__name__)
+
 _ENRICHMENT_CACHE_TTL_SECONDS = 2 * 3600
 
 
-def _load_enrichment_cache() -> dict[str, dict]:
-    if not _ENRICHMENT_CACHE_PATH.exists():
-        return {}
+def _load_enrichment_cache(tickers: list[str]) -> dict[str, dict]:
     try:
-        return json.loads(_ENRICHMENT_CACHE_PATH.read_text())
+        return store.get_many("enrichment_cache", tickers)
     except Exception:
+        logger.debug("Failed to load enrichment cache", exc_info=True)
         return {}
 
 
-def _save_enrichment_cache(cache: dict[str, dict]) -> None:
+def _save_enrichment_cache(entries: dict[str, dict], cached_at: str) -> None:
     try:
-        _ENRICHMENT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-        _ENRICHMENT_CACHE_PATH.write_text(json.dumps(cache, indent=2))
+        store.upsert_many("enrichment_cache", entries, cached_at)
     except Exception:
-        pass
+        logger.warning("Failed to save enrichment cache", exc_info=True)
 
 
 async def _fetch_ticker_data(ticker: str) -> dict:
-    async with _SEMAPHORE:
-        info = await asyncio.to_thread(lambda: yf.Ticker(ticker).info)
+    info = await market_data.get_info(ticker)
     price = info.get("currentPrice") or info.get("regularMarketPrice")
     mean_t = info.get("targetMeanPrice")
     median_t = info.get("targetMedianPrice")
     return {"current_price": price, "mean_target": mean_t, "median_target": median_t}
 
 
-async def enrich_picks_with_prices(picks: list[Pick]) -> list[Pick]:
-    tickers = list({p.ticker for p in picks})
-
-    cache = _load_enrichment_cache()
-    now = datetime.now(timezone.utc)
-
-    stale = [
+def _stale(tickers: list[str], cache: dict[str, dict], now: datetime) -> list[str]:
+    return [
         t
         for t in tickers
         if t not in cache
@@ -52,11 +42,62 @@ async def enrich_picks_with_prices(picks: list[Pick]) -> list[Pick]:
         > _ENRICHMENT_CACHE_TTL_SECONDS
     ]
 
+
+async def _refresh(tickers: list[str]) -> dict[str, dict]:
+    """Cached price/target data for tickers, fetching whatever is stale."""
+    cache = _load_enrichment_cache(tickers)
+    now = datetime.now(timezone.utc)
+    stale = _stale(tickers, cache, now)
+    metrics.cache_lookup("enrichment_cache", True, len(tickers) - len(stale))
+    metrics.cache_lookup("enrichment_cache", False, len(stale))
     if stale:
         results = await asyncio.gather(*[_fetch_ticker_data(t) for t in stale])
-        for ticker, data in zip(stale, results):
-            cache[ticker] = {**data, "cached_at": now.isoformat()}
-        _save_enrichment_cache(cache)
+        fresh = {
+            ticker: {**data, "cached_at": now.isoformat()}
+            for ticker, data in zip(stale, results)
+        }
+        cache.update(fresh)
+        _save_enrichment_cache(fresh, now.isoformat())
+    return cache
+
+
+def quotes_version(tickers: list[str]) -> str | None:
+    """Newest ``cached_at`` among the tickers' cached quotes, or None while any
+    of them is missing or due a refresh (the next read would change them)."""
+    cache = _load_enrichment_cache(tickers)
+    if _stale(tickers, cache, datetime.now(timezone.utc)):
+        return None
+    return max((cache[t]["cached_at"] for t in tickers), default="")
+
+
+@metrics.timed("enrichment.prefetch")
+async def prefetch(tickers: list[str]) -> int:
+    """Warms the enrichment cache for tickers likely to be picked.
+
+    Each ticker is saved as soon as it arrives, so a cancelled prefetch keeps
+    what it already fetched. Failures are ignored; enrichment refetches.
+    Returns the number of tickers fetched.
+    """
+    stale = _stale(tickers, _load_enrichment_cache(tickers), datetime.now(timezone.utc))
+
+    async def fetch_one(ticker: str) -> bool:
+        try:
+            data = await _fetch_ticker_data(ticker)
+        except Exception:
+            logger.debug("Prefetch failed for %s", ticker, exc_info=True)
+            return False
+        cached_at = datetime.now(timezone.utc).isoformat()
+        _save_enrichment_cache({ticker: {**data, "cached_at": cached_at}}, cached_at)
+        return True
+
+    return sum(await asyncio.gather(*[fetch_one(t) for t in stale]))
+
+
+@metrics.timed("enrichment")
+async def enrich_picks_with_prices(picks: list[Pick]) -> list[Pick]:
+    tickers = list({p.ticker for p in picks})
+
+    cache = await _refresh(tickers)
 
     enriched = []
     for p in picks:
@@ -84,23 +125,8 @@ async def enrich_picks_with_prices(picks: list[Pick]) -> list[Pick]:
     return enriched
 
 
+@metrics.timed("enrichment.prices")
 async def get_current_prices(tickers: list[str]) -> dict[str, float | None]:
     """Returns current prices for tickers, using and updating the enrichment cache."""
-    cache = _load_enrichment_cache()
-    now = datetime.now(timezone.utc)
-
-    stale = [
-        t
-        for t in tickers
-        if t not in cache
-        or (now - datetime.fromisoformat(cache[t]["cached_at"])).total_seconds()
-        > _ENRICHMENT_CACHE_TTL_SECONDS
-    ]
-
-    if stale:
-        results = await asyncio.gather(*[_fetch_ticker_data(t) for t in stale])
-        for ticker, data in zip(stale, results):
-            cache[ticker] = {**data, "cached_at": now.isoformat()}
-        _save_enrichment_cache(cache)
-
+    cache = await _refresh(tickers)
     return {t: cache.get(t, {}).get("current_price") for t in tickers}
@@ -0,0 +1,154 @@
+"""Pluggable sources of per-ticker fundamentals (Yahoo ``.info``-shaped dicts).
+
+The screener only needs a handful of fields per FCF candidate, and how they
+are fetched is a throughput trade-off: one ``.info`` request per ticker
+through the shared rate-limited gateway, or one bulk quoteSummary request per
+batch of tickers. Each backend fetches in batches of ``batch_size`` with at
+most ``concurrency`` batches in flight and yields results as batches land.
+
+The backend is picked by the ``FUNDAMENTALS_BACKEND`` environment variable
+(default ``yfinance``); ``scripts/benchmark_screener.py`` compares them on
+recorded fixtures.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import AsyncIterator
+
+from . import market_data
+
+logger = logging.getLogger(__name__)
+
+BACKEND_ENV = "FUNDAMENTALS_BACKEND"
+DEFAULT_BACKEND = "yfinance"
+
+# Fields the app reads from fundamentals, for coverage reporting
+FIELDS = (
+    "freeCashflow",
+    "ebitda",
+    "totalRevenue",
+    "marketCap",
+    "revenueGrowth",
+    "grossMargins",
+    "returnOnEquity",
+    "debtToEquity",
+    "trailingPE",
+    "forwardPE",
+    "currentPrice",
+    "targetMeanPrice",
+    "targetMedianPrice",
+    "longName",
+)
+
+
+class FundamentalsBackend(ABC):
+    name: str
+    batch_size: int = 1
+    concurrency: int = 1
+    requires: tuple[str, ...] = ()  # optional packages the backend imports
+
+    async def fetch(self, tickers: list[str]) -> AsyncIterator[tuple[str, dict | None]]:
+        """Yields (ticker, info) per ticker as its batch completes; info is
+        None where the upstream had nothing or the batch failed."""
+        tickers = list(dict.fromkeys(tickers))
+        limit = asyncio.Semaphore(self.concurrency)
+
+        async def run(batch: list[str]) -> tuple[list[str], dict[str, dict]]:
+            async with limit:
+                try:
+                    return batch, await self._fetch_batch(batch)
+                except Exception:
+                    logger.debug("%s fetch failed for %s", self.name, batch, exc_info=True)
+                    return batch, {}
+
+        tasks = [
+            asyncio.create_task(run(tickers[i : i + self.batch_size]))
+            for i in range(0, len(tickers), self.batch_size)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                batch, infos = await next_done
+                for ticker in batch:
+                    yield ticker, infos.get(ticker) or None
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @abstractmethod
+    async def _fetch_batch(self, tickers: list[str]) -> dict[str, dict]:
+        """Infos for one batch of ``tickers``, keyed by ticker."""
+
+
+class YFinanceBackend(FundamentalsBackend):
+    """Per-ticker ``.info`` through the shared gateway, which does the rate
+    limiting, so the concurrency bound here is only a ceiling on open tasks."""
+
+    name = "yfinance"
+    batch_size = 1
+    concurrency = 64
+
+    async def _fetch_batch(self, tickers: list[str]) -> dict[str, dict]:
+        return {t: await market_data.get_info(t) for t in tickers}
+
+
+class YahooQueryBackend(FundamentalsBackend):
+    """Bulk quoteSummary via yahooquery: one blocking request per
+    ``batch_size`` tickers, run in a worker thread.
+
+    yahooquery is an optional dependency (the ``yahooquery`` extra), imported
+    on first request.
+    """
+
+    name = "yahooquery"
+    batch_size = 50
+    concurrency = 4
+    requires = ("yahooquery",)
+    _MODULES = ["financialData", "defaultKeyStatistics", "summaryDetail", "price"]
+
+    async def _fetch_batch(self, tickers: list[str]) -> dict[str, dict]:
+        return await asyncio.to_thread(self._request, tickers)
+
+    def _request(self, tickers: list[str]) -> dict[str, dict]:
+        from yahooquery import Ticker
+
+        modules = Ticker(tickers, asynchronous=False).get_modules(self._MODULES)
+        return {t: _flatten(modules.get(t)) for t in tickers}
+
+
+def _flatten(modules) -> dict:
+    """quoteSummary modules merged into one ``.info``-style dict; yahooquery
+    returns an error string instead of a dict for unknown tickers."""
+    if not isinstance(modules, dict):
+        return {}
+    info: dict = {}
+    for module in modules.values():
+        if isinstance(module, dict):
+            for key, value in module.items():
+                if value is not None and not isinstance(value, dict):
+                    info.setdefault(key, value)
+    return info
+
+
+BACKENDS: dict[str, type[FundamentalsBackend]] = {
+    YFinanceBackend.name: YFinanceBackend,
+    YahooQueryBackend.name: YahooQueryBackend,
+}
+
+
+def get_backend(name: str | None = None) -> FundamentalsBackend:
+    """The named backend, else the configured one, else the default."""
+    name = (name or os.environ.get(BACKEND_ENV) or DEFAULT_BACKEND).strip().lower()
+    backend = BACKENDS.get(name)
+    if backend is None:
+        logger.warning("Unknown fundamentals backend %r, using %s", name, DEFAULT_BACKEND)
+        backend = BACKENDS[DEFAULT_BACKEND]
+    missing = [p for p in backend.requires if importlib.util.find_spec(p) is None]
+    if missing:
+        logger.warning(
+            "Fundamentals backend %r needs %s, using %s", name, ", ".join(missing), DEFAULT_BACKEND
+        )
+        backend = BACKENDS[DEFAULT_BACKEND]
+    return backend()
@@ -0,0 +1,132 @@
+"""In-process background jobs for committee runs.
+
+A run takes minutes, so ``POST /api/runs`` submits a job and returns its id
+instead of holding the request open. Only one run job is in flight at a
+time: submitting while one is queued or running returns that job (coalescing
+duplicate clicks and tabs into one expensive run). Each job keeps an ordered
+event log fed by ``progress.emit``; subscribers replay it from any offset and
+then follow live events until the job finishes.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable
+
+from . import progress
+
+logger = logging.getLogger(__name__)
+
+_MAX_FINISHED_JOBS = 20
+
+
+class Job:
+    def __init__(self) -> None:
+        self.id = uuid.uuid4().hex
+        self.status = "running"  # "running", "done", "failed" or "cancelled"
+        self.created_at = datetime.now(timezone.utc)
+        self.finished_at: datetime | None = None
+        self.result: dict | None = None
+        self.error: str | None = None
+        self.events: list[dict] = []
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status != "running"
+
+    def snapshot(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "last_event": self.events[-1] if self.events else None,
+            "error": self.error,
+            "result": self.result,
+        }
+
+    def publish(self, event: dict) -> None:
+        """Thread-safe: events may come from ``asyncio.to_thread`` workers."""
+        stamped = {**event, "t": datetime.now(timezone.utc).isoformat()}
+        self._loop.call_soon_threadsafe(self._append, stamped)
+
+    def _append(self, event: dict) -> None:
+        self.events.append(event)
+        self._wakeup.set()
+        self._wakeup = asyncio.Event()
+
+    async def follow(self, start: int = 0) -> AsyncIterator[tuple[int, dict]]:
+        """(index, event) from ``start`` onward; ends after the final event."""
+        i = start
+        while True:
+            wakeup = self._wakeup
+            while i < len(self.events):
+                yield i, self.events[i]
+                i += 1
+            if self.finished:
+                return
+            await wakeup.wait()
+
+
+_jobs: OrderedDict[str, Job] = OrderedDict()
+_current: Job | None = None
+
+
+def get(job_id: str) -> Job | None:
+    return _jobs.get(job_id)
+
+
+def current() -> Job | None:
+    return _current if _current is not None and not _current.finished else None
+
+
+def submit(work: Callable[[], Awaitable[dict]]) -> tuple[Job, bool]:
+    """Starts ``work`` as a job, or joins the one in flight.
+
+    Returns the job and whether it was newly created.
+    """
+    global _current
+    running = current()
+    if running is not None:
+        return running, False
+
+    job = Job()
+    _jobs[job.id] = job
+    _current = job
+    job._task = asyncio.create_task(_run(job, work), name=f"job-{job.id}")
+    finished = [j for j in _jobs.values() if j.finished]
+    for old in finished[: max(0, len(finished) - _MAX_FINISHED_JOBS)]:
+        del _jobs[old.id]
+    return job, True
+
+
+async def _run(job: Job, work: Callable[[], Awaitable[dict]]) -> None:
+    job.publish({"stage": "started"})
+    with progress.listen(job.publish):
+        try:
+            job.result = await work()
+        except asyncio.CancelledError:
+            # e.g. shutdown: followers still get a final event, then re-raise
+            logger.warning("Job %s cancelled", job.id)
+            job.error = "Job cancelled"
+            _finish(job, "cancelled", {"stage": "cancelled", "error": job.error})
+            raise
+        except Exception as e:
+            logger.exception("Job %s failed", job.id)
+            job.error = str(e) or type(e).__name__
+            final = {"stage": "failed", "error": job.error}
+        else:
+            final = {"stage": "done"}
+    await asyncio.sleep(0)  # let events published from worker threads land first
+    _finish(job, "done" if job.error is None else "failed", final)
+
+
+def _finish(job: Job, status: str, final: dict) -> None:
+    job.status = status
+    job.finished_at = datetime.now(timezone.utc)
+    job._append({**final, "t": job.finished_at.isoformat()})
@@ -0,0 +1,55 @@
+"""Deferred imports for the heavy third-party modules.
+
+``pd = lazy_import("pandas")`` binds a module object straight away but only
+executes the package on first attribute access, so importing the app (and
+every ``src`` module on its path) doesn't pay for pandas, numpy or yfinance
+until a request actually needs them. Annotations that mention these modules
+must not be evaluated at import time — modules using this keep
+``from __future__ import annotations``.
+
+The first access runs the real import under a per-module lock: threads that
+touch the module meanwhile (``asyncio.to_thread`` bursts) wait for it rather
+than seeing a half-initialised module. ``importlib.util.LazyLoader`` only
+gained that lock in Python 3.13.
+"""
+
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+
+# Reentrant: the import itself reads attributes of the module being loaded
+_locks: dict[str, threading.RLock] = {}
+_loading: set[str] = set()
+
+
+class _LazyModule(ModuleType):
+    """Placeholder that executes its module on first attribute access, then
+    turns into a plain module."""
+
+    def __getattribute__(self, attr):
+        name = ModuleType.__getattribute__(self, "__spec__").name
+        with _locks[name]:
+            # Re-checked under the lock: another thread may have loaded it
+            if type(self) is _LazyModule and name not in _loading:
+                _loading.add(name)
+                try:
+                    ModuleType.__getattribute__(self, "__loader__").exec_module(self)
+                    self.__class__ = ModuleType
+                finally:
+                    _loading.discard(name)
+        return ModuleType.__getattribute__(self, attr)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """``name``'s module, loaded on first attribute access."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    module = importlib.util.module_from_spec(spec)
+    _locks[name] = threading.RLock()
+    module.__class__ = _LazyModule
+    sys.modules[name] = module
+    return module
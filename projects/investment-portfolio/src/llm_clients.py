@@ -0,0 +1,103 @@
+"""Provider SDK clients shared by every request in a process.
+
+Each SDK client owns an HTTP connection pool. Building a fresh set per request
+pays a TCP connect and TLS handshake (and the SDK's SSL-context setup) on
+every provider call, and leaves the old pools for the garbage collector.
+``LLMClients`` is created once by the app's lifespan hook and handed out to
+every request; it builds the three clients on first use, so startup still
+doesn't import the SDKs, and ``aclose()`` on shutdown closes the pools.
+
+The pools are sized for a committee run plus a concurrent advisor batch, and
+keep idle connections long enough to span the gap between a run's research
+and picks calls.
+"""
+
+from __future__ import annotations
+
+import inspect
+import logging
+import os
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import anthropic
+    from google import genai
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+# Per provider: an advisor batch runs a few tickers at once, each asking all
+# three members, on top of a committee run's calls
+MAX_CONNECTIONS = 32
+MAX_KEEPALIVE_CONNECTIONS = 16
+# The SDK default (5s) drops connections between a run's research and picks
+KEEPALIVE_EXPIRY_SECONDS = 90.0
+
+Clients = tuple["anthropic.AsyncAnthropic", "AsyncOpenAI", "genai.Client"]
+
+
+def build(base_url: str | None = None, api_key: str | None = None) -> Clients:
+    """The three SDK clients on tuned keep-alive pools. Keys come from the
+    environment unless ``api_key`` is given; ``base_url`` points all three at
+    one server (the fake providers)."""
+    import anthropic
+    import httpx
+    import openai
+    from google import genai
+    from google.genai import types
+
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+    )
+    return (
+        anthropic.AsyncAnthropic(
+            base_url=base_url,
+            api_key=api_key,
+            http_client=anthropic.DefaultAsyncHttpxClient(limits=limits),
+        ),
+        openai.AsyncOpenAI(
+            base_url=f"{base_url}/v1" if base_url else None,
+            api_key=api_key,
+            http_client=openai.DefaultAsyncHttpxClient(limits=limits),
+        ),
+        genai.Client(
+            api_key=api_key or os.environ["GOOGLE_API_KEY"],
+            http_options=types.HttpOptions(
+                base_url=base_url, async_client_args={"limits": limits}
+            ),
+        ),
+    )
+
+
+class LLMClients:
+    """One set of SDK clients for the app's lifetime, built on first ``get()``."""
+
+    def __init__(self, base_url: str | None = None, api_key: str | None = None):
+        self._options = (base_url, api_key)
+        self._clients: Clients | None = None
+
+    def get(self) -> Clients:
+        # Synchronous: no other request can run between the check and the build
+        if self._clients is None:
+            self._clients = build(*self._options)
+        return self._clients
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, None
+        if clients is None:
+            return
+        anthropic_client, openai_client, gemini_client = clients
+        for name, close in (
+            ("anthropic", anthropic_client.close),
+            ("openai", openai_client.close),
+            ("gemini", gemini_client.aio.aclose),
+            ("gemini", gemini_client.close),  # its sync pool, opened but unused
+        ):
+            try:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.warning("Failed to close the %s client", name, exc_info=True)
@@ -0,0 +1,147 @@
+"""Shared, rate-limited gateway for per-ticker yfinance lookups.
+
+Every `.info` and `yf.Search` call in the app goes through one process-wide
+gateway so that:
+- a global token bucket bounds request rate to Yahoo across all modules,
+- concurrent callers asking for the same ticker share one in-flight request,
+- recent results are served from a short-lived memory cache,
+- rate-limit errors are retried with exponential backoff.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from . import metrics
+from .lazy import lazy_import
+
+yf = lazy_import("yfinance")
+
+logger = logging.getLogger(__name__)
+
+REQUESTS_PER_SECOND = 20.0
+BURST = 30
+MAX_RETRIES = 3
+INITIAL_BACKOFF_SECONDS = 1.0
+CACHE_TTL_SECONDS = 15 * 60
+CACHE_MAX_ENTRIES = 4096
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, capacity: int) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        # Single event loop, no awaits between check and decrement: no lock needed.
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity, self._tokens + (now - self._updated) * self._rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+class MarketDataGateway:
+    def __init__(
+        self,
+        rate: float = REQUESTS_PER_SECOND,
+        burst: int = BURST,
+        max_retries: int = MAX_RETRIES,
+        initial_backoff: float = INITIAL_BACKOFF_SECONDS,
+        cache_ttl: float = CACHE_TTL_SECONDS,
+    ) -> None:
+        self._bucket = _TokenBucket(rate, burst)
+        self._max_retries = max_retries
+        self._initial_backoff = initial_backoff
+        self._cache_ttl = cache_ttl
+        self._cache: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "retries": 0, "errors": 0}
+
+    async def info(self, ticker: str) -> dict:
+        """`yf.Ticker(ticker).info`, rate-limited, coalesced and cached."""
+        return await self._get(("info", ticker.upper()), lambda: yf.Ticker(ticker).info)
+
+    async def search(self, query: str) -> list[dict]:
+        """`yf.Search(query).quotes`, rate-limited, coalesced and cached."""
+        return await self._get(
+            ("search", query.strip().lower()), lambda: yf.Search(query).quotes
+        )
+
+    def stats(self) -> dict[str, int]:
+        return {**self._stats, "inflight": len(self._inflight), "cached": len(self._cache)}
+
+    async def _get(self, key: tuple[str, str], fetch: Callable[[], Any]) -> Any:
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self._cache_ttl:
+            self._stats["hits"] += 1
+            metrics.cache_lookup("market_data", True)
+            self._cache.move_to_end(key)
+            return entry[1]
+
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self._stats["coalesced"] += 1
+        else:
+            self._stats["misses"] += 1
+            metrics.cache_lookup("market_data", False)
+            task = asyncio.create_task(self._request(key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(
+                lambda t: self._inflight.pop(key) if self._inflight.get(key) is t else None
+            )
+        # shield: one caller giving up must not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _request(self, key: tuple[str, str], fetch: Callable[[], Any]) -> Any:
+        backoff = self._initial_backoff
+        for attempt in range(self._max_retries):
+            await self._bucket.acquire()
+            try:
+                with metrics.call("yahoo", key[0]):
+                    value = await asyncio.to_thread(fetch)
+            except (yf.exceptions.YFRateLimitError, ConnectionError, TimeoutError):
+                if attempt == self._max_retries - 1:
+                    self._stats["errors"] += 1
+                    raise
+                self._stats["retries"] += 1
+                logger.warning(
+                    "yfinance rate limited on %s %s, retrying in %.0fs", *key, backoff
+                )
+                await asyncio.sleep(backoff)
+                backoff *= 2
+            except Exception:
+                self._stats["errors"] += 1
+                raise
+            else:
+                self._cache[key] = (time.monotonic(), value)
+                self._cache.move_to_end(key)
+                while len(self._cache) > CACHE_MAX_ENTRIES:
+                    self._cache.popitem(last=False)
+                return value
+
+
+_gateway = MarketDataGateway()
+
+
+async def get_info(ticker: str) -> dict:
+    return await _gateway.info(ticker)
+
+
+async def search(query: str) -> list[dict]:
+    return await _gateway.search(query)
+
+
+def stats() -> dict[str, int]:
+    return _gateway.stats()
@@ -0,0 +1,199 @@
+"""Process-wide latency histograms and cache counters, in Prometheus text format.
+
+Four families, all in-memory and reset on restart:
+
+- ``app_stage_duration_seconds{stage}`` — internal pipeline stages (screen,
+  enrichment, committee nodes, performance, advisor), via ``span(stage)``.
+- ``app_provider_request_duration_seconds{provider,operation}`` — every call
+  to an external service (Anthropic, OpenAI, Gemini, Finviz, Yahoo), via
+  ``call(provider, operation)``.
+- ``app_cache_requests_total{cache,result}`` — hit/miss per on-disk or
+  in-memory cache, via ``cache_lookup(cache, hit)``.
+- ``app_provider_tokens_total{provider,operation,kind}`` — input/output
+  tokens the LLM providers report, via ``tokens(provider, operation, ...)``.
+
+Both timers are plain context managers (``timed`` is the decorator form), so
+they wrap sync and async code alike, record failures under
+``outcome="error"`` and expose ``elapsed`` for callers that still log it.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from collections import defaultdict
+
+# Seconds; spans from a cached lookup (ms) up to a cold committee run (minutes)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+_STAGE = "app_stage_duration_seconds"
+_PROVIDER = "app_provider_request_duration_seconds"
+_CACHE = "app_cache_requests_total"
+_TOKENS = "app_provider_tokens_total"
+_HELP = {
+    _STAGE: "Duration of internal pipeline stages.",
+    _PROVIDER: "Duration of requests to external providers.",
+    _CACHE: "Cache lookups by result.",
+    _TOKENS: "Tokens reported by LLM providers.",
+}
+
+_lock = threading.Lock()
+_histograms: dict[str, dict[tuple[tuple[str, str], ...], "_Histogram"]] = defaultdict(dict)
+_counters: dict[str, dict[tuple[tuple[str, str], ...], float]] = defaultdict(
+    lambda: defaultdict(float)
+)
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+def observe(name: str, seconds: float, **labels: str) -> None:
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        hist = _histograms[name].get(key)
+        if hist is None:
+            hist = _histograms[name][key] = _Histogram()
+        hist.observe(seconds)
+
+
+def increment(name: str, amount: float = 1, **labels: str) -> None:
+    with _lock:
+        _counters[name][tuple(sorted(labels.items()))] += amount
+
+
+class _Timer:
+    def __init__(self, name: str, labels: dict[str, str]) -> None:
+        self._name = name
+        self._labels = labels
+        self._start = 0.0
+        self.elapsed = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.elapsed = time.perf_counter() - self._start
+        outcome = "error" if exc_type is not None else "ok"
+        observe(self._name, self.elapsed, **self._labels, outcome=outcome)
+
+
+def span(stage: str) -> _Timer:
+    """Times an internal stage: ``with metrics.span("screen"): ...``."""
+    return _Timer(_STAGE, {"stage": stage})
+
+
+def record_stage(stage: str, seconds: float, outcome: str = "ok") -> None:
+    """A stage timed elsewhere, e.g. a pipeline node."""
+    observe(_STAGE, seconds, stage=stage, outcome=outcome)
+
+
+def timed(stage: str):
+    """Decorator form of ``span`` for sync and async functions."""
+
+    def decorate(fn):
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def call(provider: str, operation: str) -> _Timer:
+    """Times one request to an external provider."""
+    return _Timer(_PROVIDER, {"provider": provider, "operation": operation})
+
+
+def cache_lookup(cache: str, hit: bool, count: int = 1) -> None:
+    if count:
+        increment(_CACHE, count, cache=cache, result="hit" if hit else "miss")
+
+
+def tokens(
+    provider: str, operation: str, input_tokens: int | None, output_tokens: int | None
+) -> None:
+    """Usage from one LLM response; None where the provider didn't report it."""
+    for kind, count in (("input", input_tokens), ("output", output_tokens)):
+        if count:
+            increment(_TOKENS, count, provider=provider, operation=operation, kind=kind)
+
+
+def reset() -> None:
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+# ── Exposition ─────────────────────────────────────────────────────────────
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r'\"').replace("\n", r"\n")
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render() -> str:
+    """Every metric in Prometheus text exposition format (version 0.0.4)."""
+    lines: list[str] = []
+    with _lock:
+        histograms = {
+            name: {key: (list(h.counts), h.sum, h.count) for key, h in series.items()}
+            for name, series in _histograms.items()
+        }
+        counters = {n: dict(s) for n, s in _counters.items()}
+
+    for name in sorted(histograms):
+        lines.append(f"# HELP {name} {_HELP.get(name, name)}")
+        lines.append(f"# TYPE {name} histogram")
+        for key in sorted(histograms[name]):
+            counts, total, count = histograms[name][key]
+            cumulative = 0
+            for bound, n in zip(BUCKETS, counts):
+                cumulative += n
+                lines.append(f"{name}_bucket{_labels([*key, ('le', _number(bound))])} {cumulative}")
+            lines.append(f"{name}_bucket{_labels([*key, ('le', '+Inf')])} {count}")
+            lines.append(f"{name}_sum{_labels(key)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(key)} {count}")
+
+    for name in sorted(counters):
+        lines.append(f"# HELP {name} {_HELP.get(name, name)}")
+        lines.append(f"# TYPE {name} counter")
+        for key in sorted(counters[name]):
+            lines.append(f"{name}{_labels(key)} {_number(counters[name][key])}")
+
+    return "\n".join(lines) + "\n"
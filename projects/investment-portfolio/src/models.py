@@ -34,6 +34,23 @@ class WebSource(BaseModel):
     title: str
 
 
+class StageTiming(BaseModel):
+    node: str
+    start_s: float  # seconds since the run started
+    end_s: float
+    status: str  # "ok", "failed", "skipped" (a dependency failed) or "cancelled"
+
+
+class MemberTiming(BaseModel):
+    member: str
+    # "live", "cached" (fresh picks cache), "stale" (older picks reused after
+    # the run budget ran out), "timed_out" or "failed"
+    outcome: str
+    elapsed_s: float = 0.0  # live call time, hedge included
+    hedged: bool = False
+    cache_age_s: float | None = None
+
+
 class CommitteeRun(BaseModel):
     run_id: str
     timestamp: datetime
@@ -42,6 +59,8 @@ class CommitteeRun(BaseModel):
     gemini_picks: list[Pick] = []
     portfolio: list[PortfolioHolding]
     claude_sources: list[WebSource] = []
+    timeline: list[StageTiming] = []
+    member_timings: list[MemberTiming] = []
 
 
 class AdvisorResponse(BaseModel):
@@ -1,81 +1,130 @@
+from __future__ import annotations
+
+import hashlib
 import json
 import logging
-import time
+import os
+import tempfile
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 
-import pandas as pd
-import yfinance as yf
+from . import metrics, price_store
+from .lazy import lazy_import
 
-log = logging.getLogger(__name__)
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
 
-_DOWNLOAD_MAX_RETRIES = 3
-_DOWNLOAD_INITIAL_BACKOFF_SECONDS = 1.0
+log = logging.getLogger(__name__)
 
 BENCHMARKS = ["SPY", "VGT", "VTI"]
 
-_PERF_CACHE_PATH = Path(__file__).parent.parent / "data" / "perf_cache.json"
-_TRACKER_PERF_CACHE_PATH = (
-    Path(__file__).parent.parent / "data" / "tracker_perf_cache.json"
-)
+_PERF_CACHE_DIR = Path(__file__).parent.parent / "data" / "perf_cache"
 _PERF_CACHE_TTL_SECONDS = 4 * 3600
+_PERF_CACHE_MAX_BYTES = 32 * 1024 * 1024
 
+# key → cached_at for entries this process has read or written, so a result
+# can be named (e.g. for an HTTP ETag) without reading it back
+_cached_at: dict[str, str] = {}
 
-def _perf_cache_key(tickers: list[str], since: date) -> str:
-    return "|".join(sorted(tickers)) + f"|{since}"
 
+def _cache_key(kind: str, parts: object) -> str:
+    """Content address for a performance result: hash of its canonical inputs."""
+    canonical = json.dumps([kind, parts], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
 
-def _load_perf_cache(tickers: list[str], since: date) -> pd.DataFrame | None:
-    if not _PERF_CACHE_PATH.exists():
-        return None
+
+def _load_cache(key: str) -> dict | None:
+    path = _PERF_CACHE_DIR / f"{key}.json"
     try:
-        data = json.loads(_PERF_CACHE_PATH.read_text())
+        data = json.loads(path.read_text())
         cached_at = datetime.fromisoformat(data["cached_at"])
         age = (datetime.now(timezone.utc) - cached_at).total_seconds()
         if age > _PERF_CACHE_TTL_SECONDS:
+            metrics.cache_lookup("perf_cache", False)
             return None
-        if data.get("key") != _perf_cache_key(tickers, since):
-            return None
-        return pd.read_json(data["df"], orient="split")
+        os.utime(path)  # mtime is the LRU clock
+        metrics.cache_lookup("perf_cache", True)
+        _cached_at[key] = data["cached_at"]
+        return data["result"]
+    except FileNotFoundError:
+        metrics.cache_lookup("perf_cache", False)
+        return None
     except Exception:
+        log.debug("Perf cache entry %s unreadable", key, exc_info=True)
+        metrics.cache_lookup("perf_cache", False)
         return None
 
 
-def _save_perf_cache(tickers: list[str], since: date, df: pd.DataFrame) -> None:
+def _save_cache(key: str, result: dict) -> None:
     try:
-        _PERF_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-        _PERF_CACHE_PATH.write_text(
-            json.dumps(
-                {
-                    "cached_at": datetime.now(timezone.utc).isoformat(),
-                    "key": _perf_cache_key(tickers, since),
-                    "df": df.to_json(orient="split"),
-                },
-                indent=2,
-            )
-        )
+        _PERF_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = _PERF_CACHE_DIR / f"{key}.json"
+        cached_at = datetime.now(timezone.utc).isoformat()
+        # A temp file per writer: two threads saving the same key never share one
+        with tempfile.NamedTemporaryFile(
+            "w", dir=_PERF_CACHE_DIR, prefix=f".{key}.", suffix=".tmp", delete=False
+        ) as f:
+            try:
+                json.dump({"cached_at": cached_at, "result": result}, f)
+            except BaseException:
+                f.close()
+                os.unlink(f.name)
+                raise
+        os.replace(f.name, path)
+        _cached_at[key] = cached_at
+        _evict_cache()
     except Exception:
-        pass
+        log.warning("Failed to save perf cache entry", exc_info=True)
 
 
-def _download_prices(tickers: list[str], start: date) -> pd.DataFrame:
-    """Downloads price data with retry on empty result (Yahoo Finance rate limits)."""
-    backoff = _DOWNLOAD_INITIAL_BACKOFF_SECONDS
-    for attempt in range(_DOWNLOAD_MAX_RETRIES):
-        raw = yf.download(tickers, start=start, auto_adjust=True, progress=False)
-        if not raw.empty:
-            return raw
-        if attempt < _DOWNLOAD_MAX_RETRIES - 1:
-            log.warning("yfinance returned empty data, retrying in %.0fs", backoff)
-            time.sleep(backoff)
-            backoff *= 2
-    return raw
+def _evict_cache() -> None:
+    """Drop least-recently-used entries until the cache fits its byte budget."""
+    entries = []
+    for path in _PERF_CACHE_DIR.glob("*.json"):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= _PERF_CACHE_MAX_BYTES:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def _holding_values(
+    prices: pd.DataFrame, holdings: list[dict[str, float]]
+) -> np.ndarray:
+    """Daily value of every holding set in one matmul.
+
+    ``prices`` is dates × tickers; each holding maps ticker → quantity (shares
+    or weight). Returns a dates × holdings array. A date is NaN for a holding
+    set while any of its own tickers has no price, matching a per-series sum.
+    """
+    tickers = list(prices.columns)
+    col = {t: i for i, t in enumerate(tickers)}
+    quantities = np.zeros((len(tickers), len(holdings)))
+    for j, holding in enumerate(holdings):
+        for ticker, qty in holding.items():
+            quantities[col[ticker], j] = qty
+
+    matrix = prices.to_numpy(dtype=float)
+    missing = np.isnan(matrix)
+    values = np.where(missing, 0.0, matrix) @ quantities
+    values[(missing.astype(float) @ (quantities != 0)) > 0] = np.nan
+    return values
+
+
+def _series_dict(series: pd.Series) -> dict[str, float]:
+    """ISO-date keyed, NaN-free: safe for both the JSON cache and API responses."""
+    return {ts.isoformat(): float(v) for ts, v in series.dropna().items()}
 
 
 def _fetch_returns(tickers: list[str], start: date) -> pd.DataFrame:
-    raw = _download_prices(tickers, start=start)
-    closes = raw["Close"] if isinstance(raw.columns, pd.MultiIndex) else raw
+    closes = price_store.load_closes(tickers, since=start)
     if closes.empty:
         raise ValueError(
             f"No price data available for {len(tickers)} tickers from {start}"
@@ -83,6 +132,7 @@ def _fetch_returns(tickers: list[str], start: date) -> pd.DataFrame:
     return closes / closes.iloc[0]
 
 
+@metrics.timed("performance.benchmarks")
 def portfolio_vs_benchmarks(
     portfolio_tickers: list[str],
     portfolio_weights: list[float],  # must sum to 100
@@ -95,87 +145,80 @@ def portfolio_vs_benchmarks(
     if since is None:
         since = date.today() - timedelta(days=365)
 
+    holdings = sorted(zip(portfolio_tickers, portfolio_weights))
+    key = _cache_key("benchmarks", {"holdings": holdings, "since": str(since)})
+    cached = _load_cache(key)
+    if cached is not None:
+        return cached
+
     all_tickers = list(set(portfolio_tickers + BENCHMARKS))
 
-    returns = _load_perf_cache(all_tickers, since)
-    if returns is None:
-        try:
-            returns = _fetch_returns(all_tickers, since)
-        except ValueError:
-            log.warning("Price fetch failed for performance chart, returning empty")
-            return {}
-        _save_perf_cache(all_tickers, since, returns)
+    try:
+        returns = _fetch_returns(all_tickers, since)
+    except ValueError:
+        log.warning("Price fetch failed for performance chart, returning empty")
+        return {}
 
     weights = {t: w / 100 for t, w in zip(portfolio_tickers, portfolio_weights)}
     available = [t for t in portfolio_tickers if t in returns.columns]
     if not available:
         return {}
 
-    portfolio_series = sum(returns[t] * weights[t] for t in available)
+    holdings = [{t: weights[t] for t in available}]
+    portfolio_series = pd.Series(
+        _holding_values(returns.ffill(), holdings)[:, 0], index=returns.index
+    )
 
     def summary(series: pd.Series) -> dict:
         total_return = float((series.iloc[-1] - 1) * 100)
-        return {"total_return_pct": round(total_return, 2), "series": series.to_dict()}
+        return {
+            "total_return_pct": round(total_return, 2),
+            "series": _series_dict(series),
+        }
 
     result = {"portfolio": summary(portfolio_series)}
     for ticker in BENCHMARKS:
         if ticker in returns.columns:
             result[ticker.lower()] = summary(returns[ticker])
 
+    _save_cache(key, result)
     return result
 
 
 def _tracker_cache_key(portfolios: list, committee: Optional[dict], since: date) -> str:
-    parts = []
-    for p in sorted(portfolios, key=lambda x: x.name):
-        pos_str = ",".join(
-            f"{pos.ticker}:{pos.shares}"
-            for pos in sorted(p.positions, key=lambda x: x.ticker)
-        )
-        parts.append(f"{p.name}:{pos_str}")
-    if committee:
-        parts.append("committee:" + ",".join(sorted(committee["tickers"])))
-    parts.append(str(since))
-    return "|".join(parts)
-
-
-def _load_tracker_cache(
-    portfolios: list, committee: Optional[dict], since: date
-) -> dict | None:
-    if not _TRACKER_PERF_CACHE_PATH.exists():
-        return None
-    try:
-        data = json.loads(_TRACKER_PERF_CACHE_PATH.read_text())
-        cached_at = datetime.fromisoformat(data["cached_at"])
-        age = (datetime.now(timezone.utc) - cached_at).total_seconds()
-        if age > _PERF_CACHE_TTL_SECONDS:
-            return None
-        if data.get("key") != _tracker_cache_key(portfolios, committee, since):
-            return None
-        return data["result"]
-    except Exception:
+    holdings = {
+        p.name: sorted((pos.ticker, pos.shares) for pos in p.positions)
+        for p in portfolios
+    }
+    committee_holdings = (
+        sorted(zip(committee["tickers"], committee["weights"])) if committee else None
+    )
+    return _cache_key(
+        "tracker",
+        {"portfolios": holdings, "committee": committee_holdings, "since": str(since)},
+    )
+
+
+def _cache_version(key: str) -> str | None:
+    cached_at = _cached_at.get(key)
+    if cached_at is None:
         return None
+    age = (datetime.now(timezone.utc) - datetime.fromisoformat(cached_at)).total_seconds()
+    return f"{key}@{cached_at}" if age <= _PERF_CACHE_TTL_SECONDS else None
 
 
-def _save_tracker_cache(
-    portfolios: list, committee: Optional[dict], since: date, result: dict
-) -> None:
-    try:
-        _TRACKER_PERF_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-        _TRACKER_PERF_CACHE_PATH.write_text(
-            json.dumps(
-                {
-                    "cached_at": datetime.now(timezone.utc).isoformat(),
-                    "key": _tracker_cache_key(portfolios, committee, since),
-                    "result": result,
-                },
-                indent=2,
-            )
-        )
-    except Exception:
-        pass
+def tracked_version(
+    portfolios: list, since: Optional[date] = None, committee: Optional[dict] = None
+) -> str | None:
+    """Names the result ``tracked_portfolios_performance`` would return right
+    now: its cache key and when it was computed. None when this process hasn't
+    seen a fresh entry for those inputs — compute it, then ask again."""
+    if since is None:
+        since = date.today() - timedelta(days=365)
+    return _cache_version(_tracker_cache_key(portfolios, committee, since))
 
 
+@metrics.timed("performance.tracked")
 def tracked_portfolios_performance(
     portfolios: list,  # list[TrackedPortfolio]
     since: Optional[date] = None,
@@ -189,7 +232,8 @@ def tracked_portfolios_performance(
     if since is None:
         since = date.today() - timedelta(days=365)
 
-    cached = _load_tracker_cache(portfolios, committee, since)
+    key = _tracker_cache_key(portfolios, committee, since)
+    cached = _load_cache(key)
     if cached is not None:
         return cached
 
@@ -200,47 +244,171 @@ def tracked_portfolios_performance(
     if committee:
         all_tickers.update(committee["tickers"])
 
-    raw = _download_prices(list(all_tickers), start=since)
-    closes = raw["Close"] if isinstance(raw.columns, pd.MultiIndex) else raw
+    closes = price_store.load_closes(list(all_tickers), since=since)
 
     def summary(series: pd.Series) -> dict:
         normalized = series / series.iloc[0]
         total_return = float((normalized.iloc[-1] - 1) * 100)
         return {
             "total_return_pct": round(total_return, 2),
-            "series": normalized.to_dict(),
+            "series": _series_dict(normalized),
         }
 
-    result: dict = {}
-
+    # One row per output series: (result key, type, ticker → quantity)
+    rows: list[tuple[str, str, dict[str, float]]] = []
     for p in portfolios:
-        available = [pos for pos in p.positions if pos.ticker in closes.columns]
-        if not available:
-            continue
-        shares = {pos.ticker: pos.shares for pos in available}
-        daily_value = pd.Series(0.0, index=closes.index)
-        for t, s in shares.items():
-            daily_value += s * closes[t].ffill()
-        daily_value = daily_value[daily_value > 0]
-        if daily_value.empty:
-            continue
-        result[p.name] = {"type": "portfolio", **summary(daily_value)}
+        shares = {
+            pos.ticker: pos.shares for pos in p.positions if pos.ticker in closes.columns
+        }
+        if shares:
+            rows.append((p.name, "portfolio", shares))
 
     for ticker in ["SPY", "VTI"]:
         col = closes.get(ticker)
         if col is not None and col.notna().any():
-            result[ticker.lower()] = {"type": "benchmark", **summary(col)}
+            rows.append((ticker.lower(), "benchmark", {ticker: 1.0}))
 
     if committee:
         ct = committee["tickers"]
         cw = {t: w / 100 for t, w in zip(ct, committee["weights"])}
-        available_ct = [
-            t for t in ct if t in closes.columns and closes[t].notna().any()
-        ]
+        available_ct = {
+            t: cw[t] for t in ct if t in closes.columns and closes[t].notna().any()
+        }
         if available_ct:
-            comm_value = sum(closes[t] * cw[t] for t in available_ct)
-            result["committee"] = {"type": "committee", **summary(comm_value)}
+            rows.append(("committee", "committee", available_ct))
+
+    values = _holding_values(closes.ffill(), [holding for _, _, holding in rows])
+
+    result: dict = {}
+    for j, (name, kind, _) in enumerate(rows):
+        series = pd.Series(values[:, j], index=closes.index)
+        series = series[series > 0]
+        if series.empty:
+            continue
+        result[name] = {"type": kind, **summary(series)}
 
     if result:
-        _save_tracker_cache(portfolios, committee, since, result)
+        _save_cache(key, result)
     return result
+
+
+# ── Columnar payloads ──────────────────────────────────────────────────────
+
+RANGES = ("1D", "3D", "1W", "1M", "3M", "YTD", "1Y", "3Y", "5Y")
+DEFAULT_RANGE = "1Y"
+_RANGE_DAYS = {"1W": 7, "1M": 30, "3M": 90, "1Y": 365, "3Y": 3 * 365, "5Y": 5 * 365}
+
+
+def _prev_trading_day(day: date, n: int) -> date:
+    while n > 0:
+        day -= timedelta(days=1)
+        if day.weekday() < 5:
+            n -= 1
+    return day
+
+
+def range_start(range_: str, today: Optional[date] = None) -> date:
+    """First date shown for a chart range (same cutoffs the views used to apply)."""
+    today = today or date.today()
+    if range_ in ("1D", "3D"):
+        return _prev_trading_day(today, int(range_[0]))
+    if range_ == "YTD":
+        return date(today.year, 1, 1)
+    return today - timedelta(days=_RANGE_DAYS[range_])
+
+
+def history_start(range_: str, today: Optional[date] = None) -> date:
+    """``since`` to compute a range from: at least the default year, so every
+    sub-year range slices one shared (and cached) result."""
+    today = today or date.today()
+    return min(range_start(range_, today), today - timedelta(days=365))
+
+
+def lttb(values: list[float], threshold: int) -> list[int]:
+    """Indices kept by largest-triangle-three-buckets downsampling.
+
+    Always keeps the first and last point; from each of ``threshold - 2``
+    equal buckets in between, keeps the point forming the largest triangle
+    with the previously kept point and the next bucket's average.
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    kept = [0]
+    width = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * width) + 1
+        end = int((i + 1) * width) + 1
+        # The last bucket looks ahead to the final point alone
+        next_start = end if i < threshold - 3 else n - 1
+        next_end = min(int((i + 2) * width) + 1, n) if i < threshold - 3 else n
+        avg_x = (next_start + next_end - 1) / 2
+        avg_y = sum(values[next_start:next_end]) / (next_end - next_start)
+        ax, ay = a, values[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (values[j] - ay) - (ax - j) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return kept
+
+
+def _downsample(columns: list[list[float | None]], max_points: int) -> list[int]:
+    """Shared-axis indices, at most ``max_points``: the union of each series'
+    LTTB picks, with the point budget split between series. LTTB keeps at
+    least 3 points per series, so with many series the union is then thinned
+    evenly (both ends kept) down to the budget."""
+    n = len(columns[0])
+    budget = max(3, max_points // max(1, len(columns)))
+    keep = {0, n - 1}
+    for column in columns:
+        present = [i for i, v in enumerate(column) if v is not None]
+        picks = lttb([column[i] for i in present], budget)
+        keep.update(present[p] for p in picks)
+    kept = sorted(keep)
+    if len(kept) > max_points:
+        step = (len(kept) - 1) / max(1, max_points - 1)
+        kept = [kept[round(i * step)] for i in range(max_points)]
+    return kept
+
+
+def columnar(
+    result: dict,
+    range_: str = DEFAULT_RANGE,
+    max_points: Optional[int] = None,
+    today: Optional[date] = None,
+) -> dict:
+    """A performance result as one date axis plus parallel arrays.
+
+    Each series is sliced to ``range_`` and expressed as percentage points
+    moved since its first value in range (what the charts plot). Series that
+    don't trade on a date carry ``None`` there. With ``max_points``, long
+    ranges are downsampled with ``lttb``.
+    """
+    cutoff = range_start(range_, today).isoformat()
+    dates = sorted({d for entry in result.values() for d in entry["series"] if d >= cutoff})
+
+    columns: dict[str, list[float | None]] = {}
+    for name, entry in result.items():
+        raw = entry["series"]
+        column = [raw.get(d) for d in dates]
+        base = next((v for v in column if v is not None), None)
+        columns[name] = [None if v is None else round((v - base) * 100, 3) for v in column]
+
+    if max_points and len(dates) > max_points and columns:
+        keep = _downsample(list(columns.values()), max_points)
+        dates = [dates[i] for i in keep]
+        columns = {name: [column[i] for i in keep] for name, column in columns.items()}
+
+    return {
+        "range": range_,
+        "dates": [d[:10] for d in dates],
+        "series": {
+            name: {**{k: v for k, v in entry.items() if k != "series"}, "values": columns[name]}
+            for name, entry in result.items()
+        },
+    }
@@ -0,0 +1,135 @@
+"""Minimal async dependency-graph executor for multi-stage runs.
+
+Nodes are coroutine functions keyed by name. Each node starts as soon as all
+of its dependencies have finished and receives their results as a dict. A
+failed dependency fails its dependents with the same exception, unless a node
+opts in with ``tolerate_failures`` and gets the exception instances instead
+(like ``asyncio.gather(..., return_exceptions=True)``).
+
+Speculative nodes (cache warmers) are never waited for: whatever is still
+running once every other node has finished is cancelled.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from . import metrics, progress
+from .models import StageTiming
+
+logger = logging.getLogger(__name__)
+
+NodeFn = Callable[[dict[str, Any]], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class _Node:
+    name: str
+    fn: NodeFn
+    deps: tuple[str, ...]
+    tolerate_failures: bool
+    speculative: bool
+
+
+class Pipeline:
+    def __init__(self, name: str = "pipeline") -> None:
+        self._name = name  # metrics stage prefix
+        self._nodes: dict[str, _Node] = {}
+
+    def add(
+        self,
+        name: str,
+        fn: NodeFn,
+        deps: tuple[str, ...] = (),
+        *,
+        tolerate_failures: bool = False,
+        speculative: bool = False,
+    ) -> None:
+        """Registers a node. Dependencies must already be registered, which
+        keeps the graph acyclic by construction."""
+        if name in self._nodes:
+            raise ValueError(f"Duplicate pipeline node {name!r}")
+        for dep in deps:
+            if dep not in self._nodes:
+                raise ValueError(f"Node {name!r} depends on unknown node {dep!r}")
+            if self._nodes[dep].speculative and not speculative:
+                raise ValueError(f"Node {name!r} cannot depend on speculative {dep!r}")
+        self._nodes[name] = _Node(name, fn, tuple(deps), tolerate_failures, speculative)
+
+    async def run(self) -> tuple[dict[str, Any], list[StageTiming]]:
+        """Runs the graph; returns each node's result (or exception) and the
+        timeline in completion order."""
+        t0 = time.monotonic()
+        tasks: dict[str, asyncio.Task] = {}
+        timeline: list[StageTiming] = []
+
+        def record(name: str, start: float, status: str) -> None:
+            timing = StageTiming(
+                node=name,
+                start_s=round(start - t0, 3),
+                end_s=round(time.monotonic() - t0, 3),
+                status=status,
+            )
+            timeline.append(timing)
+            progress.emit("node", **timing.model_dump())
+            if status != "skipped":
+                metrics.record_stage(
+                    f"{self._name}.{name}",
+                    timing.end_s - timing.start_s,
+                    "ok" if status == "ok" else "error",
+                )
+
+        async def run_node(node: _Node) -> Any:
+            if node.deps:
+                await asyncio.wait([tasks[d] for d in node.deps])
+            inputs: dict[str, Any] = {}
+            for dep in node.deps:
+                task = tasks[dep]
+                exc = asyncio.CancelledError() if task.cancelled() else task.exception()
+                if exc is not None and not node.tolerate_failures:
+                    record(node.name, time.monotonic(), "skipped")
+                    raise exc
+                inputs[dep] = exc if exc is not None else task.result()
+
+            start = time.monotonic()
+            progress.emit("node", node=node.name, status="started")
+            try:
+                result = await node.fn(inputs)
+            except asyncio.CancelledError:
+                record(node.name, start, "cancelled")
+                raise
+            except Exception:
+                record(node.name, start, "failed")
+                raise
+            record(node.name, start, "ok")
+            return result
+
+        for node in self._nodes.values():
+            tasks[node.name] = asyncio.create_task(run_node(node), name=node.name)
+
+        required = [tasks[n] for n, node in self._nodes.items() if not node.speculative]
+        try:
+            if required:
+                await asyncio.wait(required)
+        finally:
+            pending = [t for t in tasks.values() if not t.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+
+        results = {
+            name: (
+                asyncio.CancelledError()
+                if task.cancelled()
+                else task.exception() or task.result()
+            )
+            for name, task in tasks.items()
+        }
+        logger.info(
+            "Pipeline timeline: %s",
+            ", ".join(f"{s.node} {s.start_s:.1f}-{s.end_s:.1f}s {s.status}" for s in timeline),
+        )
+        return results, timeline
@@ -1,27 +1,41 @@
+import asyncio
 import csv
 import io
-import json
-from pathlib import Path
+import logging
+from typing import Optional
 
-from .enrichment import get_current_prices
+from . import price_store, store
+from .enrichment import get_current_prices, quotes_version
 from .models import PortfolioPosition, TrackedPortfolio
+from .performance import (
+    DEFAULT_RANGE,
+    columnar,
+    history_start,
+    tracked_portfolios_performance,
+)
 
-_PORTFOLIOS_PATH = Path(__file__).parent.parent / "data" / "portfolios.json"
+logger = logging.getLogger(__name__)
 
 
 def load() -> list[TrackedPortfolio]:
-    if not _PORTFOLIOS_PATH.exists():
-        return []
     try:
-        data = json.loads(_PORTFOLIOS_PATH.read_text())
-        return [TrackedPortfolio.model_validate(p) for p in data]
+        data = store.all_items("portfolios")
+        return [TrackedPortfolio.model_validate(p) for p in data.values()]
     except Exception:
         return []
 
 
 def save(tracked: list[TrackedPortfolio]) -> None:
-    _PORTFOLIOS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    _PORTFOLIOS_PATH.write_text(json.dumps([p.model_dump() for p in tracked], indent=2))
+    store.replace_all("portfolios", {p.name: p.model_dump() for p in tracked})
+
+
+def upsert(portfolio: TrackedPortfolio) -> None:
+    """Adds or replaces one portfolio without rewriting the others."""
+    store.upsert("portfolios", portfolio.name, portfolio.model_dump())
+
+
+def delete(name: str) -> bool:
+    return store.delete("portfolios", name)
 
 
 def parse_csv(content: str) -> list[PortfolioPosition]:
@@ -134,3 +148,70 @@ async def get_enriched_portfolios() -> list[dict]:
     all_tickers = list({pos.ticker for p in tracked for pos in p.positions})
     prices = await get_current_prices(all_tickers)
     return [await enrich(p, prices) for p in tracked]
+
+
+def enriched_version() -> tuple | None:
+    """Everything get_enriched_portfolios reads: the portfolios table version
+    and the quotes it prices from. None while a quote is due a refresh."""
+    tickers = sorted({pos.ticker for p in load() for pos in p.positions})
+    quoted = quotes_version(tickers)
+    if quoted is None:
+        return None
+    return store.version("portfolios"), quoted
+
+
+async def spot_prices(
+    tickers: list[str], intraday: bool = False
+) -> dict[str, float | None]:
+    """Spot prices from the last stored close.
+
+    Tickers with no stored bars always fall back to a quote. With
+    ``intraday``, so do tickers whose last bar predates the last completed
+    session (the newest bar the store keeps), and — only while the market is
+    open, when every stored close is a session old — the rest.
+    """
+    latest = price_store.last_closes(tickers)
+    completed = price_store._last_completed_session()
+    live = intraday and price_store._market_open()
+    quote = [
+        t
+        for t in tickers
+        if t not in latest or (intraday and (live or latest[t][0] < completed))
+    ]
+    prices: dict[str, float | None] = {t: close for t, (_, close) in latest.items()}
+    if quote:
+        prices.update(await get_current_prices(quote))
+    return {t: prices.get(t) for t in tickers}
+
+
+async def get_tracker(
+    committee: Optional[dict] = None,
+    intraday: bool = False,
+    range_: str = DEFAULT_RANGE,
+    max_points: Optional[int] = None,
+) -> dict:
+    """Enriched portfolios and their performance from one price acquisition.
+
+    The performance pass tops up the price store; spot prices are then read
+    from its last closes instead of a second per-ticker quote round-trip.
+    Performance comes back columnar, sliced to ``range_``.
+    """
+    tracked = load()
+    performance: dict | None
+    try:
+        result = await asyncio.to_thread(
+            tracked_portfolios_performance,
+            tracked,
+            since=history_start(range_),
+            committee=committee,
+        )
+        performance = columnar(result, range_, max_points)
+    except Exception:
+        logger.warning("Tracker performance failed", exc_info=True)
+        performance = None
+    all_tickers = list({pos.ticker for p in tracked for pos in p.positions})
+    prices = await spot_prices(all_tickers, intraday=intraday)
+    return {
+        "portfolios": [await enrich(p, prices) for p in tracked],
+        "performance": performance,
+    }
@@ -0,0 +1,241 @@
+"""Append-only local store of daily closes, one memory-mapped array per ticker.
+
+Each ticker lives in ``data/prices/<TICKER>.npy`` as a structured array of
+(date, close) sorted by date; ``index.json`` records the earliest date
+covered, the last stored bar and when the ticker was last topped up.
+Readers mmap the arrays and slice by date — nothing is re-parsed. Writers only
+download bars from the last stored date onward, batching every ticker that
+shares a start date into one ``yf.download`` call.
+
+Closes are split/dividend-adjusted (``auto_adjust=True``), and Yahoo rewrites
+adjusted history after every corporate action. Each delta therefore re-fetches
+the last stored bar; if it moved, the stored history is rescaled by the same
+factor before new bars are appended. Only completed sessions are stored, so
+that overlap bar is always a final close — a mid-session top-up leaves today's
+still-moving bar for a later one, which would otherwise read the day's move as
+an adjustment.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from datetime import time as dt_time
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from . import metrics
+from .lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+yf = lazy_import("yfinance")
+
+logger = logging.getLogger(__name__)
+
+_STORE_DIR = Path(__file__).parent.parent / "data" / "prices"
+_FRESH_SECONDS = 4 * 3600
+_RESCALE_TOLERANCE = 1e-6
+_MARKET_TZ = ZoneInfo("America/New_York")
+_SESSION_OPEN = dt_time(9, 30)
+_SESSION_CLOSE = dt_time(16, 0)
+# Yahoo's daily bar settles shortly after the 16:00 close
+_SESSION_FINAL_AFTER = dt_time(16, 30)
+
+# Top-ups run in worker threads; the index is re-read and merged under this
+_index_lock = threading.Lock()
+
+_DOWNLOAD_MAX_RETRIES = 3
+_DOWNLOAD_INITIAL_BACKOFF_SECONDS = 1.0
+
+# A plain field list (numpy accepts it anywhere a dtype goes) keeps numpy unloaded until first use
+_BAR_DTYPE = [("date", "datetime64[D]"), ("close", "f8")]
+
+
+def _download_prices(tickers: list[str], start: date) -> pd.DataFrame:
+    """Downloads price data with retry on empty result (Yahoo Finance rate limits)."""
+    backoff = _DOWNLOAD_INITIAL_BACKOFF_SECONDS
+    for attempt in range(_DOWNLOAD_MAX_RETRIES):
+        with metrics.call("yahoo", "download"):
+            raw = yf.download(tickers, start=start, auto_adjust=True, progress=False)
+        if not raw.empty:
+            return raw
+        if attempt < _DOWNLOAD_MAX_RETRIES - 1:
+            logger.warning("yfinance returned empty data, retrying in %.0fs", backoff)
+            time.sleep(backoff)
+            backoff *= 2
+    return raw
+
+
+def _index_path() -> Path:
+    return _STORE_DIR / "index.json"
+
+
+def _bars_path(ticker: str) -> Path:
+    return _STORE_DIR / f"{ticker.upper()}.npy"
+
+
+def _load_index() -> dict[str, dict]:
+    if not _index_path().exists():
+        return {}
+    try:
+        return json.loads(_index_path().read_text())
+    except Exception:
+        logger.debug("Price store index invalid, rebuilding", exc_info=True)
+        return {}
+
+
+def _save_index(index: dict[str, dict]) -> None:
+    _write_atomic(_index_path(), lambda f: f.write(json.dumps(index, indent=2).encode()))
+
+
+def _update_index(entries: dict[str, dict]) -> None:
+    """Merges ``entries`` into the index on disk. Re-reading under the lock
+    keeps concurrent top-ups of other tickers from being overwritten."""
+    with _index_lock:
+        index = _load_index()
+        index.update(entries)
+        _save_index(index)
+
+
+def _write_atomic(path: Path, write) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A temp file per writer, so concurrent writers never share one
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+    ) as f:
+        try:
+            write(f)
+        except BaseException:
+            f.close()
+            os.unlink(f.name)
+            raise
+    os.replace(f.name, path)  # existing mmaps keep the old inode
+
+
+def _read_bars(ticker: str) -> np.ndarray:
+    path = _bars_path(ticker)
+    if not path.exists():
+        return np.empty(0, dtype=_BAR_DTYPE)
+    return np.load(path, mmap_mode="r")
+
+
+def _to_bars(closes: pd.Series) -> np.ndarray:
+    closes = closes.dropna()
+    bars = np.empty(len(closes), dtype=_BAR_DTYPE)
+    bars["date"] = pd.DatetimeIndex(closes.index).tz_localize(None).values.astype(
+        "datetime64[D]"
+    )
+    bars["close"] = closes.to_numpy(dtype=float)
+    return bars
+
+
+def _last_completed_session(now: datetime | None = None) -> date:
+    """The latest date whose daily bar is final: today once the US session has
+    settled, else yesterday (in market time)."""
+    local = (now or datetime.now(timezone.utc)).astimezone(_MARKET_TZ)
+    if local.time() >= _SESSION_FINAL_AFTER:
+        return local.date()
+    return local.date() - timedelta(days=1)
+
+
+def _market_open(now: datetime | None = None) -> bool:
+    """Whether the US regular session is trading (weekdays 9:30–16:00 New
+    York time; exchange holidays aren't tracked)."""
+    local = (now or datetime.now(timezone.utc)).astimezone(_MARKET_TZ)
+    return local.weekday() < 5 and _SESSION_OPEN <= local.time() < _SESSION_CLOSE
+
+
+def _merge(stored: np.ndarray, fresh: np.ndarray) -> np.ndarray:
+    """Append ``fresh`` after ``stored``, rescaling history if the overlap moved."""
+    if len(fresh) == 0:
+        return np.asarray(stored)
+    first = fresh["date"][0]
+    kept = np.array(stored[stored["date"] < first])
+    overlap = stored[stored["date"] == first]
+    if len(overlap) and overlap["close"][0]:
+        ratio = fresh["close"][0] / overlap["close"][0]
+        if abs(ratio - 1) > _RESCALE_TOLERANCE:
+            logger.info("Rescaling stored history by %.6f (adjustment changed)", ratio)
+            kept["close"] *= ratio
+    return np.concatenate([kept, fresh])
+
+
+def _refresh(tickers: list[str], since: date, index: dict[str, dict]) -> dict[str, dict]:
+    """Download whatever bars are missing; returns the index entries that changed."""
+    now = datetime.now(timezone.utc)
+    completed = np.datetime64(_last_completed_session(now), "D")
+    plans: dict[date, list[str]] = {}
+    for ticker in tickers:
+        meta = index.get(ticker)
+        if meta is None or date.fromisoformat(meta["start"]) > since:
+            plans.setdefault(since, []).append(ticker)
+            continue
+        age = (now - datetime.fromisoformat(meta["fetched_at"])).total_seconds()
+        if age > _FRESH_SECONDS:
+            start = date.fromisoformat(meta["last"]) if meta.get("last") else since
+            plans.setdefault(start, []).append(ticker)
+
+    updated: dict[str, dict] = {}
+    planned = sum(len(group) for group in plans.values())
+    metrics.cache_lookup("price_store", True, len(tickers) - planned)
+    metrics.cache_lookup("price_store", False, planned)
+    for start, group in plans.items():
+        raw = _download_prices(group, start=start)
+        closes = raw["Close"] if isinstance(raw.columns, pd.MultiIndex) else raw
+        for ticker in group:
+            fresh = (
+                _to_bars(closes[ticker])
+                if ticker in closes.columns
+                else np.empty(0, dtype=_BAR_DTYPE)
+            )
+            fresh = fresh[fresh["date"] <= completed]
+            meta = index.get(ticker)
+            backfill = meta is None or date.fromisoformat(meta["start"]) > since
+            stored = np.empty(0, dtype=_BAR_DTYPE) if backfill else _read_bars(ticker)
+            bars = _merge(stored, fresh)
+            if len(bars) or backfill:
+                _write_atomic(_bars_path(ticker), lambda f: np.save(f, bars))
+            updated[ticker] = {
+                "start": since.isoformat() if backfill else meta["start"],
+                "last": str(bars["date"][-1]) if len(bars) else None,
+                "fetched_at": now.isoformat(),
+            }
+        logger.info("Price store: %d tickers topped up from %s", len(group), start)
+    return updated
+
+
+@metrics.timed("prices.load")
+def load_closes(tickers: list[str], since: date) -> pd.DataFrame:
+    """Daily closes from ``since`` (one column per ticker with data), topping up
+    the store with any bars newer than the last stored one."""
+    tickers = sorted(set(tickers))
+    updated = _refresh(tickers, since, _load_index())
+    if updated:
+        _update_index(updated)
+
+    cutoff = np.datetime64(since, "D")
+    columns: dict[str, pd.Series] = {}
+    for ticker in tickers:
+        bars = _read_bars(ticker)
+        bars = bars[bars["date"] >= cutoff]
+        if len(bars):
+            columns[ticker] = pd.Series(
+                np.array(bars["close"]), index=pd.DatetimeIndex(bars["date"])
+            )
+    return pd.DataFrame(columns).sort_index()
+
+
+def last_closes(tickers: list[str]) -> dict[str, tuple[date, float]]:
+    """Most recent stored (date, close) per ticker, without touching the network."""
+    latest: dict[str, tuple[date, float]] = {}
+    for ticker in set(tickers):
+        bars = _read_bars(ticker)
+        if len(bars):
+            latest[ticker] = (bars["date"][-1].item(), float(bars["close"][-1]))
+    return latest
@@ -0,0 +1,31 @@
+"""Progress events for long-running work.
+
+Code deep inside a committee run calls ``progress.emit(stage, **fields)``;
+whichever listener is bound to the current context (a background job)
+receives the event. Outside a listener emit is a no-op, so library code can
+report unconditionally. The listener travels with the context into tasks and
+``asyncio.to_thread`` workers.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
+_listener: ContextVar[Callable[[dict], None] | None] = ContextVar(
+    "progress_listener", default=None
+)
+
+
+def emit(stage: str, **fields) -> None:
+    listener = _listener.get()
+    if listener is not None:
+        listener({"stage": stage, **fields})
+
+
+@contextmanager
+def listen(callback: Callable[[dict], None]) -> Iterator[None]:
+    token = _listener.set(callback)
+    try:
+        yield
+    finally:
+        _listener.reset(token)
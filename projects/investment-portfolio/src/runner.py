@@ -1,44 +1,82 @@
+from __future__ import annotations
+
 import asyncio
 import json
 import logging
+import math
+import os
 import re
 import time
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING, Awaitable, Callable, TypeVar
 
-import anthropic
-from google import genai
-from openai import AsyncOpenAI
+if TYPE_CHECKING:
+    import anthropic
+    from google import genai
+    from openai import AsyncOpenAI
 
+from . import config, metrics, store
 from .committee import claude_member, gemini_member, gpt_member
 
 logger = logging.getLogger(__name__)
 from .committee.aggregator import build_portfolio
-from .config import EXCLUDED_TICKERS
-from .enrichment import enrich_picks_with_prices
-from .models import CommitteeRun, Pick, WebSource
+from .enrichment import enrich_picks_with_prices, prefetch
+from .models import CommitteeRun, MemberTiming, Pick, PortfolioHolding, WebSource
+from .pipeline import Pipeline
 from .screener import format_for_prompt, screen_universe
 
 RUNS_DIR = Path(__file__).parent.parent / "data" / "runs"
-_PICKS_CACHE_DIR = Path(__file__).parent.parent / "data" / "picks_cache"
 _RUN_FILENAME_RE = re.compile(r"^\d{8}_\d{6}$")
+_RUN_INDEX_TOP_TICKERS = 5
+_MEMBERS = ("claude", "gpt", "gemini")
 _PICKS_CACHE_TTL_SECONDS = 24 * 3600
 _RESEARCH_CACHE_TTL_SECONDS = 24 * 3600
 
+# Members still running this long after the run started are cancelled; a
+# member that overran falls back to picks up to _STALE_PICKS_MAX_SECONDS old.
+BUDGET_ENV = "COMMITTEE_BUDGET_SECONDS"
+DEFAULT_BUDGET_SECONDS = 900.0
+_STALE_PICKS_MAX_SECONDS = 7 * 24 * 3600
+# Hedging: a second identical picks call once a member is slower than its p95
+# over the last _LATENCY_HISTORY_RUNS runs (needs _LATENCY_MIN_SAMPLES live calls).
+HEDGE_ENV = "COMMITTEE_HEDGE"
+_LATENCY_HISTORY_RUNS = 20
+_LATENCY_MIN_SAMPLES = 5
 
-def _load_picks_cache(member: str) -> tuple[list[Pick], list[WebSource]] | None:
-    path = _PICKS_CACHE_DIR / f"{member}.json"
-    if not path.exists():
+T = TypeVar("T")
+
+
+class RunBudgetExceeded(TimeoutError):
+    """A member, or the research it needs, was still running when the run's
+    latency budget ran out."""
+
+
+def _read_picks_cache(
+    member: str,
+) -> tuple[float, list[Pick], list[WebSource]] | None:
+    """(age in seconds, picks, sources) of the member's last live picks."""
+    data = store.get("picks_cache", member)
+    if data is None:
         return None
+    cached_at = datetime.fromisoformat(data["cached_at"])
+    age = (datetime.now(timezone.utc) - cached_at).total_seconds()
+    picks = [Pick.model_validate(p) for p in data["picks"]]
+    sources = [WebSource.model_validate(s) for s in data.get("sources", [])]
+    return age, picks, sources
+
+
+def _load_picks_cache(member: str) -> tuple[list[Pick], list[WebSource]] | None:
     try:
-        data = json.loads(path.read_text())
-        cached_at = datetime.fromisoformat(data["cached_at"])
-        age = (datetime.now(timezone.utc) - cached_at).total_seconds()
+        cached = _read_picks_cache(member)
+        if cached is None:
+            metrics.cache_lookup("picks_cache", False)
+            return None
+        age, picks, sources = cached
+        metrics.cache_lookup("picks_cache", age <= _PICKS_CACHE_TTL_SECONDS)
         if age > _PICKS_CACHE_TTL_SECONDS:
             return None
-        picks = [Pick.model_validate(p) for p in data["picks"]]
-        sources = [WebSource.model_validate(s) for s in data.get("sources", [])]
         logger.info("Picks cache hit for %s (%d picks)", member, len(picks))
         return picks, sources
     except Exception:
@@ -46,14 +84,28 @@ def _load_picks_cache(member: str) -> tuple[list[Pick], list[WebSource]] | None:
         return None
 
 
-def _load_research_cache() -> tuple[str, list[WebSource]] | None:
-    path = _PICKS_CACHE_DIR / "research.json"
-    if not path.exists():
+def _load_stale_picks(
+    member: str,
+) -> tuple[float, list[Pick], list[WebSource]] | None:
+    try:
+        cached = _read_picks_cache(member)
+    except Exception:
+        logger.debug("Failed to load picks cache for %s", member, exc_info=True)
+        return None
+    if cached is None or cached[0] > _STALE_PICKS_MAX_SECONDS:
         return None
+    return cached
+
+
+def _load_research_cache() -> tuple[str, list[WebSource]] | None:
     try:
-        data = json.loads(path.read_text())
+        data = store.get("picks_cache", "research")
+        if data is None:
+            metrics.cache_lookup("research_cache", False)
+            return None
         cached_at = datetime.fromisoformat(data["cached_at"])
         age = (datetime.now(timezone.utc) - cached_at).total_seconds()
+        metrics.cache_lookup("research_cache", age <= _RESEARCH_CACHE_TTL_SECONDS)
         if age > _RESEARCH_CACHE_TTL_SECONDS:
             return None
         sources = [WebSource.model_validate(s) for s in data.get("sources", [])]
@@ -65,87 +117,47 @@ def _load_research_cache() -> tuple[str, list[WebSource]] | None:
 
 
 def _save_research_cache(research: str, sources: list[WebSource]) -> None:
+    cached_at = datetime.now(timezone.utc).isoformat()
     try:
-        _PICKS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        (_PICKS_CACHE_DIR / "research.json").write_text(
-            json.dumps(
-                {
-                    "cached_at": datetime.now(timezone.utc).isoformat(),
-                    "research": research,
-                    "sources": [s.model_dump() for s in sources],
-                },
-                indent=2,
-            )
+        store.upsert(
+            "picks_cache",
+            "research",
+            {
+                "cached_at": cached_at,
+                "research": research,
+                "sources": [s.model_dump() for s in sources],
+            },
+            cached_at,
         )
     except Exception:
         logger.warning("Failed to save research cache", exc_info=True)
 
 
 def _save_picks_cache(member: str, picks: list[Pick], sources: list[WebSource]) -> None:
+    cached_at = datetime.now(timezone.utc).isoformat()
     try:
-        _PICKS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        (_PICKS_CACHE_DIR / f"{member}.json").write_text(
-            json.dumps(
-                {
-                    "cached_at": datetime.now(timezone.utc).isoformat(),
-                    "picks": [p.model_dump() for p in picks],
-                    "sources": [s.model_dump() for s in sources],
-                },
-                indent=2,
-            )
+        store.upsert(
+            "picks_cache",
+            member,
+            {
+                "cached_at": cached_at,
+                "picks": [p.model_dump() for p in picks],
+                "sources": [s.model_dump() for s in sources],
+            },
+            cached_at,
         )
     except Exception:
         logger.warning("Failed to save picks cache for %s", member, exc_info=True)
 
 
-async def run_committee(
-    anthropic_client: anthropic.AsyncAnthropic,
-    openai_client: AsyncOpenAI,
-    gemini_client: genai.Client,
-) -> CommitteeRun:
-    screened = await screen_universe()
-    screened_section = format_for_prompt(screened)
-
-    claude_cache = _load_picks_cache("claude")
-    gpt_cache = _load_picks_cache("gpt")
-    gemini_cache = _load_picks_cache("gemini")
-
-    async def _claude() -> tuple[list[Pick], list[WebSource]]:
-        if claude_cache:
-            return claude_cache
-        t0 = time.monotonic()
-        research_cache = _load_research_cache()
-        if research_cache:
-            research, sources = research_cache
-        else:
-            research, sources = await claude_member.get_research(anthropic_client)
-            _save_research_cache(research, sources)
-        picks = await claude_member.get_picks(
-            anthropic_client, screened_section, research
-        )
-        logger.info("Claude total: %.1fs", time.monotonic() - t0)
-        _save_picks_cache("claude", picks, sources)
-        return picks, sources
-
-    async def _gpt() -> list[Pick]:
-        if gpt_cache:
-            return gpt_cache[0]
-        picks = await gpt_member.get_picks(openai_client, screened_section)
-        _save_picks_cache("gpt", picks, [])
-        return picks
-
-    async def _gemini() -> list[Pick]:
-        if gemini_cache:
-            return gemini_cache[0]
-        picks = await gemini_member.get_picks(gemini_client, screened_section)
-        _save_picks_cache("gemini", picks, [])
-        return picks
-
-    results = await asyncio.gather(_claude(), _gpt(), _gemini(), return_exceptions=True)
-
-    claude_result, gpt_result, gemini_result = results
-
-    if isinstance(claude_result, Exception):
+async def _enrich_member_picks(
+    claude_result: tuple[list[Pick], list[WebSource]] | BaseException,
+    gpt_result: list[Pick] | BaseException,
+    gemini_result: list[Pick] | BaseException,
+) -> tuple[list[Pick], list[WebSource]]:
+    """Drops failed or malformed members and excluded tickers, then prices
+    what is left. Returns every surviving pick plus Claude's sources."""
+    if isinstance(claude_result, BaseException):
         logger.warning(
             "Claude member failed — excluding from run", exc_info=claude_result
         )
@@ -153,13 +165,13 @@ async def run_committee(
     else:
         claude_picks, claude_sources = claude_result
 
-    if isinstance(gpt_result, Exception):
+    if isinstance(gpt_result, BaseException):
         logger.warning("GPT member failed — excluding from run", exc_info=gpt_result)
         gpt_picks = []
     else:
         gpt_picks = gpt_result
 
-    if isinstance(gemini_result, Exception):
+    if isinstance(gemini_result, BaseException):
         logger.warning(
             "Gemini member failed — excluding from run", exc_info=gemini_result
         )
@@ -205,18 +217,248 @@ async def run_committee(
             elif member == "gemini":
                 gemini_picks = []
 
-    excluded_upper = {t.upper() for t in EXCLUDED_TICKERS}
-    claude_picks = [p for p in claude_picks if p.ticker.upper() not in excluded_upper]
-    gpt_picks = [p for p in gpt_picks if p.ticker.upper() not in excluded_upper]
-    gemini_picks = [p for p in gemini_picks if p.ticker.upper() not in excluded_upper]
+    excluded = config.current().tickers
+    claude_picks = [p for p in claude_picks if p.ticker.upper() not in excluded]
+    gpt_picks = [p for p in gpt_picks if p.ticker.upper() not in excluded]
+    gemini_picks = [p for p in gemini_picks if p.ticker.upper() not in excluded]
 
     all_picks = await enrich_picks_with_prices(claude_picks + gpt_picks + gemini_picks)
+    return all_picks, claude_sources
+
+
+def _budget_seconds() -> float:
+    raw = os.environ.get(BUDGET_ENV)
+    if raw:
+        try:
+            return float(raw)
+        except ValueError:
+            logger.warning("Ignoring non-numeric %s=%r", BUDGET_ENV, raw)
+    return DEFAULT_BUDGET_SECONDS
+
+
+def _hedge_enabled() -> bool:
+    return os.environ.get(HEDGE_ENV, "").strip().lower() in ("1", "true", "yes")
+
+
+def _latency_p95() -> dict[str, float]:
+    """Each member's p95 live picks latency over recent runs, for members with
+    enough samples."""
+    samples: dict[str, list[float]] = {}
+    for _, entry in store.page("run_index", _LATENCY_HISTORY_RUNS):
+        for member, seconds in entry.get("latency", {}).items():
+            samples.setdefault(member, []).append(seconds)
+    p95 = {}
+    for member, values in samples.items():
+        if len(values) >= _LATENCY_MIN_SAMPLES:
+            values.sort()
+            p95[member] = values[math.ceil(0.95 * len(values)) - 1]
+    return p95
+
+
+async def _hedged(
+    member: str, call: Callable[[], Awaitable[T]], hedge_after: float | None
+) -> tuple[T, bool]:
+    """``call()``, plus an identical second call if the first is still running
+    after ``hedge_after`` seconds. The first to succeed wins and the other is
+    cancelled; returns (result, whether a hedge was sent)."""
+    tasks = [asyncio.ensure_future(call())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done:
+            logger.info("%s slower than its p95 (%.0fs) — hedging", member, hedge_after)
+            tasks.append(asyncio.ensure_future(call()))
+        pending, error = set(tasks), None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), len(tasks) > 1
+                error = error or task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@metrics.timed("committee")
+async def run_committee(
+    anthropic_client: anthropic.AsyncAnthropic,
+    openai_client: AsyncOpenAI,
+    gemini_client: genai.Client,
+    budget_s: float | None = None,
+    hedge: bool | None = None,
+) -> CommitteeRun:
+    """Runs the committee and saves the run.
+
+    Members share one deadline, ``budget_s`` seconds after the run starts
+    (``COMMITTEE_BUDGET_SECONDS``, else 900). A member still running then —
+    or still waiting on research — is cancelled and stands in with its last
+    picks if they are at most a week old, else is left out. With ``hedge``
+    (``COMMITTEE_HEDGE``), a member slower than its recent p95 gets a second
+    identical picks call and the first answer wins.
+    """
+    budget = _budget_seconds() if budget_s is None else budget_s
+    deadline = asyncio.get_running_loop().time() + budget
+    if hedge is None:
+        hedge = _hedge_enabled()
+    hedge_after = _latency_p95() if hedge else {}
+    timings: dict[str, MemberTiming] = {}
+
+    claude_cache = _load_picks_cache("claude")
+    gpt_cache = _load_picks_cache("gpt")
+    gemini_cache = _load_picks_cache("gemini")
+    for member, cached in zip(_MEMBERS, (claude_cache, gpt_cache, gemini_cache)):
+        if cached:
+            timings[member] = MemberTiming(member=member, outcome="cached")
+
+    async def _within_budget(awaitable: Awaitable[T]) -> T:
+        scope = asyncio.timeout_at(deadline)
+        try:
+            async with scope:
+                return await awaitable
+        except TimeoutError:
+            if scope.expired():
+                raise RunBudgetExceeded(f"run budget of {budget:.0f}s exceeded") from None
+            raise
+
+    async def _member(
+        member: str, call: Callable[[], Awaitable[tuple[list[Pick], list[WebSource]]]]
+    ) -> tuple[list[Pick], list[WebSource]]:
+        """``call()`` within the run budget, hedged past the member's p95, and
+        cached. An overrun returns the member's stale picks instead, if any."""
+        start = time.perf_counter()
+        try:
+            result, hedged = await _within_budget(
+                _hedged(member, call, hedge_after.get(member))
+            )
+        except RunBudgetExceeded:
+            elapsed = round(time.perf_counter() - start, 3)
+            stale = _load_stale_picks(member)
+            if stale is None:
+                timings[member] = MemberTiming(
+                    member=member, outcome="timed_out", elapsed_s=elapsed
+                )
+                raise
+            age, picks, sources = stale
+            logger.warning(
+                "%s overran the %.0fs run budget — reusing its picks from %.1fh ago",
+                member,
+                budget,
+                age / 3600,
+            )
+            timings[member] = MemberTiming(
+                member=member, outcome="stale", elapsed_s=elapsed, cache_age_s=round(age)
+            )
+            return picks, sources
+        except Exception:
+            elapsed = round(time.perf_counter() - start, 3)
+            timings[member] = MemberTiming(member=member, outcome="failed", elapsed_s=elapsed)
+            raise
+        elapsed = round(time.perf_counter() - start, 3)
+        timings[member] = MemberTiming(
+            member=member, outcome="live", elapsed_s=elapsed, hedged=hedged
+        )
+        _save_picks_cache(member, *result)
+        return result
+
+    async def _screen(_) -> tuple[list, str]:
+        screened = await screen_universe()
+        return screened, format_for_prompt(screened)
+
+    async def _prefetch(inputs) -> int:
+        # Speculative: warm prices for every screened ticker while members
+        # deliberate, so enrichment below is (mostly) a cache hit.
+        screened, _ = inputs["screen"]
+        return await prefetch([s.ticker for s in screened])
+
+    async def _research(_) -> tuple[str, list[WebSource]] | None:
+        if claude_cache:
+            return None
+        research_cache = _load_research_cache()
+        if research_cache:
+            return research_cache
+        research, sources = await _within_budget(
+            claude_member.get_research(anthropic_client)
+        )
+        _save_research_cache(research, sources)
+        return research, sources
+
+    async def _claude(inputs) -> tuple[list[Pick], list[WebSource]]:
+        if claude_cache:
+            return claude_cache
+
+        async def call() -> tuple[list[Pick], list[WebSource]]:
+            # Tolerates failed inputs so research overrunning the budget
+            # still falls back to stale picks
+            for dep in ("screen", "research"):
+                if isinstance(inputs[dep], BaseException):
+                    raise inputs[dep]
+            _, screened_section = inputs["screen"]
+            research, sources = inputs["research"]
+            picks = await claude_member.get_picks(
+                anthropic_client, screened_section, research
+            )
+            return picks, sources
+
+        return await _member("claude", call)
+
+    async def _gpt(inputs) -> list[Pick]:
+        if gpt_cache:
+            return gpt_cache[0]
+        _, screened_section = inputs["screen"]
+
+        async def call() -> tuple[list[Pick], list[WebSource]]:
+            return await gpt_member.get_picks(openai_client, screened_section), []
+
+        picks, _ = await _member("gpt", call)
+        return picks
+
+    async def _gemini(inputs) -> list[Pick]:
+        if gemini_cache:
+            return gemini_cache[0]
+        _, screened_section = inputs["screen"]
+
+        async def call() -> tuple[list[Pick], list[WebSource]]:
+            return await gemini_member.get_picks(gemini_client, screened_section), []
+
+        picks, _ = await _member("gemini", call)
+        return picks
+
+    async def _enrich(inputs) -> tuple[list[Pick], list[WebSource]]:
+        return await _enrich_member_picks(
+            inputs["claude"], inputs["gpt"], inputs["gemini"]
+        )
+
+    async def _aggregate(inputs) -> list[PortfolioHolding]:
+        all_picks, _ = inputs["enrich"]
+        return build_portfolio(all_picks)
+
+    # A member with a cached result needs neither screening nor research
+    pipeline = Pipeline("committee")
+    pipeline.add("screen", _screen)
+    pipeline.add("prefetch", _prefetch, ("screen",), speculative=True)
+    pipeline.add("research", _research)
+    pipeline.add(
+        "claude",
+        _claude,
+        () if claude_cache else ("screen", "research"),
+        tolerate_failures=True,
+    )
+    pipeline.add("gpt", _gpt, () if gpt_cache else ("screen",))
+    pipeline.add("gemini", _gemini, () if gemini_cache else ("screen",))
+    pipeline.add("enrich", _enrich, ("claude", "gpt", "gemini"), tolerate_failures=True)
+    pipeline.add("aggregate", _aggregate, ("enrich",))
+
+    results, timeline = await pipeline.run()
+    for node in ("screen", "aggregate"):
+        if isinstance(results[node], BaseException):
+            raise results[node]
+    all_picks, claude_sources = results["enrich"]
+    portfolio = results["aggregate"]
     claude_picks = [p for p in all_picks if p.member == "claude"]
     gpt_picks = [p for p in all_picks if p.member == "gpt"]
     gemini_picks = [p for p in all_picks if p.member == "gemini"]
 
-    portfolio = build_portfolio(all_picks)
-
     run = CommitteeRun(
         run_id=str(uuid.uuid4()),
         timestamp=datetime.now(timezone.utc),
@@ -225,18 +467,19 @@ async def run_committee(
         gemini_picks=gemini_picks,
         portfolio=portfolio,
         claude_sources=claude_sources,
+        timeline=timeline,
+        member_timings=[timings[m] for m in _MEMBERS if m in timings],
     )
 
     RUNS_DIR.mkdir(parents=True, exist_ok=True)
     run_file = RUNS_DIR / f"{run.timestamp.strftime('%Y%m%d_%H%M%S')}.json"
     run_file.write_text(run.model_dump_json(indent=2))
+    _index_run(run_file.stem, run)
 
     return run
 
 
-def _filter_run(run: CommitteeRun) -> CommitteeRun:
-    excluded = {t.upper() for t in EXCLUDED_TICKERS}
-
+def _filter_run(run: CommitteeRun, excluded: frozenset[str]) -> CommitteeRun:
     portfolio = [
         h
         for h in run.portfolio
@@ -274,6 +517,14 @@ def _filter_run(run: CommitteeRun) -> CommitteeRun:
     )
 
 
+def runs_version() -> int:
+    """Changes whenever a run file is added or removed: the runs directory's mtime."""
+    try:
+        return RUNS_DIR.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
 def load_latest_run() -> CommitteeRun | None:
     if not RUNS_DIR.exists():
         return None
@@ -284,7 +535,7 @@ def load_latest_run() -> CommitteeRun | None:
     if not files:
         return None
     data = json.loads(files[0].read_text())
-    return _filter_run(CommitteeRun.model_validate(data))
+    return _filter_run(CommitteeRun.model_validate(data), config.current().tickers)
 
 
 def load_all_runs() -> list[CommitteeRun]:
@@ -294,12 +545,115 @@ def load_all_runs() -> list[CommitteeRun]:
         (f for f in RUNS_DIR.glob("*.json") if _RUN_FILENAME_RE.match(f.stem)),
         reverse=True,
     )
+    # One snapshot for the whole list, even if settings are saved meanwhile
+    excluded = config.current().tickers
     runs = []
     for f in files:
         try:
             runs.append(
-                _filter_run(CommitteeRun.model_validate(json.loads(f.read_text())))
+                _filter_run(
+                    CommitteeRun.model_validate(json.loads(f.read_text())), excluded
+                )
             )
         except Exception:
             continue
     return runs
+
+
+# ── Run index ──────────────────────────────────────────────────────────────
+#
+# One compact row per run file (holdings and pick tickers only), keyed by the
+# file stem so key order is chronological. Summaries are derived from it at
+# read time, so exclusions changed after a run still apply without re-reading
+# any run file.
+
+
+def _index_entry(run: CommitteeRun) -> dict:
+    return {
+        "run_id": run.run_id,
+        "timestamp": run.timestamp.isoformat(),
+        "holdings": [
+            [h.ticker, h.conviction, h.weight, len(h.nominated_by)] for h in run.portfolio
+        ],
+        "picks": {m: [p.ticker for p in getattr(run, f"{m}_picks")] for m in _MEMBERS},
+        # Live picks latency per member, for hedging (see _latency_p95)
+        "latency": {
+            t.member: t.elapsed_s for t in run.member_timings if t.outcome == "live"
+        },
+        "names": {
+            p.ticker: p.company_name
+            for p in [*run.claude_picks, *run.gpt_picks, *run.gemini_picks, *run.portfolio]
+        },
+    }
+
+
+def _index_run(run_key: str, run: CommitteeRun) -> None:
+    try:
+        store.upsert("run_index", run_key, _index_entry(run))
+    except Exception:
+        logger.warning("Failed to index run %s", run_key, exc_info=True)
+
+
+def _sync_run_index() -> None:
+    """Index run files written outside run_committee (demo seeds, copies) and
+    drop entries whose file is gone. Compares file names only."""
+    on_disk = (
+        {f.stem: f for f in RUNS_DIR.glob("*.json") if _RUN_FILENAME_RE.match(f.stem)}
+        if RUNS_DIR.exists()
+        else {}
+    )
+    indexed = store.keys("run_index")
+    for run_key in sorted(on_disk.keys() - indexed):
+        try:
+            run = CommitteeRun.model_validate(json.loads(on_disk[run_key].read_text()))
+        except Exception:
+            logger.warning("Skipping unreadable run file %s", on_disk[run_key])
+            continue
+        _index_run(run_key, run)
+    for run_key in indexed - on_disk.keys():
+        store.delete("run_index", run_key)
+
+
+def _summarize(run_key: str, entry: dict, excluded: frozenset[str]) -> dict:
+    # Same holdings _filter_run keeps: not excluded, nominated by 2+ members
+    holdings = [
+        h for h in entry["holdings"] if h[0].upper() not in excluded and h[3] >= 2
+    ]
+    top = sorted(holdings, key=lambda h: h[2], reverse=True)[:_RUN_INDEX_TOP_TICKERS]
+    return {
+        "id": run_key,
+        "run_id": entry["run_id"],
+        "timestamp": entry["timestamp"],
+        "holding_count": len(holdings),
+        "core_count": sum(h[1] == "core" for h in holdings),
+        "moonshot_count": sum(h[1] == "moonshot" for h in holdings),
+        "consensus_count": sum(h[3] > 1 for h in holdings),
+        "pick_counts": {
+            m: sum(t.upper() not in excluded for t in tickers)
+            for m, tickers in entry["picks"].items()
+        },
+        "top_tickers": [h[0] for h in top],
+    }
+
+
+def list_runs(limit: int = 20, offset: int = 0) -> dict:
+    """A page of run summaries, newest first, plus the total run count."""
+    _sync_run_index()
+    excluded = config.current().tickers
+    return {
+        "runs": [
+            _summarize(k, e, excluded) for k, e in store.page("run_index", limit, offset)
+        ],
+        "total": store.count("run_index"),
+    }
+
+
+def load_run(run_key: str) -> CommitteeRun | None:
+    if not _RUN_FILENAME_RE.match(run_key):
+        return None
+    path = RUNS_DIR / f"{run_key}.json"
+    if not path.exists():
+        return None
+    return _filter_run(
+        CommitteeRun.model_validate(json.loads(path.read_text())), config.current().tickers
+    )
@@ -1,76 +1,121 @@
+from __future__ import annotations
+
 import asyncio
-import dataclasses
 import json
 import logging
 import math
-import time
+import os
+import re
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Iterable
 
-import pandas as pd
-import yfinance as yf
-from finvizfinance.screener.financial import Financial
-from finvizfinance.screener.overview import Overview
+from . import config, fundamentals, metrics, progress
+from .lazy import lazy_import
 
-from .config import EXCLUDED_SECTORS, EXCLUDED_TICKERS
+pd = lazy_import("pandas")
 
 logger = logging.getLogger(__name__)
 
 _SCREENER_CACHE_PATH = Path(__file__).parent.parent / "data" / "screener_cache.json"
 _SCREENER_CACHE_TTL_SECONDS = 24 * 3600
-
-
-def _load_screener_cache() -> "list[ScreenedStock] | None":
+# After a crawl that came back empty (Finviz down or blocking us), keep serving
+# the previous snapshot and only try again once this has passed.
+_EMPTY_CRAWL_RETRY_SECONDS = 15 * 60
+# Bumped when the stored columns change; older stores are re-crawled (profiles
+# and FCF verdicts are kept).
+_SCREENER_CACHE_FORMAT = 2
+# Company/sector/industry rarely change; FCF verdicts move with quarterly filings.
+_PROFILE_TTL_SECONDS = 30 * 24 * 3600
+_FCF_VERDICT_TTL_SECONDS = 7 * 24 * 3600
+# Stale profiles beyond this are re-read with a full overview crawl rather than
+# a ticker list that would overflow Finviz's query string.
+_OVERVIEW_BY_TICKER_MAX = 200
+
+_FINANCIAL_COLUMNS = [
+    "Ticker",
+    "Market Cap",
+    "ROE",
+    "ROIC",
+    "Debt/Eq",
+    "Gross M",
+    "Oper M",
+    "PEG",
+    "Earnings",
+]
+# The same columns as finvizfinance custom-view ids (CUSTOM_SCREENER_COLUMNS)
+_FINANCIAL_COLUMN_IDS = [1, 6, 33, 34, 38, 39, 40, 9, 68]
+_PROFILE_COLUMNS = ["Company", "Sector", "Industry"]
+
+
+def _age_seconds(iso: str | None, now: datetime) -> float:
+    if not iso:
+        return math.inf
+    return (now - datetime.fromisoformat(iso)).total_seconds()
+
+
+def _load_screener_cache() -> dict:
+    """Per-ticker screener store: the raw, unfiltered Finviz snapshot.
+
+    {"format": 2, "cached_at": last Finviz crawl, "universe": [every ticker in it],
+     "empty_crawl_at": last crawl that returned nothing (optional),
+     "tickers": {ticker: {"row": {Finviz column: value}, "refreshed_at",
+                          "profile_at", "fcf_passed", "fcf_checked_at"}}}
+    """
+    empty = {"format": _SCREENER_CACHE_FORMAT, "cached_at": None, "universe": [], "tickers": {}}
     if not _SCREENER_CACHE_PATH.exists():
-        return None
+        return empty
     try:
         data = json.loads(_SCREENER_CACHE_PATH.read_text())
-        cached_at = datetime.fromisoformat(data["cached_at"])
-        age = (datetime.now(timezone.utc) - cached_at).total_seconds()
-        if age > _SCREENER_CACHE_TTL_SECONDS:
-            return None
-        stocks = [ScreenedStock(**s) for s in data["stocks"]]
-        logger.info(
-            "Screener cache hit: %d stocks (%.0fh old)", len(stocks), age / 3600
-        )
-        return stocks
+        if "tickers" not in data:
+            return empty
+        if data.get("format") != _SCREENER_CACHE_FORMAT:
+            # Filtered store from before the raw snapshot: re-crawl, keep the rest
+            data.update(format=_SCREENER_CACHE_FORMAT, cached_at=None)
+        return data
     except Exception:
         logger.debug("Screener cache invalid, re-screening", exc_info=True)
-        return None
+        return empty
 
 
-def _save_screener_cache(stocks: "list[ScreenedStock]") -> None:
+def _save_screener_cache(store: dict) -> None:
     try:
         _SCREENER_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-        _SCREENER_CACHE_PATH.write_text(
-            json.dumps(
-                {
-                    "cached_at": datetime.now(timezone.utc).isoformat(),
-                    "stocks": [dataclasses.asdict(s) for s in stocks],
-                },
-                indent=2,
-            )
-        )
+        # Compact: the unfiltered universe is thousands of rows
+        _SCREENER_CACHE_PATH.write_text(json.dumps(store, separators=(",", ":")))
     except Exception:
         logger.warning("Failed to save screener cache", exc_info=True)
 
 
-# Finviz bucket values — D/E "Under 1" (1.0x) is the closest to our 1.5x threshold.
-FINVIZ_FILTERS = {
-    "Gross Margin": "Over 40%",
-    "Debt/Equity": "Under 1",
-    "Market Cap.": "+Mid (over $2bln)",
-    "PEG": "Under 3",
+def _frame_records(df: pd.DataFrame) -> list[dict]:
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+def _store_frame(store: dict, tickers: list[str]) -> pd.DataFrame:
+    rows = [store["tickers"][t]["row"] for t in tickers if t in store["tickers"]]
+    return pd.DataFrame(rows, columns=_FINANCIAL_COLUMNS + _PROFILE_COLUMNS)
+
+
+# Screening presets, applied locally to the raw snapshot: Finviz column →
+# (lower, upper) exclusive bounds. A missing value fails any bound, as it does
+# on Finviz. The default mirrors the Finviz filters we used to send — D/E
+# "Under 1" (1.0x) is the closest bucket to our 1.5x threshold.
+PRESETS: dict[str, dict[str, tuple[float | None, float | None]]] = {
+    "default": {
+        "Gross M": (0.40, None),
+        "Debt/Eq": (None, 1.0),
+        "Market Cap": (2e9, None),
+        "PEG": (None, 3.0),
+    },
 }
+DEFAULT_PRESET = "default"
 
 SUGGESTIONS_ROE_MIN = 0.20
 OPPORTUNITIES_ROE_FLOOR = -0.15
 FCF_EBITDA_MIN = 0.80
 FCF_SALES_MIN = 0.05
 
-MAX_CONCURRENT_FCF_FETCHES = 30
-
 
 @dataclass
 class ScreenedStock:
@@ -85,41 +130,119 @@ class ScreenedStock:
     tier: str  # "suggestion" | "opportunity"
 
 
-def _to_float(val) -> float | None:
-    if val is None:
-        return None
-    try:
-        f = float(val)
-        return None if math.isnan(f) else f
-    except (TypeError, ValueError):
-        return None
+def _run_financial_screener() -> pd.DataFrame:
+    """Financial metrics for the whole, unfiltered Finviz universe.
 
+    The financial view has no PEG, so this asks the custom view for the
+    financial columns plus PEG — still a single crawl.
+    """
+    from finvizfinance.screener.custom import Custom
 
-def _run_financial_screener() -> pd.DataFrame:
-    print("  [screener] Querying Finviz (financial view)...", flush=True)
-    screener = Financial()
-    screener.set_filter(filters_dict=FINVIZ_FILTERS)
-    df = screener.screener_view(verbose=0)
+    print("  [screener] Querying Finviz (financial view, unfiltered)...", flush=True)
+    screener = Custom()
+    with metrics.call("finviz", "financial"):
+        df = screener.screener_view(verbose=0, columns=list(_FINANCIAL_COLUMN_IDS))
     if df is None or df.empty:
         return pd.DataFrame(columns=["Ticker", "ROE", "Gross M"])
     print(f"  [screener] Finviz financial: {len(df)} tickers", flush=True)
-    wanted = ["Ticker", "ROE", "Gross M", "ROIC", "Oper M", "Earnings"]
-    cols = [c for c in wanted if c in df.columns]
+    cols = [c for c in _FINANCIAL_COLUMNS if c in df.columns]
     return df[cols]
 
 
-def _run_overview_screener() -> pd.DataFrame:
+def _run_overview_screener(tickers: list[str] | None = None) -> pd.DataFrame:
+    """Overview view for the whole universe, or only for ``tickers``."""
+    from finvizfinance.screener.overview import Overview
+
     print("  [screener] Querying Finviz (overview view)...", flush=True)
     screener = Overview()
-    screener.set_filter(filters_dict=FINVIZ_FILTERS)
-    df = screener.screener_view(verbose=0)
+    if tickers is not None:
+        screener.set_filter(ticker=",".join(tickers))
+    with metrics.call("finviz", "overview"):
+        df = screener.screener_view(verbose=0)
     if df is None or df.empty:
         return pd.DataFrame(columns=["Ticker", "Company", "Sector"])
-    wanted = ["Ticker", "Company", "Sector", "Industry"]
-    cols = [c for c in wanted if c in df.columns]
+    cols = [c for c in ["Ticker", *_PROFILE_COLUMNS] if c in df.columns]
     return df[cols]
 
 
+def _numeric_column(df: pd.DataFrame, name: str) -> pd.Series:
+    """Column coerced to float; missing columns and unparseable cells become NaN."""
+    if name not in df.columns:
+        return pd.Series(math.nan, index=df.index, dtype=float)
+    return pd.to_numeric(df[name], errors="coerce").astype(float)
+
+
+def _text_column(df: pd.DataFrame, name: str) -> pd.Series:
+    """Column as str objects, with None for missing or empty cells."""
+    if name not in df.columns:
+        return pd.Series(None, index=df.index, dtype=object)
+    col = df[name]
+    present = col.notna() & (col.astype(str) != "")
+    return col.astype(str).astype(object).where(present, None)
+
+
+def _optional(values: pd.Series) -> list:
+    """NaN → None, so survivors carry plain Python floats into ScreenedStock."""
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def _build_stocks(frame: pd.DataFrame, tier: str) -> list[ScreenedStock]:
+    return [
+        ScreenedStock(
+            ticker=ticker,
+            company_name=company,
+            industry=industry,
+            gross_margin=gm,
+            roe=roe,
+            roic=roic,
+            operating_margin=operating_margin,
+            earnings_date=earnings_date,
+            tier=tier,
+        )
+        for ticker, company, industry, gm, roe, roic, operating_margin, earnings_date in zip(
+            frame["ticker"].tolist(),
+            frame["company"].tolist(),
+            frame["industry"].tolist(),
+            _optional(frame["gm"]),
+            _optional(frame["roe"]),
+            _optional(frame["roic"]),
+            _optional(frame["operating_margin"]),
+            frame["earnings_date"].tolist(),
+        )
+    ]
+
+
+def _qualify(merged: pd.DataFrame) -> tuple[list[ScreenedStock], list[ScreenedStock]]:
+    """Split the merged Finviz frame into suggestions and FCF candidates.
+
+    Coercion and tiering are column-wise masks; ScreenedStock objects are only
+    built for rows that survive. Candidates carry tier "opportunity" but still
+    need the FCF check before they qualify.
+    """
+    ticker = merged["Ticker"].astype(str)
+    company = _text_column(merged, "Company")
+    frame = pd.DataFrame(
+        {
+            "ticker": ticker.astype(object),
+            "company": company.where(company.notna(), ticker.astype(object)),
+            "industry": _text_column(merged, "Industry"),
+            "gm": _numeric_column(merged, "Gross M"),
+            "roe": _numeric_column(merged, "ROE"),
+            "roic": _numeric_column(merged, "ROIC"),
+            "operating_margin": _numeric_column(merged, "Oper M"),
+            "earnings_date": _text_column(merged, "Earnings"),
+        },
+        index=merged.index,
+    )
+    roe = frame["roe"]
+    is_suggestion = roe >= SUGGESTIONS_ROE_MIN
+    needs_fcf = (roe > OPPORTUNITIES_ROE_FLOOR) & (roe < 0)
+    return (
+        _build_stocks(frame[is_suggestion], "suggestion"),
+        _build_stocks(frame[needs_fcf], "opportunity"),
+    )
+
+
 def _fcf_qualifies(info: dict) -> bool:
     fcf = info.get("freeCashflow") or 0
     ebitda = info.get("ebitda")
@@ -129,217 +252,365 @@ def _fcf_qualifies(info: dict) -> bool:
     return conv_ok and sales_ok
 
 
-async def _fetch_fcf_info(
-    ticker: str, sem: asyncio.Semaphore, counter: list[int], total: int
-) -> tuple[str, dict | None]:
-    async with sem:
-        try:
-            info = await asyncio.to_thread(lambda: yf.Ticker(ticker).info)
-            return ticker, info
-        except Exception:
-            logger.debug("Failed to fetch FCF info for %s", ticker)
-            return ticker, None
-        finally:
-            counter[0] += 1
-            print(f"  [screener] FCF check: {counter[0]}/{total}", flush=True)
+async def _fetch_fcf_infos(tickers: list[str]) -> list[tuple[str, dict | None]]:
+    """FCF fields per ticker from the configured fundamentals backend; None
+    where the fetch failed."""
+    backend = fundamentals.get_backend()
+    results: list[tuple[str, dict | None]] = []
+    async for ticker, info in backend.fetch(tickers):
+        if info is None:
+            logger.debug("Failed to fetch FCF info for %s via %s", ticker, backend.name)
+        results.append((ticker, info))
+        print(f"  [screener] FCF check: {len(results)}/{len(tickers)}", flush=True)
+        progress.emit("fcf", done=len(results), total=len(tickers))
+    return results
+
+
+def _exclude(merged: pd.DataFrame, excluded: config.Exclusions) -> pd.DataFrame:
+    merged = merged[~merged["Ticker"].str.upper().isin(excluded.tickers)]
+    return merged[~merged["Sector"].isin(excluded.sectors)]
+
+
+def _apply_preset(
+    merged: pd.DataFrame, bounds: dict[str, tuple[float | None, float | None]]
+) -> pd.DataFrame:
+    """Rows inside every bound. NaN compares False, so missing values fail."""
+    keep = pd.Series(True, index=merged.index)
+    for column, (low, high) in bounds.items():
+        values = _numeric_column(merged, column)
+        if low is not None:
+            keep &= values > low
+        if high is not None:
+            keep &= values < high
+    return merged[keep]
+
+
+# ── Snapshot ───────────────────────────────────────────────────────────────
+#
+# Readers share one parsed copy of the stored snapshot (re-parsed only when
+# the file changes) and must not mutate it; writers load their own copy.
+
+_snapshot_memo: tuple[tuple, dict, pd.DataFrame] | None = None
+_refresh_task: asyncio.Task | None = None
+
+
+def _snapshot() -> tuple[dict, pd.DataFrame]:
+    """The stored snapshot and its merged Finviz frame, unfiltered."""
+    global _snapshot_memo
+    path = _SCREENER_CACHE_PATH
+    try:
+        stat = path.stat()
+        key = (path, stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        key = None
+    memo = _snapshot_memo
+    if key is not None and memo is not None and memo[0] == key:
+        return memo[1], memo[2]
+    store = _load_screener_cache()
+    frame = _store_frame(store, store["universe"])
+    _snapshot_memo = (key, store, frame)
+    return store, frame
+
+
+async def _ensure_fresh() -> None:
+    """Re-crawl Finviz once the snapshot is past its TTL, unless the last
+    crawl came back empty within the retry interval. Concurrent callers wait
+    on the same crawl."""
+    global _refresh_task
+    store, _ = _snapshot()
+    now = datetime.now(timezone.utc)
+    age = _age_seconds(store["cached_at"], now)
+    fresh = age <= _SCREENER_CACHE_TTL_SECONDS
+    backing_off = _age_seconds(store.get("empty_crawl_at"), now) <= _EMPTY_CRAWL_RETRY_SECONDS
+    metrics.cache_lookup("screener_cache", fresh or backing_off)
+    if fresh or backing_off:
+        if fresh:
+            logger.info(
+                "Screener cache hit: %d tickers (%.0fh old)",
+                len(store["universe"]),
+                age / 3600,
+            )
+        else:
+            logger.info(
+                "Last Finviz crawl was empty, serving %d stored tickers until retry",
+                len(store["universe"]),
+            )
+        progress.emit("finviz", tickers=len(store["universe"]), cached=True)
+        return
+    task = _refresh_task
+    if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+        task = _refresh_task = asyncio.create_task(_refresh_snapshot())
+    # shield: one caller giving up must not cancel the crawl for the others
+    await asyncio.shield(task)
 
 
-async def screen_universe() -> list[ScreenedStock]:
-    """Screen US equities via Finviz financial + overview views.
+async def _refresh_snapshot() -> None:
+    """Crawl the unfiltered universe into the store.
 
-    yfinance is called only for stocks with slightly negative ROE (-20% to 0%)
-    that need FCF qualification. All other qualification is done via Finviz.
+    The financial view is always re-read; the overview view only for tickers
+    whose profile is missing or stale.
     """
-    cached = _load_screener_cache()
-    if cached is not None:
-        return cached
-
-    excluded_tickers = {t.upper() for t in EXCLUDED_TICKERS}
-
-    t0 = time.monotonic()
-    financial_df, overview_df = await asyncio.gather(
-        asyncio.to_thread(_run_financial_screener),
-        asyncio.to_thread(_run_overview_screener),
-    )
-    print(f"[Finviz done] {time.monotonic() - t0:.1f}s", flush=True)
+    store = _load_screener_cache()
+    now = datetime.now(timezone.utc)
+    known = store["tickers"]
+    fresh_profiles = {
+        t
+        for t, rec in known.items()
+        if _age_seconds(rec.get("profile_at"), now) <= _PROFILE_TTL_SECONDS
+    }
+
+    with metrics.span("screen.finviz") as finviz_span:
+        if fresh_profiles:
+            financial_df = await asyncio.to_thread(_run_financial_screener)
+            stale_profiles = [
+                t for t in financial_df["Ticker"].astype(str) if t not in fresh_profiles
+            ]
+            if len(stale_profiles) > _OVERVIEW_BY_TICKER_MAX:
+                overview_df = await asyncio.to_thread(_run_overview_screener)
+            elif stale_profiles:
+                overview_df = await asyncio.to_thread(_run_overview_screener, stale_profiles)
+            else:
+                overview_df = pd.DataFrame(columns=["Ticker", *_PROFILE_COLUMNS])
+        else:
+            financial_df, overview_df = await asyncio.gather(
+                asyncio.to_thread(_run_financial_screener),
+                asyncio.to_thread(_run_overview_screener),
+            )
+    print(f"[Finviz done] {finviz_span.elapsed:.1f}s", flush=True)
+    progress.emit("finviz", tickers=len(financial_df), cached=False)
 
     if financial_df.empty:
         logger.warning("Finviz financial screener returned no results")
-        return []
-
-    merged = financial_df.merge(overview_df, on="Ticker", how="left")
-    merged = merged[~merged["Ticker"].str.upper().isin(excluded_tickers)]
-    merged = merged[~merged["Sector"].isin(EXCLUDED_SECTORS)]
-
-    suggestions: list[ScreenedStock] = []
-    needs_fcf: list[
-        tuple[
-            str,
-            str,
-            str | None,
-            float | None,
-            float,
-            float | None,
-            float | None,
-            str | None,
-        ]
-    ] = []
-
-    for _, row in merged.iterrows():
-        ticker = str(row["Ticker"])
-        roe = _to_float(row.get("ROE"))
-
-        if roe is None:
-            continue
-
-        gm = _to_float(row.get("Gross M"))
-        roic = _to_float(row.get("ROIC"))
-        operating_margin = _to_float(row.get("Oper M"))
-        earnings_raw = row.get("Earnings")
-        earnings_date = (
-            str(earnings_raw)
-            if earnings_raw
-            and not (isinstance(earnings_raw, float) and math.isnan(earnings_raw))
-            else None
-        )
-        company_raw = row.get("Company")
-        company = (
-            str(company_raw)
-            if company_raw
-            and not (isinstance(company_raw, float) and math.isnan(company_raw))
-            else ticker
-        )
-        industry_raw = row.get("Industry")
-        industry = (
-            str(industry_raw)
-            if industry_raw
-            and not (isinstance(industry_raw, float) and math.isnan(industry_raw))
-            else None
+        # Keep the previous snapshot; back off rather than re-crawl per call
+        store["empty_crawl_at"] = now.isoformat()
+        _save_screener_cache(store)
+        return
+
+    stamp = now.isoformat()
+    profiles = _frame_records(overview_df.reindex(columns=["Ticker", *_PROFILE_COLUMNS]))
+    fetched_profiles = {str(r["Ticker"]): r for r in profiles}
+    universe: list[str] = []
+    for fin in _frame_records(financial_df.reindex(columns=_FINANCIAL_COLUMNS)):
+        ticker = str(fin["Ticker"])
+        universe.append(ticker)
+        rec = known.setdefault(ticker, {"row": {}})
+        profile = fetched_profiles.get(ticker)
+        if profile is not None:
+            rec["row"].update({c: profile[c] for c in _PROFILE_COLUMNS})
+            rec["profile_at"] = stamp
+        rec["row"].update(fin)
+        rec["refreshed_at"] = stamp
+
+    # Forget tickers that have been out of the screen longer than any TTL
+    for ticker in [
+        t
+        for t, rec in known.items()
+        if _age_seconds(rec.get("refreshed_at"), now) > _PROFILE_TTL_SECONDS
+    ]:
+        del known[ticker]
+
+    store["universe"] = universe
+    store["cached_at"] = stamp
+    _save_screener_cache(store)
+
+
+async def _fcf_verdicts(store: dict, candidates: set[str]) -> dict[str, bool | None]:
+    """FCF verdict per candidate, checking only those without a fresh one."""
+    now = datetime.now(timezone.utc)
+    known = store["tickers"]
+    verdicts = {t: known[t].get("fcf_passed") for t in candidates}
+    needs_fcf = sorted(
+        t
+        for t in candidates
+        if _age_seconds(known[t].get("fcf_checked_at"), now) > _FCF_VERDICT_TTL_SECONDS
+    )
+    metrics.cache_lookup("fcf_verdicts", True, len(candidates) - len(needs_fcf))
+    metrics.cache_lookup("fcf_verdicts", False, len(needs_fcf))
+    if not needs_fcf:
+        return verdicts
+
+    print(
+        f"  [screener] {len(needs_fcf)} FCF checks (−15%<ROE<0%, "
+        f"{len(candidates) - len(needs_fcf)} fresh)...",
+        flush=True,
+    )
+    with metrics.span("screen.fcf") as fcf_span:
+        fcf_results = await _fetch_fcf_infos(needs_fcf)
+    # fetch failed → no entry, so the verdict stays stale and we retry
+    fresh = {t: _fcf_qualifies(info) for t, info in fcf_results if info is not None}
+    passed = sum(fresh.values())
+    print(
+        f"[Yahoo done] {fcf_span.elapsed:.1f}s — {passed}/{len(needs_fcf)} passed FCF",
+        flush=True,
+    )
+    progress.emit("fcf_done", passed=passed, total=len(needs_fcf))
+
+    stamp = now.isoformat()
+    latest = _load_screener_cache()
+    for ticker, ok in fresh.items():
+        if ticker in latest["tickers"]:
+            latest["tickers"][ticker].update(fcf_passed=ok, fcf_checked_at=stamp)
+    _save_screener_cache(latest)
+    verdicts.update(fresh)
+    return verdicts
+
+
+async def screen_presets(
+    presets: Iterable[str] = (DEFAULT_PRESET,),
+) -> dict[str, list[ScreenedStock]]:
+    """Screen several ``PRESETS`` against the same snapshot.
+
+    Finviz is crawled at most once a day, unfiltered. Preset bounds and the
+    current exclusions are applied here, in memory, on every call — a
+    Settings change or a preset tweak takes effect on the next screen without
+    touching the network. The only fetches on this path are FCF checks for
+    candidates (slightly negative ROE) without a verdict from the last week,
+    batched across all presets.
+    """
+    await _ensure_fresh()
+    store, universe = _snapshot()
+    universe = _exclude(universe, config.current())
+    qualified = {name: _qualify(_apply_preset(universe, PRESETS[name])) for name in presets}
+    candidates = {s.ticker for _, needs_fcf in qualified.values() for s in needs_fcf}
+    verdicts = await _fcf_verdicts(store, candidates)
+
+    screened = {}
+    for name, (suggestions, needs_fcf) in qualified.items():
+        opportunities = [s for s in needs_fcf if verdicts.get(s.ticker)]
+        logger.info(
+            "Screened %s: %d suggestions, %d opportunities",
+            name,
+            len(suggestions),
+            len(opportunities),
         )
+        screened[name] = suggestions + opportunities
+    return screened
 
-        if roe >= SUGGESTIONS_ROE_MIN:
-            suggestions.append(
-                ScreenedStock(
-                    ticker=ticker,
-                    company_name=company,
-                    industry=industry,
-                    gross_margin=gm,
-                    roe=roe,
-                    roic=roic,
-                    operating_margin=operating_margin,
-                    earnings_date=earnings_date,
-                    tier="suggestion",
-                )
-            )
-        elif OPPORTUNITIES_ROE_FLOOR < roe < 0:
-            needs_fcf.append(
-                (
-                    ticker,
-                    company,
-                    industry,
-                    gm,
-                    roe,
-                    roic,
-                    operating_margin,
-                    earnings_date,
-                )
-            )
 
-    opportunities: list[ScreenedStock] = []
-    if needs_fcf:
-        print(f"  [screener] {len(needs_fcf)} FCF checks (−15%<ROE<0%)...", flush=True)
-        t1 = time.monotonic()
-        sem = asyncio.Semaphore(MAX_CONCURRENT_FCF_FETCHES)
-        counter = [0]
-        fcf_results = await asyncio.gather(
-            *[_fetch_fcf_info(t, sem, counter, len(needs_fcf)) for t, *_ in needs_fcf]
-        )
-        fcf_map = {ticker: info for ticker, info in fcf_results}
+async def screen_universe(preset: str = DEFAULT_PRESET) -> list[ScreenedStock]:
+    """Screen US equities with one preset (see ``screen_presets``).
 
-        for (
-            ticker,
-            company,
-            industry,
-            gm,
-            roe,
-            roic,
-            operating_margin,
-            earnings_date,
-        ) in needs_fcf:
-            info = fcf_map.get(ticker)
-            if info and _fcf_qualifies(info):
-                opportunities.append(
-                    ScreenedStock(
-                        ticker=ticker,
-                        company_name=company,
-                        industry=industry,
-                        gross_margin=gm,
-                        roe=roe,
-                        roic=roic,
-                        operating_margin=operating_margin,
-                        earnings_date=earnings_date,
-                        tier="opportunity",
-                    )
-                )
-        print(
-            f"[Yahoo done] {time.monotonic() - t1:.1f}s — {len(opportunities)}/{len(needs_fcf)} passed FCF",
-            flush=True,
-        )
+    The fundamentals backend is called only for stocks with slightly negative
+    ROE (-15% to 0%) that need FCF qualification. All other qualification is
+    done on Finviz data.
+    """
+    return (await screen_presets([preset]))[preset]
 
-    logger.info(
-        "Screened: %d suggestions, %d opportunities",
-        len(suggestions),
-        len(opportunities),
-    )
-    result = suggestions + opportunities
-    _save_screener_cache(result)
-    return result
 
+# ── Prompt encoding ────────────────────────────────────────────────────────
+#
+# The screened section is the bulk of every member's picks prompt, so it goes
+# out as a pipe-separated table grouped by industry: one header row per tier,
+# whole-number percentages, blank cells for missing values. Every row still
+# starts with its ticker.
 
-def format_for_prompt(stocks: list[ScreenedStock]) -> str:
-    """Format screened stocks as two labeled sections for member prompts."""
-    if not stocks:
-        return ""
+PROMPT_BUDGET_ENV = "PROMPT_TOKEN_BUDGET"
+DEFAULT_PROMPT_TOKEN_BUDGET = 5000
+# Budgeting only needs an upper estimate: English runs ~4 chars per token,
+# short numbers and separators nearer 3.
+_CHARS_PER_TOKEN = 3
 
-    def stock_line(s: ScreenedStock) -> str:
-        metrics: list[str] = []
-        if s.gross_margin is not None:
-            metrics.append(f"gross margin {s.gross_margin:.0%}")
-        if s.roe is not None:
-            metrics.append(f"ROE {s.roe:.0%}")
-        if s.roic is not None:
-            metrics.append(f"ROIC {s.roic:.0%}")
-        if s.operating_margin is not None:
-            metrics.append(f"oper margin {s.operating_margin:.0%}")
-        if s.earnings_date is not None:
-            metrics.append(f"earnings {s.earnings_date}")
-        metric_str = ", ".join(metrics) if metrics else "metrics unavailable"
-        industry_str = f" [{s.industry}]" if s.industry else ""
-        return f"{s.ticker} ({s.company_name}){industry_str} — {metric_str}"
-
-    suggestions = sorted(
-        [s for s in stocks if s.tier == "suggestion"], key=lambda x: x.ticker
-    )
-    opportunities = sorted(
-        [s for s in stocks if s.tier == "opportunity"], key=lambda x: x.ticker
-    )
+_TIER_HEADINGS = {
+    "suggestion": "SUGGESTIONS — quality compounders (ROE ≥ 20%, pick primarily from here):",
+    "opportunity": "OPPORTUNITIES — turnaround/recovery plays (negative ROE but strong FCF; higher risk, use sparingly):",
+}
+_TABLE_NOTE = "Screened stocks, grouped by industry. Margins and returns in %; blank = n/a."
+_TABLE_HEADER = "ticker|company|gross margin|ROE|ROIC|oper margin|earnings"
+_CLOSING = "Pick only from the stocks listed above."
+_LEGAL_SUFFIX_RE = re.compile(
+    r"[,\s]+(?:Inc|Corp|Corporation|Co|Ltd|Limited|plc|PLC|LLC|N\.V|S\.A|AG|SE)\.?$"
+)
 
-    lines: list[str] = []
 
-    if suggestions:
-        lines.append(
-            "SUGGESTIONS — quality compounders (ROE ≥ 20%, pick primarily from here):"
-        )
-        lines.extend(stock_line(s) for s in suggestions)
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+
+def _prompt_token_budget() -> int:
+    raw = os.environ.get(PROMPT_BUDGET_ENV)
+    if raw:
+        try:
+            return int(raw)
+        except ValueError:
+            logger.warning("Ignoring non-integer %s=%r", PROMPT_BUDGET_ENV, raw)
+    return DEFAULT_PROMPT_TOKEN_BUDGET
+
+
+def _percent(value: float | None) -> str:
+    return "" if value is None else f"{value * 100:.0f}"
 
-    if opportunities:
-        if lines:
-            lines.append("")
-        lines.append(
-            "OPPORTUNITIES — turnaround/recovery plays (negative ROE but strong FCF; higher risk, use sparingly):"
+
+def _prompt_row(s: ScreenedStock) -> str:
+    company = _LEGAL_SUFFIX_RE.sub("", s.company_name).replace("|", "/")
+    return "|".join(
+        (
+            s.ticker,
+            company,
+            _percent(s.gross_margin),
+            _percent(s.roe),
+            _percent(s.roic),
+            _percent(s.operating_margin),
+            s.earnings_date or "",
         )
-        lines.extend(stock_line(s) for s in opportunities)
+    )
+
+
+def _prompt_rank(s: ScreenedStock) -> tuple:
+    """Suggestions first, then by return on capital (ROIC, else ROE); ticker
+    breaks ties so truncation is deterministic."""
+    quality = s.roic if s.roic is not None else s.roe
+    return (s.tier != "suggestion", -(quality if quality is not None else -math.inf), s.ticker)
 
+
+def format_for_prompt(stocks: list[ScreenedStock], max_tokens: int | None = None) -> str:
+    """Screened stocks as a compact table for member prompts.
+
+    At most ``max_tokens`` (estimated; default ``PROMPT_TOKEN_BUDGET`` from the
+    environment, else 5000). When the list doesn't fit, the lowest-ranked
+    stocks (see ``_prompt_rank``) are dropped and the omission is noted.
+    """
+    if not stocks:
+        return ""
+    budget = max_tokens if max_tokens is not None else _prompt_token_budget()
+
+    omission = "({} lower-ranked screened stocks omitted for length.)"
+    used = estimate_tokens(
+        "\n".join([_TABLE_NOTE, _CLOSING, omission.format(len(stocks))])
+    )
+    kept: dict[str, dict[str, list[str]]] = {}  # tier → industry → rows
+    for s in sorted(stocks, key=_prompt_rank):
+        row = _prompt_row(s)
+        industry = s.industry or "Other"
+        cost = estimate_tokens(row) + 1
+        groups = kept.get(s.tier)
+        if groups is None:
+            cost += estimate_tokens(_TIER_HEADINGS[s.tier] + _TABLE_HEADER) + 3
+        if groups is None or industry not in groups:
+            cost += estimate_tokens(industry) + 2
+        if used + cost > budget:
+            break
+        used += cost
+        kept.setdefault(s.tier, {}).setdefault(industry, []).append(row)
+    included = sum(len(rows) for groups in kept.values() for rows in groups.values())
+
+    lines = [_TABLE_NOTE]
+    for tier in ("suggestion", "opportunity"):
+        if tier not in kept:
+            continue
+        lines += ["", _TIER_HEADINGS[tier], _TABLE_HEADER]
+        for industry in sorted(kept[tier]):
+            lines.append(f"## {industry}")
+            lines.extend(sorted(kept[tier][industry]))
     lines.append("")
-    lines.append("Pick only from the stocks listed above.")
-    return "\n".join(lines)
+    if included < len(stocks):
+        lines.append(omission.format(len(stocks) - included))
+    lines.append(_CLOSING)
+    text = "\n".join(lines)
+    logger.info(
+        "Prompt section: %d/%d stocks, ~%d tokens (budget %d)",
+        included,
+        len(stocks),
+        estimate_tokens(text),
+        budget,
+    )
+    return text
@@ -0,0 +1,370 @@
+"""Embedded SQLite store behind the app's caches, logs and portfolios.
+
+One table per concern, one row per key, JSON payloads. The database runs in
+WAL mode so readers never block the single writer, and every mutation is a
+single-statement upsert or a short transaction — concurrent requests no
+longer read-modify-write whole JSON files and clobber each other.
+
+Legacy JSON files (and the demo seeds copied from ``*.example.*``) are
+imported once, the first time the database is opened.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+
+_DATA_DIR = Path(__file__).parent.parent / "data"
+
+# Keyed tables: (key, cached_at, data). cached_at is NULL where it has no meaning.
+KEYED_TABLES = (
+    "advisor_cache",
+    "enrichment_cache",
+    "picks_cache",
+    "portfolios",
+    "run_index",
+    "settings",
+    "symbol_cache",
+)
+_LEGACY_TABLES = (
+    "advisor_cache",
+    "enrichment_cache",
+    "picks_cache",
+    "portfolios",
+    "advisor_log",
+    "settings",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS advisor_cache (
+    key TEXT PRIMARY KEY, cached_at TEXT, data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS enrichment_cache (
+    key TEXT PRIMARY KEY, cached_at TEXT, data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS picks_cache (
+    key TEXT PRIMARY KEY, cached_at TEXT, data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS portfolios (
+    key TEXT PRIMARY KEY, cached_at TEXT, data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_index (
+    key TEXT PRIMARY KEY, cached_at TEXT, data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY, cached_at TEXT, data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS symbol_cache (
+    key TEXT PRIMARY KEY, cached_at TEXT, data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS advisor_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    recommendation TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS advisor_log_ticker ON advisor_log (ticker, timestamp);
+CREATE INDEX IF NOT EXISTS advisor_log_timestamp ON advisor_log (timestamp);
+CREATE INDEX IF NOT EXISTS advisor_log_recommendation ON advisor_log (recommendation, timestamp);
+CREATE TABLE IF NOT EXISTS migrations (name TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS versions (
+    name TEXT PRIMARY KEY, version INTEGER NOT NULL, updated_at REAL NOT NULL
+);
+"""
+
+_local = threading.local()
+
+
+def _db_path() -> Path:
+    return _DATA_DIR / "app.db"
+
+
+def connect() -> sqlite3.Connection:
+    """Per-thread connection to the app database, created on first use."""
+    path = _db_path()
+    conns: dict[Path, sqlite3.Connection] = getattr(_local, "conns", None) or {}
+    _local.conns = conns
+    conn = conns.get(path)
+    if conn is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=5.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        _import_legacy(conn)
+        conns[path] = conn
+    return conn
+
+
+# ── Keyed tables ───────────────────────────────────────────────────────────
+
+
+def get(table: str, key: str) -> dict | None:
+    assert table in KEYED_TABLES
+    row = connect().execute(f"SELECT data FROM {table} WHERE key = ?", (key,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def get_many(table: str, keys: Iterable[str]) -> dict[str, dict]:
+    assert table in KEYED_TABLES
+    keys = list(keys)
+    if not keys:
+        return {}
+    placeholders = ",".join("?" * len(keys))
+    rows = connect().execute(
+        f"SELECT key, data FROM {table} WHERE key IN ({placeholders})", keys
+    )
+    return {key: json.loads(data) for key, data in rows}
+
+
+def all_items(table: str) -> dict[str, dict]:
+    """Every row in insertion order."""
+    assert table in KEYED_TABLES
+    rows = connect().execute(f"SELECT key, data FROM {table} ORDER BY rowid")
+    return {key: json.loads(data) for key, data in rows}
+
+
+def keys(table: str) -> set[str]:
+    assert table in KEYED_TABLES
+    return {key for (key,) in connect().execute(f"SELECT key FROM {table}")}
+
+
+def count(table: str) -> int:
+    assert table in KEYED_TABLES
+    return connect().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def page(table: str, limit: int, offset: int = 0) -> list[tuple[str, dict]]:
+    """(key, data) pairs in descending key order."""
+    assert table in KEYED_TABLES
+    rows = connect().execute(
+        f"SELECT key, data FROM {table} ORDER BY key DESC LIMIT ? OFFSET ?", (limit, offset)
+    )
+    return [(key, json.loads(data)) for key, data in rows]
+
+
+def upsert(table: str, key: str, data: dict, cached_at: str | None = None) -> None:
+    upsert_many(table, {key: data}, cached_at)
+
+
+def upsert_many(table: str, items: dict[str, dict], cached_at: str | None = None) -> None:
+    assert table in KEYED_TABLES
+    with _transaction() as conn:
+        conn.executemany(
+            f"INSERT INTO {table} (key, cached_at, data) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET "
+            "cached_at = excluded.cached_at, data = excluded.data",
+            [(k, cached_at, json.dumps(v)) for k, v in items.items()],
+        )
+        _bump(conn, table)
+
+
+def delete(table: str, key: str) -> bool:
+    assert table in KEYED_TABLES
+    with _transaction() as conn:
+        cur = conn.execute(f"DELETE FROM {table} WHERE key = ?", (key,))
+        if cur.rowcount:
+            _bump(conn, table)
+    return cur.rowcount > 0
+
+
+def replace_all(table: str, items: dict[str, dict]) -> None:
+    assert table in KEYED_TABLES
+    with _transaction() as conn:
+        conn.execute(f"DELETE FROM {table}")
+        conn.executemany(
+            f"INSERT INTO {table} (key, cached_at, data) VALUES (?, NULL, ?)",
+            [(k, json.dumps(v)) for k, v in items.items()],
+        )
+        _bump(conn, table)
+
+
+# ── Advisor log ────────────────────────────────────────────────────────────
+
+
+def log_append(entry: dict) -> None:
+    log_append_many([entry])
+
+
+def log_append_many(entries: list[dict]) -> None:
+    with _transaction() as conn:
+        conn.executemany(
+            "INSERT INTO advisor_log (timestamp, ticker, recommendation, data) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (e["timestamp"], e["ticker"], e.get("recommendation"), json.dumps(e))
+                for e in entries
+            ],
+        )
+        _bump(conn, "advisor_log")
+
+
+def log_entries() -> list[dict]:
+    rows = connect().execute("SELECT data FROM advisor_log ORDER BY id")
+    return [json.loads(data) for (data,) in rows]
+
+
+def _log_where(
+    ticker: str | None,
+    since: str | None,
+    before: str | None,
+    recommendation: str | None,
+    after_id: int | None = None,
+) -> tuple[str, list]:
+    clauses, params = [], []
+    for clause, value in (
+        ("ticker = ?", ticker),
+        ("timestamp >= ?", since),
+        ("timestamp < ?", before),
+        ("recommendation = ?", recommendation),
+        ("id > ?", after_id),
+    ):
+        if value is not None:
+            clauses.append(clause)
+            params.append(value)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def log_query(
+    *,
+    ticker: str | None = None,
+    since: str | None = None,
+    before: str | None = None,
+    recommendation: str | None = None,
+    after_id: int | None = None,
+    newest_first: bool = False,
+    limit: int = -1,
+    offset: int = 0,
+) -> list[tuple[int, dict]]:
+    """(id, entry) pairs matching every given filter; ``before`` is exclusive."""
+    where, params = _log_where(ticker, since, before, recommendation, after_id)
+    order = "DESC" if newest_first else "ASC"
+    rows = connect().execute(
+        f"SELECT id, data FROM advisor_log{where} ORDER BY id {order} LIMIT ? OFFSET ?",
+        [*params, limit, offset],
+    )
+    return [(row_id, json.loads(data)) for row_id, data in rows]
+
+
+def log_count(
+    *,
+    ticker: str | None = None,
+    since: str | None = None,
+    before: str | None = None,
+    recommendation: str | None = None,
+) -> int:
+    where, params = _log_where(ticker, since, before, recommendation)
+    return connect().execute(f"SELECT COUNT(*) FROM advisor_log{where}", params).fetchone()[0]
+
+
+# ── Versions ───────────────────────────────────────────────────────────────
+#
+# Every mutation bumps its table's row in the same transaction, so readers in
+# any process can tell whether a table changed with one primary-key lookup
+# (HTTP validators are built from these).
+
+
+def version(table: str) -> tuple[int, float]:
+    """(change count, unix time of the last change); (0, 0.0) if never written."""
+    row = connect().execute(
+        "SELECT version, updated_at FROM versions WHERE name = ?", (table,)
+    ).fetchone()
+    return (row[0], row[1]) if row else (0, 0.0)
+
+
+def _bump(conn: sqlite3.Connection, table: str) -> None:
+    conn.execute(
+        "INSERT INTO versions (name, version, updated_at) VALUES (?, 1, ?) "
+        "ON CONFLICT (name) DO UPDATE SET "
+        "version = version + 1, updated_at = excluded.updated_at",
+        (table, time.time()),
+    )
+
+
+# ── Internals ──────────────────────────────────────────────────────────────
+
+
+class _transaction:
+    """BEGIN IMMEDIATE … COMMIT: takes the write lock up front, so two writers
+    queue on busy_timeout instead of failing mid-transaction."""
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._conn = connect()
+        self._conn.execute("BEGIN IMMEDIATE")
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+def _read_json(path: Path):
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text())
+    except Exception:
+        logger.warning("Skipping unreadable legacy file %s", path, exc_info=True)
+        return None
+
+
+def _legacy_rows(name: str) -> list[tuple[str, str | None, dict]] | list[dict]:
+    if name == "advisor_log":
+        return _read_json(_DATA_DIR / "advisor_log.json") or []
+    if name == "portfolios":
+        data = _read_json(_DATA_DIR / "portfolios.json") or []
+        return [(p["name"], None, p) for p in data]
+    if name == "settings":
+        data = _read_json(_DATA_DIR / "exclusions.json") or {}
+        return [
+            (f"excluded_{kind}", None, {"values": data[kind]})
+            for kind in ("tickers", "sectors")
+            if kind in data
+        ]
+    if name == "picks_cache":
+        rows = []
+        for path in sorted((_DATA_DIR / "picks_cache").glob("*.json")):
+            if ".example" in path.name:
+                continue
+            data = _read_json(path)
+            if data:
+                rows.append((path.stem, data.get("cached_at"), data))
+        return rows
+    data = _read_json(_DATA_DIR / f"{name}.json") or {}
+    return [(key, entry.get("cached_at"), entry) for key, entry in data.items()]
+
+
+def _import_legacy(conn: sqlite3.Connection) -> None:
+    for name in _LEGACY_TABLES:
+        conn.execute("BEGIN IMMEDIATE")  # first-open races: one thread imports
+        if conn.execute("SELECT 1 FROM migrations WHERE name = ?", (name,)).fetchone():
+            conn.execute("COMMIT")
+            continue
+        try:
+            rows = _legacy_rows(name)
+            if name == "advisor_log":
+                conn.executemany(
+                    "INSERT INTO advisor_log (timestamp, ticker, recommendation, data) "
+                    "VALUES (?, ?, ?, ?)",
+                    [
+                        (e["timestamp"], e["ticker"], e.get("recommendation"), json.dumps(e))
+                        for e in rows
+                    ],
+                )
+            else:
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO {name} (key, cached_at, data) VALUES (?, ?, ?)",
+                    [(k, c, json.dumps(d)) for k, c, d in rows],
+                )
+            conn.execute("INSERT INTO migrations (name) VALUES (?)", (name,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if rows:
+            logger.info("Imported %d legacy %s rows into SQLite", len(rows), name)
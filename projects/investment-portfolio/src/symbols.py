@@ -0,0 +1,217 @@
+"""Local ticker symbol index for resolution and autocomplete.
+
+Built from symbols the app already knows — the screener universe, every
+indexed committee run, and cached network searches — so resolving "AAPL" or
+"apple" does not hit Yahoo. Exact and prefix lookups are dict hits and
+bisections over sorted keys; fuzzy matching (difflib) only runs when those
+come up short.
+
+The index is rebuilt lazily when any source changes, checked at most every
+``_RECHECK_SECONDS``.
+"""
+
+import bisect
+import difflib
+import logging
+import re
+import time
+from datetime import datetime, timezone
+
+from . import metrics, screener, store
+
+logger = logging.getLogger(__name__)
+
+_RECHECK_SECONDS = 30
+_SEARCH_CACHE_TTL_SECONDS = 30 * 24 * 3600
+_FUZZY_CUTOFF = 0.75
+
+# Corporate suffixes dropped from names so "Apple" matches "Apple Inc."
+_NAME_NOISE = re.compile(
+    r"\b(inc|incorporated|corp|corporation|co|company|ltd|limited|plc|sa|nv|ag|"
+    r"holdings?|group|class [a-z])\b\.?"
+)
+
+
+def _normalize_name(name: str) -> str:
+    name = _NAME_NOISE.sub(" ", name.lower().replace("&", " and "))
+    return " ".join(re.findall(r"[a-z0-9]+", name))
+
+
+class _Index:
+    def __init__(self, names: dict[str, str | None]) -> None:
+        self.names = names
+        self.symbols = sorted(names)
+        self.by_name: dict[str, str] = {}
+        tokens: dict[str, set[str]] = {}
+        for symbol, name in names.items():
+            if not name:
+                continue
+            normalized = _normalize_name(name)
+            self.by_name.setdefault(normalized, symbol)
+            for token in normalized.split():
+                tokens.setdefault(token, set()).add(symbol)
+        self.tokens = sorted(tokens)
+        self.token_symbols = tokens
+
+    def symbol_prefix(self, prefix: str, limit: int) -> list[str]:
+        i = bisect.bisect_left(self.symbols, prefix)
+        out = []
+        while i < len(self.symbols) and self.symbols[i].startswith(prefix) and len(out) < limit:
+            out.append(self.symbols[i])
+            i += 1
+        return out
+
+    def name_prefix(self, prefix: str, limit: int) -> list[str]:
+        i = bisect.bisect_left(self.tokens, prefix)
+        out: list[str] = []
+        while i < len(self.tokens) and self.tokens[i].startswith(prefix) and len(out) < limit:
+            out.extend(sorted(self.token_symbols[self.tokens[i]] - set(out)))
+            i += 1
+        return out[:limit]
+
+
+_index: _Index | None = None
+_signature: tuple | None = None
+_checked_at = 0.0
+
+
+def _current_signature() -> tuple:
+    path = screener._SCREENER_CACHE_PATH
+    return (
+        path.stat().st_mtime_ns if path.exists() else None,
+        store.count("run_index"),
+        store.count("symbol_cache"),
+    )
+
+
+def _build() -> _Index:
+    names: dict[str, str | None] = {}
+
+    def add(symbol, name) -> None:
+        if symbol:
+            symbol = str(symbol).upper()
+            names[symbol] = names.get(symbol) or (str(name) if name else None)
+
+    for entry in store.all_items("symbol_cache").values():
+        for quote in entry["quotes"]:
+            add(quote["symbol"], quote.get("name"))
+    for entry in store.all_items("run_index").values():
+        for symbol, name in entry.get("names", {}).items():
+            add(symbol, name)
+        for holding in entry["holdings"]:
+            add(holding[0], None)
+    for symbol, rec in screener._load_screener_cache()["tickers"].items():
+        add(symbol, rec["row"].get("Company"))
+    logger.info("Symbol index built: %d symbols", len(names))
+    return _Index(names)
+
+
+def _get_index() -> _Index:
+    global _index, _signature, _checked_at
+    now = time.monotonic()
+    if _index is None or now - _checked_at > _RECHECK_SECONDS:
+        _checked_at = now
+        signature = _current_signature()
+        if _index is None or signature != _signature:
+            _index, _signature = _build(), signature
+    return _index
+
+
+def invalidate() -> None:
+    global _index
+    _index = None
+
+
+def resolve(query: str) -> str | None:
+    """Symbol for an exact ticker or company name, or a cached search; None
+    on a miss (the caller decides whether to go to the network)."""
+    query = query.strip()
+    if not query:
+        return None
+    index = _get_index()
+    if query.upper() in index.names:
+        return query.upper()
+    symbol = index.by_name.get(_normalize_name(query))
+    if symbol:
+        return symbol
+    cached = cached_search(query)
+    if cached:
+        return cached[0]["symbol"]
+    return None
+
+
+def search(query: str, limit: int = 10) -> list[dict]:
+    """Autocomplete: exact symbol, then symbol prefix, then company-name word
+    prefix, then fuzzy matches."""
+    query = query.strip()
+    if not query:
+        return []
+    index = _get_index()
+    upper = query.upper()
+    normalized = _normalize_name(query)
+    ranked: dict[str, str] = {}
+
+    def take(symbols: list[str], match: str) -> None:
+        for symbol in symbols:
+            if len(ranked) >= limit:
+                return
+            ranked.setdefault(symbol, match)
+
+    if upper in index.names:
+        take([upper], "exact")
+    if normalized in index.by_name:
+        take([index.by_name[normalized]], "exact")
+    take(index.symbol_prefix(upper, limit), "prefix")
+    words = normalized.split()
+    if words:
+        # Every word must prefix-match some word of the name
+        candidates = index.name_prefix(words[-1], limit * 4)
+        take(
+            [
+                s
+                for s in candidates
+                if all(
+                    any(t.startswith(w) for t in _normalize_name(index.names[s] or "").split())
+                    for w in words
+                )
+            ],
+            "prefix",
+        )
+    if len(ranked) < limit:
+        fuzzy = difflib.get_close_matches(upper, index.symbols, n=limit, cutoff=_FUZZY_CUTOFF)
+        if normalized:
+            fuzzy += [
+                index.by_name[n]
+                for n in difflib.get_close_matches(
+                    normalized, list(index.by_name), n=limit, cutoff=_FUZZY_CUTOFF
+                )
+            ]
+        take(fuzzy, "fuzzy")
+    return [{"symbol": s, "name": index.names[s], "match": m} for s, m in ranked.items()]
+
+
+def cached_search(query: str) -> list[dict] | None:
+    entry = store.get("symbol_cache", query.strip().lower())
+    if entry is None:
+        metrics.cache_lookup("symbol_cache", False)
+        return None
+    age = (datetime.now(timezone.utc) - datetime.fromisoformat(entry["cached_at"])).total_seconds()
+    metrics.cache_lookup("symbol_cache", age < _SEARCH_CACHE_TTL_SECONDS)
+    return entry["quotes"] if age < _SEARCH_CACHE_TTL_SECONDS else None
+
+
+def remember_search(query: str, quotes: list[dict]) -> None:
+    """Caches a network search result (equities only, possibly none)."""
+    cached_at = datetime.now(timezone.utc).isoformat()
+    store.upsert(
+        "symbol_cache",
+        query.strip().lower(),
+        {
+            "cached_at": cached_at,
+            "quotes": [
+                {"symbol": q["symbol"], "name": q.get("longname") or q.get("shortname")}
+                for q in quotes
+            ],
+        },
+        cached_at,
+    )
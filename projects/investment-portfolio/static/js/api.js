@@ -13,17 +13,22 @@ async function request(method, path, body) {
 
 export const api = {
   getLatestRun:     ()       => request('GET',  '/api/runs/latest'),
-  getAllRuns:        ()       => request('GET',  '/api/runs'),
+  getRuns:          (limit, offset) => request('GET', `/api/runs?limit=${limit}&offset=${offset}`),
+  getRun:           (id)     => request('GET',  `/api/runs/${encodeURIComponent(id)}`),
   triggerRun:       ()       => request('POST', '/api/runs'),
-  getPerformance:   (t, w)   => request('GET',  `/api/performance?tickers=${t}&weights=${w}`),
-  getAdvisorLog:    ()       => request('GET',  '/api/advisor/log'),
+  getRunJob:        (id)     => request('GET',  `/api/runs/jobs/${id}`),
+  runJobEvents:     (id)     => new EventSource(`/api/runs/jobs/${id}/events`),
+  getPerformance:   (t, w, range, maxPoints) => request('GET', `/api/performance?${new URLSearchParams({ tickers: t, weights: w, range, max_points: maxPoints })}`),
+  getAdvisorLog:    (params = {}) => request('GET', `/api/advisor/log?${new URLSearchParams(params)}`),
   askAdvisor:       (ticker) => request('POST', '/api/advisor', { ticker }),
+  searchSymbols:    (q)      => request('GET',  `/api/symbols?q=${encodeURIComponent(q)}&limit=8`),
   getSettings:      ()       => request('GET',  '/api/settings'),
   updateSettings:   (data)   => request('PUT',  '/api/settings', data),
   getPortfolios:            ()           => request('GET',    '/api/portfolios'),
   savePortfolios:           (data)       => request('PUT',    '/api/portfolios', data),
   deletePortfolio:          (name)       => request('DELETE', `/api/portfolios/${encodeURIComponent(name)}`),
-  getPortfoliosPerformance: ()           => request('GET',    '/api/portfolios/performance'),
+  getPortfoliosPerformance: (range, maxPoints) => request('GET', `/api/portfolios/performance?${new URLSearchParams({ range, max_points: maxPoints })}`),
+  getTracker:               (range, maxPoints, intraday = false) => request('GET', `/api/portfolios/tracker?${new URLSearchParams({ range, max_points: maxPoints, intraday })}`),
   importPortfolio: async (name, file) => {
     const form = new FormData();
     form.append('name', name);
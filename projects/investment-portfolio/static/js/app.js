@@ -10,7 +10,6 @@ import { initTracker }      from './views/tracker.js';
 
 // ── State ─────────────────────────────────────────────────────────────────────
 export let latestRun = null;
-export let allRuns   = [];
 
 // ── UI helpers ────────────────────────────────────────────────────────────────
 export function showLoading(msg = 'Working…') {
@@ -80,17 +79,73 @@ function scheduleMarketCloseRefresh() {
 }
 
 // ── Run Committee ─────────────────────────────────────────────────────────────
+const NODE_LABELS = {
+  screen: 'Screening universe', research: 'Claude researching markets',
+  claude: 'Claude', gpt: 'GPT', gemini: 'Gemini',
+  enrich: 'Fetching prices and targets', aggregate: 'Building portfolio',
+};
+
+function progressText(e, done) {
+  switch (e.stage) {
+    case 'finviz':   return `Finviz: ${e.tickers} tickers${e.cached ? ' (cached)' : ''}`;
+    case 'fcf':      return `FCF checks ${e.done}/${e.total}`;
+    case 'fcf_done': return `FCF: ${e.passed}/${e.total} passed`;
+    case 'node': {
+      if (!NODE_LABELS[e.node]) return null;
+      if (e.status === 'ok') done.add(e.node);
+      const members = ['claude', 'gpt', 'gemini'].filter(m => done.has(m)).map(m => NODE_LABELS[m]);
+      if (e.status === 'started') return `${NODE_LABELS[e.node]}…`;
+      if (['claude', 'gpt', 'gemini'].includes(e.node)) return `Members done: ${members.join(', ') || 'none'}`;
+      return null;
+    }
+    default: return null;
+  }
+}
+
+// Resolves with the finished job; rejects if it failed or was cancelled
+function followJob(jobId) {
+  return new Promise((resolve, reject) => {
+    const done = new Set();
+    const source = api.runJobEvents(jobId);
+    const finish = async () => {
+      source.close();
+      try {
+        const job = await api.getRunJob(jobId);
+        job.status === 'done' ? resolve(job) : reject(new Error(job.error || 'Committee run failed'));
+      } catch (e) { reject(e); }
+    };
+    source.addEventListener('node', e => {
+      const text = progressText(JSON.parse(e.data), done);
+      if (text) document.getElementById('loading-text').textContent = text;
+    });
+    for (const stage of ['finviz', 'fcf', 'fcf_done']) {
+      source.addEventListener(stage, e => {
+        document.getElementById('loading-text').textContent = progressText(JSON.parse(e.data), done);
+      });
+    }
+    source.addEventListener('done', finish);
+    source.addEventListener('failed', finish);
+    source.addEventListener('cancelled', finish);
+    // EventSource reconnects on its own; only give up once the job is unknown
+    source.onerror = () => {
+      api.getRunJob(jobId).then(job => { if (job.status !== 'running') finish(); }).catch(e => { source.close(); reject(e); });
+    };
+  });
+}
+
 async function runCommittee() {
   const btn = document.getElementById('nav-run-btn');
   btn.disabled = true;
   showLoading('Committee deliberating… (~60–90 seconds)');
   try {
-    latestRun = await api.triggerRun();
-    allRuns   = await api.getAllRuns();
+    const job = await api.triggerRun();
+    if (job.coalesced) showToast('A committee run is already in progress — following it');
+    latestRun = (await followJob(job.job_id)).result;
     updateAgeBadge(latestRun);
     await refreshPortfolio(latestRun);
     initPerformance(latestRun);
     initTracker(latestRun);
+    initHistory();
     showToast('Committee run complete!');
   } catch (e) {
     showToast(e.message, 'error');
@@ -124,7 +179,6 @@ async function init() {
 
   try {
     latestRun = await api.getLatestRun();
-    allRuns   = await api.getAllRuns();
   } catch (e) {
     if (!e.message?.includes('No runs yet')) console.warn('init fetch:', e.message);
   }
@@ -134,7 +188,7 @@ async function init() {
   // Init all views with data
   initPortfolio(latestRun);
   initMembers(latestRun);
-  initHistory(allRuns);
+  initHistory();
   await initResearch();
   await initSettings();
 
@@ -144,6 +198,17 @@ async function init() {
   document.getElementById('nav-ticker').addEventListener('keydown', e => {
     if (e.key === 'Enter') askAdvisor();
   });
+  let suggestTimer = null;
+  document.getElementById('nav-ticker').addEventListener('input', e => {
+    clearTimeout(suggestTimer);
+    const q = e.target.value.trim();
+    suggestTimer = setTimeout(async () => {
+      const matches = q ? await api.searchSymbols(q).catch(() => []) : [];
+      // Names come from Finviz, LLM runs and Yahoo: set as text, never as HTML
+      document.getElementById('nav-ticker-options')
+        .replaceChildren(...matches.map(m => new Option(m.name ?? '', m.symbol)));
+    }, 120);
+  });
 
   // More dropdown
   const moreBtn = document.getElementById('nav-more-btn');
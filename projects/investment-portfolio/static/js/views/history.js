@@ -1,3 +1,8 @@
+import { api } from '../api.js';
+import { showToast } from '../app.js';
+
+const PAGE_SIZE = 50;
+
 function fmtDate(ts) {
   return new Date(ts).toLocaleDateString('en-US', { month: 'short', day: 'numeric', year: 'numeric', hour: '2-digit', minute: '2-digit' });
 }
@@ -56,65 +61,112 @@ function diffView(runA, runB) {
     + wchangeBlock();
 }
 
-export function initHistory(allRuns) {
+// Full runs are fetched only when selected for comparison
+const runCache = new Map();
+
+async function fetchRun(id) {
+  if (!runCache.has(id)) runCache.set(id, api.getRun(id));
+  return runCache.get(id);
+}
+
+export async function initHistory() {
   const view = document.getElementById('view-history');
+  let runs = [];
+  let total = 0;
+  runCache.clear();  // exclusions may have changed since the last visit
+
+  try {
+    ({ runs, total } = await api.getRuns(PAGE_SIZE, 0));
+  } catch (e) { showToast(e.message, 'error'); }
 
-  if (!allRuns?.length) {
+  if (!runs.length) {
     view.innerHTML = `<div class="empty-state">No run history yet.</div>`;
     return;
   }
 
-  const runLabels = allRuns.map(r => fmtDate(r.timestamp));
+  function summaryRows(page) {
+    return page.map(r => `
+      <tr>
+        <td class="mono">${fmtDate(r.timestamp)}</td>
+        <td class="mono">${r.core_count}</td>
+        <td class="mono">${r.moonshot_count}</td>
+        <td class="mono">${r.consensus_count}</td>
+        <td class="mono" style="color:var(--text-3);">${r.top_tickers.join(' · ')}</td>
+      </tr>`).join('');
+  }
+
+  function runOptions(selected) {
+    return runs.map((r, i) => `<option value="${r.id}"${i === selected ? ' selected' : ''}>${fmtDate(r.timestamp)}</option>`).join('');
+  }
 
   view.innerHTML = `
     <div style="font-family:var(--font-serif);font-size:1.9rem;font-weight:700;letter-spacing:-0.02em;color:var(--text);margin-bottom:24px;">
       Run <em style="font-style:italic;color:var(--amber)">History</em>
     </div>
 
-    <table class="atlas-table" style="margin-bottom:40px;">
+    <table class="atlas-table" style="margin-bottom:16px;">
       <thead><tr>
-        <th>Date</th><th>Core</th><th>Moonshots</th><th>Consensus</th>
+        <th>Date</th><th>Core</th><th>Moonshots</th><th>Consensus</th><th>Top Holdings</th>
       </tr></thead>
-      <tbody>
-        ${allRuns.map(r => `
-          <tr>
-            <td class="mono">${fmtDate(r.timestamp)}</td>
-            <td class="mono">${r.portfolio.filter(h => h.conviction === 'core').length}</td>
-            <td class="mono">${r.portfolio.filter(h => h.conviction === 'moonshot').length}</td>
-            <td class="mono">${r.portfolio.filter(h => (h.nominated_by?.length ?? 0) > 1).length}</td>
-          </tr>`).join('')}
-      </tbody>
+      <tbody id="history-tbody">${summaryRows(runs)}</tbody>
     </table>
+    <div id="history-more" style="margin-bottom:40px;">
+      ${runs.length < total ? `<button class="settings-btn" id="history-more-btn">Load more (${total - runs.length})</button>` : ''}
+    </div>
 
-    ${allRuns.length < 2 ? '<div class="empty-state">Run the committee again to enable comparison.</div>' : `
+    ${total < 2 ? '<div class="empty-state">Run the committee again to enable comparison.</div>' : `
       <div style="font-family:var(--font-serif);font-size:1.2rem;font-weight:600;font-style:italic;color:var(--text-2);margin-bottom:16px;">Compare Runs</div>
       <div style="display:grid;grid-template-columns:1fr 1fr;gap:12px;margin-bottom:28px;">
         <div>
           <div class="section-label" style="margin-bottom:6px;">Current run</div>
           <select id="sel-a" style="font-family:var(--font-mono);font-size:0.78rem;background:var(--surface-2);border:1px solid var(--border);border-radius:6px;color:var(--text-2);padding:8px 12px;width:100%;">
-            ${runLabels.map((l, i) => `<option value="${i}">${l}</option>`).join('')}
+            ${runOptions(0)}
           </select>
         </div>
         <div>
           <div class="section-label" style="margin-bottom:6px;">Compare against</div>
           <select id="sel-b" style="font-family:var(--font-mono);font-size:0.78rem;background:var(--surface-2);border:1px solid var(--border);border-radius:6px;color:var(--text-2);padding:8px 12px;width:100%;">
-            ${runLabels.map((l, i) => `<option value="${i}"${i===1?' selected':''}>${l}</option>`).join('')}
+            ${runOptions(1)}
           </select>
         </div>
       </div>
       <div id="diff-output"></div>
     `}`;
 
-  function renderDiff() {
-    const a = parseInt(document.getElementById('sel-a').value);
-    const b = parseInt(document.getElementById('sel-b').value);
+  async function renderDiff() {
+    const a = document.getElementById('sel-a').value;
+    const b = document.getElementById('sel-b').value;
     const out = document.getElementById('diff-output');
     if (!out) return;
     if (a === b) { out.innerHTML = `<div class="empty-state">Select two different runs to compare.</div>`; return; }
-    out.innerHTML = diffView(allRuns[a], allRuns[b]);
+    try {
+      const [runA, runB] = await Promise.all([fetchRun(a), fetchRun(b)]);
+      // Ignore a stale response if the selection changed while loading
+      if (document.getElementById('sel-a')?.value !== a || document.getElementById('sel-b')?.value !== b) return;
+      out.innerHTML = diffView(runA, runB);
+    } catch (e) {
+      runCache.delete(a);
+      runCache.delete(b);
+      showToast(e.message, 'error');
+    }
   }
 
-  if (allRuns.length >= 2) {
+  document.getElementById('history-more-btn')?.addEventListener('click', async () => {
+    try {
+      const page = await api.getRuns(PAGE_SIZE, runs.length);
+      runs = runs.concat(page.runs);
+      total = page.total;
+      document.getElementById('history-tbody').insertAdjacentHTML('beforeend', summaryRows(page.runs));
+      if (runs.length >= total) document.getElementById('history-more').innerHTML = '';
+      else document.getElementById('history-more-btn').textContent = `Load more (${total - runs.length})`;
+      for (const id of ['sel-a', 'sel-b']) {
+        const sel = document.getElementById(id);
+        if (sel) sel.insertAdjacentHTML('beforeend', page.runs.map(r => `<option value="${r.id}">${fmtDate(r.timestamp)}</option>`).join(''));
+      }
+    } catch (e) { showToast(e.message, 'error'); }
+  });
+
+  if (total >= 2) {
     document.getElementById('sel-a').addEventListener('change', renderDiff);
     document.getElementById('sel-b').addEventListener('change', renderDiff);
     renderDiff();
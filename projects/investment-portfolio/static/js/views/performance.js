@@ -1,40 +1,23 @@
 import { api } from '../api.js';
 import { showToast } from '../app.js';
-import { prevTradingDays } from '../dates.js';
 
 let chartInstance = null;
 
-function filterSeries(rawDict, rangeOpt) {
-  const entries = Object.entries(rawDict)
-    .map(([k, v]) => [new Date(k), v])
-    .sort((a, b) => a[0] - b[0]);
-
-  if (!entries.length) return { labels: [], values: [] };
-
-  const now = new Date();
-  const cutoffs = {
-    '1D':  prevTradingDays(now, 1),
-    '3D':  prevTradingDays(now, 3),
-    '1W':  new Date(now - 7  * 86400000),
-    '1M':  new Date(now - 30 * 86400000),
-    '3M':  new Date(now - 90 * 86400000),
-    'YTD': new Date(now.getFullYear(), 0, 1),
-    '1Y':  null,
-  };
-  const cutoff = cutoffs[rangeOpt] ?? null;
-  const filtered = cutoff ? entries.filter(([d]) => d >= cutoff) : entries;
-  if (!filtered.length) return { labels: [], values: [] };
-
-  const base = filtered[0][1];
-  return {
-    labels: filtered.map(([d]) => d),
-    values: filtered.map(([, v]) => (v - base) * 100),
-  };
+const MAX_POINTS = 500;  // roughly one per horizontal pixel of the chart
+const RANGES = ['1D', '3D', '1W', '1M', '3M', 'YTD', '1Y', '5Y'];
+
+// The server slices each range and rebases it: `dates` is one shared axis and
+// every series' `values` are the % moved since the range start (null = no bar).
+function seriesPoints(perf, key) {
+  const values = perf.series[key]?.values ?? [];
+  return perf.dates.flatMap((d, i) =>
+    values[i] == null ? [] : [{ x: new Date(d + 'T00:00:00'), y: values[i] }]);
 }
 
-function lastReturn(rawDict, rangeOpt) {
-  const { values } = filterSeries(rawDict, rangeOpt);
-  return values.length ? values[values.length - 1] : 0;
+function lastReturn(perf, key) {
+  const values = perf.series[key]?.values ?? [];
+  for (let i = values.length - 1; i >= 0; i--) if (values[i] != null) return values[i];
+  return null;
 }
 
 function metricCard(label, val, delta) {
@@ -50,7 +33,7 @@ function metricCard(label, val, delta) {
     </div>`;
 }
 
-function renderChart(perf, rangeOpt) {
+function renderChart(perf) {
   const ctx = document.getElementById('perf-chart').getContext('2d');
   if (chartInstance) { chartInstance.destroy(); chartInstance = null; }
 
@@ -59,16 +42,15 @@ function renderChart(perf, rangeOpt) {
     { key: 'spy',       label: 'SPY',       color: '#7a6e5c', width: 1.5, dash: [3,3] },
     { key: 'vgt',       label: 'VGT',       color: '#d4a027', width: 1.5, dash: [6,3] },
     { key: 'vti',       label: 'VTI',       color: '#8b7355', width: 1.5, dash: [2,4] },
-  ].filter(d => perf[d.key]);
+  ].filter(d => perf.series[d.key]);
 
   chartInstance = new Chart(ctx, {
     type: 'line',
     data: {
       datasets: datasets.map(d => {
-        const { labels, values } = filterSeries(perf[d.key].series, rangeOpt);
         return {
           label: d.label,
-          data: labels.map((x, i) => ({ x, y: values[i] })),
+          data: seriesPoints(perf, d.key),
           borderColor: d.color,
           borderWidth: d.width,
           borderDash: d.dash,
@@ -133,7 +115,7 @@ export async function initPerformance(run) {
       Performance
     </div>
     <div style="display:flex;gap:4px;margin-bottom:24px;" id="range-pills">
-      ${['1D','3D','1W','1M','3M','YTD','1Y'].map(r => `
+      ${RANGES.map(r => `
         <button class="range-pill${r === rangeOpt ? ' active' : ''}" data-range="${r}"
           style="font-family:var(--font-mono);font-size:0.7rem;letter-spacing:0.06em;padding:5px 12px;border-radius:5px;border:1px solid var(--border);color:var(--text-3);background:transparent;cursor:pointer;transition:all 0.15s;"
         >${r}</button>`).join('')}
@@ -154,15 +136,15 @@ export async function initPerformance(run) {
       rangeOpt = btn.dataset.range;
       view.querySelectorAll('.range-pill').forEach(b => { b.style.cssText = PILL_BASE; });
       btn.style.cssText = PILL_BASE + PILL_ACTIVE;
-      if (perf) updateView();
+      load();
     });
   });
 
   function updateView() {
-    const pRet   = perf.portfolio ? lastReturn(perf.portfolio.series, rangeOpt) : 0;
-    const spyRet = perf.spy       ? lastReturn(perf.spy.series, rangeOpt)       : null;
-    const vgtRet = perf.vgt       ? lastReturn(perf.vgt.series, rangeOpt)       : null;
-    const vtiRet = perf.vti       ? lastReturn(perf.vti.series, rangeOpt)       : null;
+    const pRet   = lastReturn(perf, 'portfolio') ?? 0;
+    const spyRet = lastReturn(perf, 'spy');
+    const vgtRet = lastReturn(perf, 'vgt');
+    const vtiRet = lastReturn(perf, 'vti');
 
     document.getElementById('metric-cards').innerHTML =
       metricCard('Portfolio', pRet, null) +
@@ -170,17 +152,30 @@ export async function initPerformance(run) {
       (vgtRet != null ? metricCard('VGT', vgtRet, vgtRet - pRet) : '') +
       (vtiRet != null ? metricCard('VTI', vtiRet, vtiRet - pRet) : '');
 
-    renderChart(perf, rangeOpt);
+    renderChart(perf);
   }
 
-  document.getElementById('metric-cards').innerHTML = `<div class="empty-state" style="padding:20px 0;">Loading price data…</div>`;
-  try {
-    const tickers = run.portfolio.map(h => h.ticker).join(',');
-    const weights = run.portfolio.map(h => h.weight).join(',');
-    perf = await api.getPerformance(tickers, weights);
+  // One request per range; ranges already fetched are redrawn from memory
+  const byRange = {};
+  const tickers = run.portfolio.map(h => h.ticker).join(',');
+  const weights = run.portfolio.map(h => h.weight).join(',');
+
+  async function load() {
+    const requested = rangeOpt;
+    if (!byRange[requested]) {
+      if (!perf) document.getElementById('metric-cards').innerHTML = `<div class="empty-state" style="padding:20px 0;">Loading price data…</div>`;
+      try {
+        byRange[requested] = await api.getPerformance(tickers, weights, requested, MAX_POINTS);
+      } catch (e) {
+        showToast(e.message, 'error');
+        if (!perf) document.getElementById('metric-cards').innerHTML = `<div class="empty-state">Could not load performance data.</div>`;
+        return;
+      }
+    }
+    if (requested !== rangeOpt) return;  // a newer pill click won
+    perf = byRange[requested];
     updateView();
-  } catch (e) {
-    showToast(e.message, 'error');
-    document.getElementById('metric-cards').innerHTML = `<div class="empty-state">Could not load performance data.</div>`;
   }
+
+  await load();
 }
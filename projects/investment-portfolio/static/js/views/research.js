@@ -49,9 +49,12 @@ export async function initResearch() {
   let allEntries = [];
   let portfolioByTicker = {};
 
+  const cutoff = new Date();
+  cutoff.setDate(cutoff.getDate() - 30);
+
   try {
-    [allEntries] = await Promise.all([
-      api.getAdvisorLog(),
+    [{ entries: allEntries }] = await Promise.all([
+      api.getAdvisorLog({ start: cutoff.toISOString().slice(0, 10), limit: 1000 }),
       api.getLatestRun().then(r => {
         if (r?.portfolio) r.portfolio.forEach(h => { portfolioByTicker[h.ticker] = h; });
       }).catch(() => {}),
@@ -63,14 +66,12 @@ export async function initResearch() {
       Research <em style="font-style:italic;color:var(--amber)">Log</em>
     </div>`;
 
-  const cutoff = new Date();
-  cutoff.setDate(cutoff.getDate() - 30);
-
+  // Newest first: keep the latest entry per ticker
   const seen = new Set();
-  const entries = [...allEntries].reverse().filter(e => {
+  const entries = allEntries.filter(e => {
     if (seen.has(e.ticker)) return false;
     seen.add(e.ticker);
-    return !e.timestamp || new Date(e.timestamp) >= cutoff;
+    return true;
   });
 
   if (!entries.length) {
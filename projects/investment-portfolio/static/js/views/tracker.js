@@ -1,9 +1,11 @@
 import { api } from '../api.js';
 import { showToast } from '../app.js';
-import { prevTradingDays } from '../dates.js';
 
 let chartInstance = null;
 
+const MAX_POINTS = 500;  // roughly one per horizontal pixel of the chart
+const RANGES = ['1D', '3D', '1W', '1M', '3M', 'YTD', '1Y', '5Y'];
+
 function esc(s) {
   return String(s)
     .replace(/&/g, '&amp;')
@@ -14,29 +16,18 @@ function esc(s) {
 
 // ── Utilities ─────────────────────────────────────────────────────────────────
 
-function filterSeries(rawDict, rangeOpt) {
-  const entries = Object.entries(rawDict)
-    .map(([k, v]) => [new Date(k), v])
-    .sort((a, b) => a[0] - b[0]);
-  if (!entries.length) return { labels: [], values: [] };
-  const now = new Date();
-  const cutoffs = {
-    '1D':  prevTradingDays(now, 1),
-    '3D':  prevTradingDays(now, 3),
-    '1W':  new Date(now - 7  * 86400000),
-    '1M':  new Date(now - 30 * 86400000),
-    '3M':  new Date(now - 90 * 86400000),
-    'YTD': new Date(now.getFullYear(), 0, 1),
-    '1Y':  null,
-  };
-  const cutoff = cutoffs[rangeOpt] ?? null;
-  const filtered = cutoff ? entries.filter(([d]) => d >= cutoff) : entries;
-  if (!filtered.length) return { labels: [], values: [] };
-  const base = filtered[0][1];
-  return {
-    labels: filtered.map(([d]) => d),
-    values: filtered.map(([, v]) => (v - base) * 100),
-  };
+// The server slices each range and rebases it: `dates` is one shared axis and
+// every series' `values` are the % moved since the range start (null = no bar).
+function seriesPoints(perfData, key) {
+  const values = perfData.series[key]?.values ?? [];
+  return perfData.dates.flatMap((d, i) =>
+    values[i] == null ? [] : [{ x: new Date(d + 'T00:00:00'), y: values[i] }]);
+}
+
+function lastReturn(perfData, key) {
+  const values = perfData.series[key]?.values ?? [];
+  for (let i = values.length - 1; i >= 0; i--) if (values[i] != null) return values[i];
+  return null;
 }
 
 function formatCurrency(v) {
@@ -139,13 +130,13 @@ function portfolioCard(p, sort) {
 
 const PORTFOLIO_COLORS = ['#06b6d4', '#22c55e', '#f97316', '#a855f7', '#ec4899', '#eab308'];
 
-function renderComparisonCards(perfData, rangeOpt) {
+function renderComparisonCards(perfData) {
   const container = document.getElementById('tracker-comparison-cards');
   if (!container || !perfData) return;
 
-  const spyRet = perfData.spy ? (() => { const { values } = filterSeries(perfData.spy.series, rangeOpt); return values.length ? values[values.length - 1] : null; })() : null;
+  const spyRet = lastReturn(perfData, 'spy');
 
-  const portfolioEntries = Object.entries(perfData).filter(([, v]) => v.type === 'portfolio');
+  const portfolioEntries = Object.entries(perfData.series).filter(([, v]) => v.type === 'portfolio');
 
   if (!portfolioEntries.length) {
     container.innerHTML = '';
@@ -153,10 +144,9 @@ function renderComparisonCards(perfData, rangeOpt) {
   }
 
   let colorIdx = 0;
-  container.innerHTML = portfolioEntries.map(([key, val]) => {
+  container.innerHTML = portfolioEntries.map(([key]) => {
     const color = PORTFOLIO_COLORS[colorIdx++ % PORTFOLIO_COLORS.length];
-    const { values } = filterSeries(val.series, rangeOpt);
-    const ret = values.length ? values[values.length - 1] : null;
+    const ret = lastReturn(perfData, key);
     const retTxt = ret != null ? (ret >= 0 ? '+' : '') + ret.toFixed(1) + '%' : '–';
     const retColor = ret == null ? 'var(--text-4)' : ret >= 0 ? 'var(--green)' : 'var(--red)';
     const delta = ret != null && spyRet != null ? ret - spyRet : null;
@@ -173,7 +163,7 @@ function renderComparisonCards(perfData, rangeOpt) {
 
 // ── Chart ─────────────────────────────────────────────────────────────────────
 
-function renderChart(perfData, rangeOpt) {
+function renderChart(perfData) {
   const ctx = document.getElementById('tracker-chart')?.getContext('2d');
   if (!ctx) return;
 
@@ -194,14 +184,13 @@ function renderChart(perfData, rangeOpt) {
   let colorIdx = 0;
 
   // User portfolios
-  Object.entries(perfData).forEach(([key, val]) => {
+  Object.entries(perfData.series).forEach(([key, val]) => {
     if (val.type !== 'portfolio') return;
     const color = PORTFOLIO_COLORS[colorIdx++ % PORTFOLIO_COLORS.length];
-    const { labels, values } = filterSeries(val.series, rangeOpt);
     datasets.push({
       label: key,
       hidden: isHidden(key),
-      data: labels.map((x, i) => ({ x, y: values[i] })),
+      data: seriesPoints(perfData, key),
       borderColor: color,
       borderWidth: 2.5,
       borderDash: [],
@@ -213,12 +202,11 @@ function renderChart(perfData, rangeOpt) {
   // Benchmarks
   const BENCH = { spy: { color: '#94a3b8', dash: [6, 4] }, vti: { color: '#c4a060', dash: [2, 4] } };
   Object.entries(BENCH).forEach(([key, style]) => {
-    if (!perfData[key]) return;
-    const { labels, values } = filterSeries(perfData[key].series, rangeOpt);
+    if (!perfData.series[key]) return;
     datasets.push({
       label: key.toUpperCase(),
       hidden: isHidden(key.toUpperCase()),
-      data: labels.map((x, i) => ({ x, y: values[i] })),
+      data: seriesPoints(perfData, key),
       borderColor: style.color,
       borderWidth: 1.5,
       borderDash: style.dash,
@@ -228,12 +216,11 @@ function renderChart(perfData, rangeOpt) {
   });
 
   // Committee — hidden by default until user clicks legend; toggle state persists across range changes
-  if (perfData.committee) {
-    const { labels, values } = filterSeries(perfData.committee.series, rangeOpt);
+  if (perfData.series.committee) {
     datasets.push({
       label: 'Committee',
       hidden: isHidden('Committee', true),
-      data: labels.map((x, i) => ({ x, y: values[i] })),
+      data: seriesPoints(perfData, 'committee'),
       borderColor: '#d4a027',
       borderWidth: 2,
       borderDash: [6, 3],
@@ -302,7 +289,7 @@ export async function initTracker(latestRun) {
     <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:16px;">
       <div style="font-family:var(--font-serif);font-size:1.3rem;font-weight:600;color:var(--text-2);">Performance Comparison</div>
       <div style="display:flex;gap:4px;" id="tracker-range-pills">
-        ${['1D','3D','1W','1M','3M','YTD','1Y'].map(r =>
+        ${RANGES.map(r =>
           `<button class="range-pill" data-range="${r}"
             style="${PILL_BASE}${r === rangeOpt ? PILL_ACTIVE : ''}"
           >${r}</button>`).join('')}
@@ -419,14 +406,23 @@ export async function initTracker(latestRun) {
 
   // ── Range pills ──────────────────────────────────────────────────────────────
   view.querySelectorAll('.range-pill').forEach(btn => {
-    btn.addEventListener('click', () => {
+    btn.addEventListener('click', async () => {
       rangeOpt = btn.dataset.range;
       view.querySelectorAll('.range-pill').forEach(b => { b.style.cssText = PILL_BASE; });
       btn.style.cssText = PILL_BASE + PILL_ACTIVE;
-      if (perfData) {
-        renderComparisonCards(perfData, rangeOpt);
-        renderChart(perfData, rangeOpt);
+      if (!perfData) return;
+      const requested = rangeOpt;
+      let data;
+      try {
+        data = await api.getPortfoliosPerformance(requested, MAX_POINTS);
+      } catch (e) {
+        showToast(e.message, 'error');
+        return;
       }
+      if (requested !== rangeOpt) return;  // a newer pill click won
+      perfData = data;
+      renderComparisonCards(perfData);
+      renderChart(perfData);
     });
   });
 
@@ -444,29 +440,35 @@ export async function initTracker(latestRun) {
   }
 
   async function reload() {
+    perfData = null;  // clear before fetch so stale data doesn't linger on error
+    const chartContainer = document.getElementById('tracker-chart-container');
+    chartContainer.innerHTML =
+      '<div style="color:var(--text-4);font-family:var(--font-mono);font-size:0.8rem;padding:20px;">Loading performance data…</div>';
+    let tracker;
     try {
-      portfoliosData = await api.getPortfolios();
+      // One endpoint, one price acquisition: positions are priced from the
+      // same closes that feed the performance chart. Intraday: the server
+      // re-quotes stale tickers, and everything only while the market is open.
+      tracker = await api.getTracker(rangeOpt, MAX_POINTS, true);
     } catch (e) {
+      chartContainer.innerHTML = '<canvas id="tracker-chart"></canvas>';
       showToast(e.message, 'error');
       return;
     }
+    portfoliosData = tracker.portfolios;
     renderCards();
 
+    if (portfoliosData.length && !tracker.performance) {
+      chartContainer.innerHTML =
+        `<div style="color:var(--red);font-family:var(--font-mono);font-size:0.8rem;padding:20px;">Could not load performance data.</div>`;
+      return;
+    }
+    chartContainer.innerHTML = '<canvas id="tracker-chart"></canvas>';
     if (portfoliosData.length) {
-      perfData = null;  // clear before fetch so stale data doesn't linger on error
-      document.getElementById('tracker-chart-container').innerHTML =
-        '<div style="color:var(--text-4);font-family:var(--font-mono);font-size:0.8rem;padding:20px;">Loading performance data…</div>';
-      try {
-        perfData = await api.getPortfoliosPerformance();
-        document.getElementById('tracker-chart-container').innerHTML =
-          '<canvas id="tracker-chart"></canvas>';
-        if (Object.keys(perfData).length) {
-          renderComparisonCards(perfData, rangeOpt);
-          renderChart(perfData, rangeOpt);
-        }
-      } catch (e) {
-        document.getElementById('tracker-chart-container').innerHTML =
-          `<div style="color:var(--red);font-family:var(--font-mono);font-size:0.8rem;padding:20px;">Could not load performance data.</div>`;
+      perfData = tracker.performance;
+      if (Object.keys(perfData.series).length) {
+        renderComparisonCards(perfData);
+        renderChart(perfData);
       }
     }
   }
@@ -0,0 +1,14 @@
+import pytest
+
+from src import metrics, store
+
+
+@pytest.fixture(autouse=True)
+def _isolated_store(tmp_path, monkeypatch):
+    """Every test gets its own empty app database."""
+    monkeypatch.setattr(store, "_DATA_DIR", tmp_path / "data")
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    metrics.reset()
@@ -170,3 +170,51 @@ def test_ticker_matching_is_case_insensitive(clients) -> None:
                     )
                 )
     assert result.recommendation == "already in portfolio"
+
+
+async def test_batch_streams_each_ticker_with_bounded_providers(monkeypatch) -> None:
+    from src import advisor
+
+    in_flight = {"claude": 0, "gpt": 0, "gemini": 0}
+    peak = dict(in_flight)
+    formatted = []
+
+    def member(name):
+        async def get_stock_opinion(client, ticker, fundamentals, portfolio_context):
+            in_flight[name] += 1
+            peak[name] = max(peak[name], in_flight[name])
+            await asyncio.sleep(0.01)
+            in_flight[name] -= 1
+            if ticker == "BAD":
+                raise RuntimeError("provider error")
+            return _mock_opinion("buy")
+
+        return get_stock_opinion
+
+    async def resolve(query):
+        return query
+
+    async def fetch_info(ticker):
+        return "", {}, f"{ticker} Inc."
+
+    def format_context(holdings):
+        formatted.append(holdings)
+        return "ctx"
+
+    monkeypatch.setattr(advisor, "_resolve_ticker", resolve)
+    monkeypatch.setattr(advisor, "_fetch_ticker_info", fetch_info)
+    monkeypatch.setattr(advisor, "_format_portfolio_context", format_context)
+    monkeypatch.setattr(advisor, "BATCH_MEMBER_CONCURRENCY", {"claude": 2, "gpt": 3, "gemini": 3})
+    for name in ("claude", "gpt", "gemini"):
+        monkeypatch.setattr(getattr(advisor, f"{name}_member"), "get_stock_opinion", member(name))
+
+    tickers = [f"T{i}" for i in range(10)] + ["t0", "BAD"]
+    results = dict(
+        [r async for r in advisor.ask_committee_batch(tickers, None, None, None, [])]
+    )
+
+    assert set(results) == {f"T{i}" for i in range(10)} | {"BAD"}  # deduplicated
+    assert isinstance(results["BAD"], RuntimeError)
+    assert results["T3"].company_name == "T3 Inc."
+    assert len(formatted) == 1
+    assert peak["claude"] == 2 and peak["gpt"] == 3
@@ -0,0 +1,47 @@
+import csv
+import io
+from datetime import date
+
+from src import advisor_log, store
+
+
+def _log(timestamp: str, ticker: str, recommendation: str) -> None:
+    store.log_append(
+        {"timestamp": timestamp, "ticker": ticker, "recommendation": recommendation}
+    )
+
+
+def _seed() -> None:
+    _log("2026-03-01T10:00:00+00:00", "AAPL", "buy")
+    _log("2026-03-02T10:00:00+00:00", "MSFT", "watch")
+    _log("2026-03-03T23:59:00+00:00", "AAPL", "pass")
+    _log("2026-03-04T10:00:00+00:00", "NVDA", "buy")
+
+
+def test_query_pages_newest_first():
+    _seed()
+    page = advisor_log.query(limit=2, offset=1)
+    assert page["total"] == 4
+    assert [e["ticker"] for e in page["entries"]] == ["AAPL", "MSFT"]
+
+
+def test_query_filters_combine():
+    _seed()
+    assert [e["ticker"] for e in advisor_log.query(recommendation="BUY")["entries"]] == [
+        "NVDA",
+        "AAPL",
+    ]
+    page = advisor_log.query(ticker="aapl", start=date(2026, 3, 2), end=date(2026, 3, 3))
+    assert page["total"] == 1
+    assert page["entries"][0]["recommendation"] == "pass"  # end date is inclusive
+
+
+def test_csv_export_streams_every_row_in_chunks(monkeypatch):
+    monkeypatch.setattr(advisor_log, "_CSV_CHUNK_ROWS", 3)
+    for i in range(7):
+        _log(f"2026-03-01T10:00:{i:02d}+00:00", f"T{i}", "buy")
+
+    chunks = list(advisor_log.iter_csv())
+    assert len(chunks) == 3
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert [r["ticker"] for r in rows] == [f"T{i}" for i in range(7)]
@@ -0,0 +1,67 @@
+from email.utils import formatdate
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src import conditional, store
+
+
+def _client(version, build, last_modified=None):
+    app = FastAPI()
+
+    @app.get("/x")
+    async def x(request: Request):
+        return await conditional.json_response(request.headers, version, build, last_modified)
+
+    return TestClient(app)
+
+
+def test_etag_round_trip_skips_build():
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"v": len(builds)}
+
+    client = _client(lambda: ("t", 1), build)
+    first = client.get("/x")
+    assert first.status_code == 200 and first.json() == {"v": 1}
+    tag = first.headers["etag"]
+    assert tag.startswith('W/"')
+
+    again = client.get("/x", headers={"If-None-Match": tag})
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["etag"] == tag
+    assert len(builds) == 1
+    # Strong form of the same tag, and lists, still match (weak comparison)
+    assert client.get("/x", headers={"If-None-Match": f'"x", {tag[2:]}'}).status_code == 304
+
+
+def test_unknown_version_builds_then_tags():
+    versions = iter([None, ("t", 2)])
+    client = _client(lambda: next(versions), lambda: {"ok": True})
+    response = client.get("/x", headers={"If-None-Match": conditional.etag("t", 2)})
+    assert response.status_code == 200
+    assert response.headers["etag"] == conditional.etag("t", 2)
+
+
+def test_if_modified_since_only_without_if_none_match():
+    headers = {"if-modified-since": formatdate(2000, usegmt=True)}
+    assert conditional.not_modified(headers, conditional.etag(1), last_modified=1999.5)
+    assert not conditional.not_modified(headers, conditional.etag(1), last_modified=2001)
+    headers["if-none-match"] = conditional.etag(2)
+    assert not conditional.not_modified(headers, conditional.etag(1), last_modified=1999)
+
+
+def test_store_versions_bump_on_writes_only():
+    assert store.version("portfolios") == (0, 0.0)
+    store.upsert("portfolios", "A", {"name": "A"})
+    changes, changed_at = store.version("portfolios")
+    assert changes == 1 and changed_at > 0
+    store.get("portfolios", "A")
+    assert not store.delete("portfolios", "missing")
+    assert store.version("portfolios")[0] == 1
+    store.delete("portfolios", "A")
+    store.log_append({"timestamp": "2026-01-01", "ticker": "AAPL"})
+    assert store.version("portfolios")[0] == 2
+    assert store.version("advisor_log")[0] == 1
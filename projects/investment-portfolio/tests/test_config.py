@@ -0,0 +1,49 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from src import config, store
+
+ROOT = Path(__file__).parent.parent
+
+
+def test_defaults_until_first_save_then_versioned_snapshots():
+    before = config.current()
+    assert before.tickers == config.DEFAULT_TICKERS
+    assert before.sectors == config.DEFAULT_SECTORS
+    assert config.current() is before  # unchanged counter: no re-read
+
+    after = config.update(tickers=[" aapl ", "msft", ""])
+    assert after.tickers == {"AAPL", "MSFT"}
+    assert after.sectors == config.DEFAULT_SECTORS
+    assert after.version > before.version
+    assert before.tickers == config.DEFAULT_TICKERS  # handed-out snapshot untouched
+
+
+def test_partial_updates_do_not_clobber_each_other():
+    config.update(tickers=["AAPL"])
+    config.update(sectors=["Utilities"])
+    current = config.current()
+    assert current.tickers == {"AAPL"}
+    assert current.sectors == {"Utilities"}
+
+
+def test_save_from_another_process_is_seen():
+    assert config.current().tickers == config.DEFAULT_TICKERS
+    script = (
+        "from pathlib import Path; from src import config, store; "
+        f"store._DATA_DIR = Path({str(store._DATA_DIR)!r}); "
+        "config.update(tickers=['NVDA'])"
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=ROOT, check=True)
+    assert config.current().tickers == {"NVDA"}
+
+
+def test_legacy_exclusions_file_imported():
+    data_dir = store._db_path().parent
+    data_dir.mkdir(parents=True)
+    (data_dir / "exclusions.json").write_text(json.dumps({"tickers": ["GME"]}))
+    current = config.current()
+    assert current.tickers == {"GME"}
+    assert current.sectors == config.DEFAULT_SECTORS
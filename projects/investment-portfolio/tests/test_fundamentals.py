@@ -0,0 +1,87 @@
+import asyncio
+import importlib.util
+
+import pytest
+
+from src import fundamentals
+from src.fundamentals import FundamentalsBackend
+
+
+class _Backend(FundamentalsBackend):
+    name = "fake"
+    batch_size = 2
+    concurrency = 2
+
+    def __init__(self, fail: set[str] = frozenset()) -> None:
+        self.requests: list[list[str]] = []
+        self.in_flight = 0
+        self.peak = 0
+        self.fail = fail
+
+    async def _fetch_batch(self, tickers):
+        self.requests.append(tickers)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if self.fail & set(tickers):
+            raise ConnectionError("upstream down")
+        return {t: {"freeCashflow": 1} for t in tickers if t != "NONE"}
+
+
+async def _collect(backend, tickers):
+    return {t: info async for t, info in backend.fetch(tickers)}
+
+
+async def test_fetch_batches_dedupes_and_bounds_concurrency():
+    backend = _Backend()
+    results = await _collect(backend, ["A", "B", "C", "A", "D", "E"])
+    assert sorted(results) == ["A", "B", "C", "D", "E"]
+    assert backend.requests == [["A", "B"], ["C", "D"], ["E"]]
+    assert backend.peak == 2
+
+
+async def test_failed_batch_and_missing_ticker_yield_none():
+    backend = _Backend(fail={"C"})
+    results = await _collect(backend, ["A", "NONE", "C", "D"])
+    assert results == {"A": {"freeCashflow": 1}, "NONE": None, "C": None, "D": None}
+
+
+def test_flatten_merges_modules_and_skips_errors():
+    modules = {
+        "financialData": {"freeCashflow": 5, "ebitda": 10, "maxAge": 86400},
+        "price": {"longName": "Apple Inc.", "marketCap": 3e12, "nested": {"raw": 1}},
+    }
+    info = fundamentals._flatten(modules)
+    assert info["freeCashflow"] == 5
+    assert info["longName"] == "Apple Inc."
+    assert "nested" not in info
+    assert fundamentals._flatten("No fundamentals data found for symbol: ZZZZ") == {}
+
+
+def test_get_backend_follows_env_and_falls_back(monkeypatch):
+    monkeypatch.delenv(fundamentals.BACKEND_ENV, raising=False)
+    assert fundamentals.get_backend().name == "yfinance"
+
+    monkeypatch.setenv(fundamentals.BACKEND_ENV, "nope")
+    assert fundamentals.get_backend().name == "yfinance"
+
+    find_spec = importlib.util.find_spec
+    monkeypatch.setenv(fundamentals.BACKEND_ENV, "YahooQuery")
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: object())
+    assert fundamentals.get_backend().name == "yahooquery"
+
+    monkeypatch.setattr(
+        importlib.util,
+        "find_spec",
+        lambda name: None if name == "yahooquery" else find_spec(name),
+    )
+    assert fundamentals.get_backend().name == "yfinance"
+
+
+def test_backends_must_implement_fetch_batch():
+    class _Incomplete(FundamentalsBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        _Incomplete()
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from src import jobs, progress
+
+
+@pytest.fixture(autouse=True)
+def _no_jobs(monkeypatch):
+    monkeypatch.setattr(jobs, "_jobs", type(jobs._jobs)())
+    monkeypatch.setattr(jobs, "_current", None)
+
+
+async def test_concurrent_submits_coalesce_into_one_job():
+    release = asyncio.Event()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await release.wait()
+        return {"ok": True}
+
+    first, created = jobs.submit(work)
+    second, created_again = jobs.submit(work)
+    assert created and not created_again
+    assert second is first
+
+    release.set()
+    events = [e async for _, e in first.follow()]
+    assert calls == [1]
+    assert first.snapshot()["status"] == "done"
+    assert first.result == {"ok": True}
+    assert [e["stage"] for e in events] == ["started", "done"]
+
+    third, created = jobs.submit(work)  # previous job finished: a new one starts
+    assert created and third is not first
+
+
+async def test_progress_from_threads_reaches_followers_in_order():
+    def blocking_step():
+        for i in range(3):
+            progress.emit("fcf", done=i + 1, total=3)
+
+    async def work():
+        await asyncio.to_thread(blocking_step)
+        progress.emit("node", node="aggregate", status="ok")
+        return {}
+
+    job, _ = jobs.submit(work)
+    stages = [(e["stage"], e.get("done")) async for _, e in job.follow()]
+    assert stages == [
+        ("started", None),
+        ("fcf", 1),
+        ("fcf", 2),
+        ("fcf", 3),
+        ("node", None),
+        ("done", None),
+    ]
+    # A late subscriber resuming from an offset replays only the tail
+    assert [e["stage"] async for _, e in job.follow(4)] == ["node", "done"]
+
+
+async def test_failed_job_reports_error():
+    async def work():
+        raise RuntimeError("All committee members failed")
+
+    job, _ = jobs.submit(work)
+    events = [e async for _, e in job.follow()]
+    assert events[-1]["stage"] == "failed"
+    assert job.snapshot()["status"] == "failed"
+    assert job.error == "All committee members failed"
+    assert jobs.current() is None
+
+
+async def test_cancelled_job_publishes_a_final_event():
+    started = asyncio.Event()
+
+    async def work():
+        started.set()
+        await asyncio.Event().wait()
+
+    job, _ = jobs.submit(work)
+    followed = asyncio.create_task(_collect(job))
+    await started.wait()
+    job._task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await job._task
+
+    events = await asyncio.wait_for(followed, 1)
+    assert events[-1]["stage"] == "cancelled"
+    assert job.snapshot()["status"] == "cancelled"
+    assert jobs.current() is None
+
+
+async def _collect(job):
+    return [e async for _, e in job.follow()]
@@ -0,0 +1,21 @@
+from src import llm_clients
+
+
+async def test_clients_built_once_shared_and_closed():
+    pool = llm_clients.LLMClients("http://127.0.0.1:9", api_key="fake")
+    clients = pool.get()
+    assert pool.get() is clients
+    anthropic_client, openai_client, _ = clients
+    assert str(openai_client.base_url).startswith("http://127.0.0.1:9/v1")
+
+    await pool.aclose()
+    assert anthropic_client.is_closed() and openai_client.is_closed()
+    await pool.aclose()  # idempotent
+
+
+async def test_close_before_first_use_builds_nothing(monkeypatch):
+    def build(*args):
+        raise AssertionError("built on close")
+
+    monkeypatch.setattr(llm_clients, "build", build)
+    await llm_clients.LLMClients().aclose()
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from yfinance.exceptions import YFRateLimitError
+
+from src import market_data
+from src.market_data import MarketDataGateway
+
+
+class _FakeTicker:
+    calls: list[str] = []
+    failures: dict[str, int] = {}
+
+    def __init__(self, ticker: str) -> None:
+        self.ticker = ticker
+
+    @property
+    def info(self) -> dict:
+        _FakeTicker.calls.append(self.ticker)
+        if _FakeTicker.failures.get(self.ticker, 0) > 0:
+            _FakeTicker.failures[self.ticker] -= 1
+            raise YFRateLimitError()
+        return {"symbol": self.ticker}
+
+
+@pytest.fixture
+def fake_yf(monkeypatch):
+    _FakeTicker.calls = []
+    _FakeTicker.failures = {}
+    monkeypatch.setattr(market_data.yf, "Ticker", _FakeTicker)
+    return _FakeTicker
+
+
+def _gateway(**kwargs) -> MarketDataGateway:
+    return MarketDataGateway(rate=1000, burst=1000, initial_backoff=0.001, **kwargs)
+
+
+async def test_concurrent_callers_share_one_request(fake_yf):
+    gw = _gateway()
+    results = await asyncio.gather(*[gw.info("AAPL") for _ in range(5)])
+    assert all(r == {"symbol": "AAPL"} for r in results)
+    assert fake_yf.calls == ["AAPL"]
+    stats = gw.stats()
+    assert stats["misses"] == 1
+    assert stats["coalesced"] == 4
+
+
+async def test_repeat_lookup_is_cache_hit(fake_yf):
+    gw = _gateway()
+    await gw.info("MSFT")
+    await gw.info("msft")
+    assert fake_yf.calls == ["MSFT"]
+    assert gw.stats()["hits"] == 1
+
+
+async def test_expired_entry_is_refetched(fake_yf):
+    gw = _gateway(cache_ttl=0)
+    await gw.info("MSFT")
+    await gw.info("MSFT")
+    assert fake_yf.calls == ["MSFT", "MSFT"]
+
+
+async def test_rate_limit_retries_with_backoff(fake_yf):
+    fake_yf.failures["NVDA"] = 2
+    gw = _gateway()
+    assert await gw.info("NVDA") == {"symbol": "NVDA"}
+    assert len(fake_yf.calls) == 3
+    assert gw.stats()["retries"] == 2
+
+
+async def test_retries_exhausted_raises(fake_yf):
+    fake_yf.failures["NVDA"] = 5
+    gw = _gateway(max_retries=2)
+    with pytest.raises(YFRateLimitError):
+        await gw.info("NVDA")
+    assert gw.stats()["errors"] == 1
+    assert gw.stats()["inflight"] == 0
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from src import metrics
+from src.pipeline import Pipeline
+
+
+def _line(text: str, prefix: str) -> str:
+    return next(line for line in text.splitlines() if line.startswith(prefix))
+
+
+def test_histogram_renders_cumulative_buckets():
+    metrics.record_stage("screen", 0.003)
+    metrics.record_stage("screen", 0.2)
+    metrics.record_stage("screen", 900)
+
+    text = metrics.render()
+    assert "# TYPE app_stage_duration_seconds histogram" in text
+    labels = 'outcome="ok",stage="screen"'
+    assert _line(text, f'app_stage_duration_seconds_bucket{{{labels},le="0.005"}}').endswith(" 1")
+    assert _line(text, f'app_stage_duration_seconds_bucket{{{labels},le="0.25"}}').endswith(" 2")
+    assert _line(text, f'app_stage_duration_seconds_bucket{{{labels},le="600"}}').endswith(" 2")
+    assert _line(text, f'app_stage_duration_seconds_bucket{{{labels},le="+Inf"}}').endswith(" 3")
+    assert _line(text, f"app_stage_duration_seconds_count{{{labels}}}").endswith(" 3")
+
+
+async def test_timed_wraps_async_and_sync_and_records_errors():
+    @metrics.timed("async_stage")
+    async def slow():
+        await asyncio.sleep(0.01)
+        return "done"
+
+    @metrics.timed("sync_stage")
+    def boom():
+        raise ValueError("boom")
+
+    assert await slow() == "done"
+    with pytest.raises(ValueError):
+        boom()
+
+    text = metrics.render()
+    assert 'app_stage_duration_seconds_count{outcome="ok",stage="async_stage"} 1' in text
+    assert 'app_stage_duration_seconds_count{outcome="error",stage="sync_stage"} 1' in text
+
+
+def test_provider_call_exposes_elapsed():
+    with metrics.call("anthropic", "picks") as call:
+        pass
+    assert call.elapsed >= 0
+    assert (
+        'app_provider_request_duration_seconds_count{operation="picks",outcome="ok",provider="anthropic"} 1'
+        in metrics.render()
+    )
+
+
+def test_cache_counters_and_label_escaping():
+    metrics.cache_lookup("fcf_verdicts", True, 3)
+    metrics.cache_lookup("fcf_verdicts", False)
+    metrics.cache_lookup("fcf_verdicts", False, 0)
+    metrics.cache_lookup('odd"name', True)
+
+    text = metrics.render()
+    assert "# TYPE app_cache_requests_total counter" in text
+    assert 'app_cache_requests_total{cache="fcf_verdicts",result="hit"} 3' in text
+    assert 'app_cache_requests_total{cache="fcf_verdicts",result="miss"} 1' in text
+    assert r'app_cache_requests_total{cache="odd\"name",result="hit"} 1' in text
+
+
+async def test_pipeline_records_node_stages():
+    async def ok(_):
+        return 1
+
+    async def bad(_):
+        raise RuntimeError("down")
+
+    pipeline = Pipeline("committee")
+    pipeline.add("research", ok)
+    pipeline.add("picks", bad)
+    pipeline.add("aggregate", ok, ("picks",))
+    await pipeline.run()
+
+    text = metrics.render()
+    assert 'stage="committee.research"' in text
+    assert 'app_stage_duration_seconds_count{outcome="error",stage="committee.picks"} 1' in text
+    assert "committee.aggregate" not in text  # skipped nodes aren't timed
+
+
+def test_token_counters_skip_unreported_usage():
+    metrics.tokens("anthropic", "picks", 1200, 300)
+    metrics.tokens("anthropic", "picks", 800, None)
+    metrics.tokens("gemini", "picks", None, None)
+
+    text = metrics.render()
+    assert 'app_provider_tokens_total{kind="input",operation="picks",provider="anthropic"} 2000' in text
+    assert 'app_provider_tokens_total{kind="output",operation="picks",provider="anthropic"} 300' in text
+    assert 'provider="gemini"' not in text
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from src.pipeline import Pipeline
+
+
+async def _sleep_then(value, delay=0.02):
+    await asyncio.sleep(delay)
+    return value
+
+
+async def test_independent_nodes_overlap_and_dependents_get_inputs():
+    pipeline = Pipeline()
+    pipeline.add("a", lambda _: _sleep_then(1))
+    pipeline.add("b", lambda _: _sleep_then(2))
+    pipeline.add("sum", lambda i: _sleep_then(i["a"] + i["b"], 0), ("a", "b"))
+
+    results, timeline = await pipeline.run()
+    assert results == {"a": 1, "b": 2, "sum": 3}
+    spans = {t.node: t for t in timeline}
+    assert spans["b"].start_s < spans["a"].end_s  # ran concurrently
+    assert spans["sum"].start_s >= max(spans["a"].end_s, spans["b"].end_s)
+
+
+async def test_failure_skips_dependents_unless_tolerated():
+    async def boom(_):
+        raise ValueError("boom")
+
+    pipeline = Pipeline()
+    pipeline.add("bad", boom)
+    pipeline.add("strict", lambda _: _sleep_then("never"), ("bad",))
+    pipeline.add("lenient", lambda i: _sleep_then(type(i["bad"]).__name__), ("bad",), tolerate_failures=True)
+
+    results, timeline = await pipeline.run()
+    assert isinstance(results["strict"], ValueError)
+    assert results["lenient"] == "ValueError"
+    assert {t.node: t.status for t in timeline} == {
+        "bad": "failed",
+        "strict": "skipped",
+        "lenient": "ok",
+    }
+
+
+async def test_speculative_nodes_are_not_awaited():
+    pipeline = Pipeline()
+    pipeline.add("main", lambda _: _sleep_then("done", 0.01))
+    pipeline.add("warm", lambda _: _sleep_then("late", 10), speculative=True)
+
+    results, timeline = await asyncio.wait_for(pipeline.run(), timeout=1)
+    assert results["main"] == "done"
+    assert isinstance(results["warm"], asyncio.CancelledError)
+    assert {t.node: t.status for t in timeline}["warm"] == "cancelled"
+
+
+def test_graph_is_validated_on_add():
+    pipeline = Pipeline()
+    pipeline.add("warm", lambda _: _sleep_then(0), speculative=True)
+    with pytest.raises(ValueError):
+        pipeline.add("x", lambda _: _sleep_then(0), ("missing",))
+    with pytest.raises(ValueError):
+        pipeline.add("y", lambda _: _sleep_then(0), ("warm",))
@@ -1,3 +1,5 @@
+from datetime import date, timedelta
+
 import pytest
 
 from src import portfolios
@@ -26,13 +28,11 @@ def test_portfolio_round_trips_json():
     assert restored.positions[1].avg_cost is None
 
 
-def test_load_returns_empty_when_file_missing(tmp_path, monkeypatch):
-    monkeypatch.setattr(portfolios, "_PORTFOLIOS_PATH", tmp_path / "portfolios.json")
+def test_load_returns_empty_when_store_empty():
     assert portfolios.load() == []
 
 
-def test_save_and_load_round_trip(tmp_path, monkeypatch):
-    monkeypatch.setattr(portfolios, "_PORTFOLIOS_PATH", tmp_path / "portfolios.json")
+def test_save_and_load_round_trip():
     data = [
         TrackedPortfolio(
             name="Retirement",
@@ -47,6 +47,25 @@ def test_save_and_load_round_trip(tmp_path, monkeypatch):
     assert loaded[0].positions[0].avg_cost == 220.50
 
 
+def test_upsert_and_delete_touch_one_portfolio():
+    portfolios.save(
+        [
+            TrackedPortfolio(name="A", positions=[PortfolioPosition(ticker="VTI", shares=1)]),
+            TrackedPortfolio(name="B", positions=[PortfolioPosition(ticker="SPY", shares=2)]),
+        ]
+    )
+    portfolios.upsert(
+        TrackedPortfolio(name="A", positions=[PortfolioPosition(ticker="QQQ", shares=3)])
+    )
+    assert [(p.name, p.positions[0].ticker) for p in portfolios.load()] == [
+        ("A", "QQQ"),
+        ("B", "SPY"),
+    ]
+    assert portfolios.delete("B") is True
+    assert portfolios.delete("B") is False
+    assert [p.name for p in portfolios.load()] == ["A"]
+
+
 def test_parse_csv_basic():
     csv_content = "ticker,shares,avg_cost\nAAPL,10,150.00\nVTI,50,\n"
     positions = portfolios.parse_csv(csv_content)
@@ -109,3 +128,50 @@ async def test_enrich_handles_missing_price():
     result = await portfolios.enrich(portfolio, prices)
     assert result["total_value"] is None
     assert result["positions"][0]["total_value"] is None
+
+
+async def test_spot_prices_come_from_last_stored_close(monkeypatch):
+    today = date.today()
+    stored = {"AAPL": (today, 200.0), "OLD": (today - timedelta(days=9), 5.0)}
+    monkeypatch.setattr(portfolios.price_store, "last_closes", lambda tickers: stored)
+    monkeypatch.setattr(portfolios.price_store, "_last_completed_session", lambda: today)
+    monkeypatch.setattr(portfolios.price_store, "_market_open", lambda: False)
+    quoted: list[str] = []
+
+    async def fake_quotes(tickers):
+        quoted.extend(tickers)
+        return {t: 1.0 for t in tickers}
+
+    monkeypatch.setattr(portfolios, "get_current_prices", fake_quotes)
+
+    prices = await portfolios.spot_prices(["AAPL", "OLD", "NEW"])
+    assert prices == {"AAPL": 200.0, "OLD": 5.0, "NEW": 1.0}
+    assert quoted == ["NEW"]
+
+    quoted.clear()
+    prices = await portfolios.spot_prices(["AAPL", "OLD", "NEW"], intraday=True)
+    assert prices["OLD"] == 1.0
+    assert sorted(quoted) == ["NEW", "OLD"]
+
+
+async def test_intraday_quotes_only_stale_tickers_until_the_market_opens(monkeypatch):
+    completed = date(2026, 3, 9)  # Monday's bar, before Tuesday's close settles
+    stored = {"AAPL": (completed, 200.0), "OLD": (completed - timedelta(days=7), 5.0)}
+    monkeypatch.setattr(portfolios.price_store, "last_closes", lambda tickers: stored)
+    monkeypatch.setattr(portfolios.price_store, "_last_completed_session", lambda: completed)
+    quoted: list[str] = []
+
+    async def fake_quotes(tickers):
+        quoted.extend(tickers)
+        return {t: 1.0 for t in tickers}
+
+    monkeypatch.setattr(portfolios, "get_current_prices", fake_quotes)
+
+    monkeypatch.setattr(portfolios.price_store, "_market_open", lambda: False)
+    await portfolios.spot_prices(["AAPL", "OLD"], intraday=True)
+    assert quoted == ["OLD"]
+
+    quoted.clear()
+    monkeypatch.setattr(portfolios.price_store, "_market_open", lambda: True)
+    await portfolios.spot_prices(["AAPL", "OLD"], intraday=True)
+    assert sorted(quoted) == ["AAPL", "OLD"]
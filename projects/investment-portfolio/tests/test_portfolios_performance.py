@@ -1,15 +1,26 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
+import pytest
 
+from src import metrics, performance, price_store
 from src.models import PortfolioPosition, TrackedPortfolio
 from src.performance import tracked_portfolios_performance
 
 
+@pytest.fixture(autouse=True)
+def _isolated_stores(tmp_path, monkeypatch):
+    monkeypatch.setattr(price_store, "_STORE_DIR", tmp_path / "prices")
+    monkeypatch.setattr(performance, "_PERF_CACHE_DIR", tmp_path / "perf_cache")
+
+
 def _fake_closes(tickers, n=10):
-    """All tickers start at 100, grow 1%/day."""
-    idx = pd.date_range("2024-01-02", periods=n, freq="B")
+    """All tickers start at 100, grow 1%/day, ending today."""
+    idx = pd.date_range(end=date.today(), periods=n, freq="B")
     return pd.DataFrame(
         {t: [100 * (1.01**i) for i in range(n)] for t in tickers}, index=idx
     )
@@ -25,7 +36,7 @@ def test_portfolio_series_per_portfolio():
         ),
     ]
     closes = _fake_closes(["AAPL", "MSFT", "SPY", "VTI"])
-    with patch("src.performance.yf.download", return_value=closes):
+    with patch("src.price_store.yf.download", return_value=closes):
         result = tracked_portfolios_performance(portfolios)
     assert "P1" in result
     assert "P2" in result
@@ -39,7 +50,7 @@ def test_benchmarks_always_included():
         )
     ]
     closes = _fake_closes(["AAPL", "SPY", "VTI"])
-    with patch("src.performance.yf.download", return_value=closes):
+    with patch("src.price_store.yf.download", return_value=closes):
         result = tracked_portfolios_performance(portfolios)
     assert "spy" in result
     assert "vti" in result
@@ -53,7 +64,7 @@ def test_committee_included_when_provided():
         )
     ]
     closes = _fake_closes(["AAPL", "SPY", "VTI", "MSFT"])
-    with patch("src.performance.yf.download", return_value=closes):
+    with patch("src.price_store.yf.download", return_value=closes):
         result = tracked_portfolios_performance(
             portfolios,
             committee={"tickers": ["AAPL", "MSFT"], "weights": [60.0, 40.0]},
@@ -69,7 +80,7 @@ def test_series_normalized_to_one_at_start():
         )
     ]
     closes = _fake_closes(["AAPL", "SPY", "VTI"])
-    with patch("src.performance.yf.download", return_value=closes):
+    with patch("src.price_store.yf.download", return_value=closes):
         result = tracked_portfolios_performance(portfolios)
     first_val = list(result["P1"]["series"].values())[0]
     assert abs(first_val - 1.0) < 1e-6
@@ -77,8 +88,148 @@ def test_series_normalized_to_one_at_start():
 
 def test_empty_portfolios_returns_benchmarks_only():
     closes = _fake_closes(["SPY", "VTI"])
-    with patch("src.performance.yf.download", return_value=closes):
+    with patch("src.price_store.yf.download", return_value=closes):
         result = tracked_portfolios_performance([])
     assert "spy" in result
     assert "vti" in result
     assert all(v["type"] == "benchmark" for v in result.values())
+
+
+def test_different_portfolios_keep_separate_cache_entries():
+    p1 = [
+        TrackedPortfolio(
+            name="P1", positions=[PortfolioPosition(ticker="AAPL", shares=1.0)]
+        )
+    ]
+    p2 = [
+        TrackedPortfolio(
+            name="P2", positions=[PortfolioPosition(ticker="MSFT", shares=1.0)]
+        )
+    ]
+    closes = _fake_closes(["AAPL", "MSFT", "SPY", "VTI"])
+    with patch("src.price_store.yf.download", return_value=closes):
+        first = tracked_portfolios_performance(p1)
+        tracked_portfolios_performance(p2)
+    with patch("src.performance.price_store.load_closes") as load:
+        assert tracked_portfolios_performance(p1) == first
+        assert "P2" in tracked_portfolios_performance(p2)
+    load.assert_not_called()
+
+
+def test_perf_cache_evicts_least_recently_used(monkeypatch):
+    performance._save_cache("old", {"x": "a" * 100})
+    performance._save_cache("new", {"x": "b" * 100})
+    entry_size = (performance._PERF_CACHE_DIR / "old.json").stat().st_size
+    monkeypatch.setattr(performance, "_PERF_CACHE_MAX_BYTES", int(entry_size * 2.5))
+    os.utime(performance._PERF_CACHE_DIR / "old.json", (1000, 1000))
+    os.utime(performance._PERF_CACHE_DIR / "new.json", (2000, 2000))
+
+    assert performance._load_cache("old") is not None  # hit: now most recent
+    performance._save_cache("newest", {"x": "c" * 100})
+    assert performance._load_cache("new") is None
+    assert performance._load_cache("old") is not None
+    assert performance._load_cache("newest") is not None
+
+
+def test_holding_values_match_per_series_sum():
+    idx = pd.date_range("2026-01-01", periods=4, freq="D")
+    prices = pd.DataFrame(
+        {"A": [10.0, 11.0, 12.0, 13.0], "B": [None, 20.0, 21.0, 22.0]}, index=idx
+    )
+    values = performance._holding_values(prices, [{"A": 2.0}, {"A": 1.0, "B": 0.5}])
+    assert list(values[:, 0]) == [20.0, 22.0, 24.0, 26.0]
+    assert pd.isna(values[0, 1])  # B not listed yet
+    assert list(values[1:, 1]) == [21.0, 22.5, 24.0]
+
+
+def _legacy(series_by_name: dict[str, dict[str, float]]) -> dict:
+    return {
+        name: {"type": "portfolio", "total_return_pct": 0.0, "series": series}
+        for name, series in series_by_name.items()
+    }
+
+
+def test_perf_cache_concurrent_writers_and_corrupt_entries():
+    payloads = [{"x": str(i) * 20_000} for i in range(16)]
+    with ThreadPoolExecutor(16) as pool:
+        list(pool.map(lambda r: performance._save_cache("same", r), payloads))
+    assert performance._load_cache("same") in payloads
+    assert not list(performance._PERF_CACHE_DIR.glob("*.tmp"))
+
+    (performance._PERF_CACHE_DIR / "broken.json").write_text("{not json")
+    assert performance._load_cache("broken") is None
+    assert 'app_cache_requests_total{cache="perf_cache",result="miss"} 1' in metrics.render()
+
+
+def test_columnar_shares_one_axis_and_rebases_to_range_start():
+    today = date(2026, 3, 13)  # a Friday
+    days = [f"2026-03-{d:02d}T00:00:00" for d in (9, 10, 11, 12, 13)]
+    result = _legacy(
+        {
+            "A": dict(zip(days, [1.0, 1.1, 1.2, 1.3, 1.4])),
+            "B": dict(zip(days[1:], [2.0, 2.0, 2.5, 2.5])),  # listed a day later
+        }
+    )
+    out = performance.columnar(result, "3D", today=today)
+    assert out["dates"] == ["2026-03-10", "2026-03-11", "2026-03-12", "2026-03-13"]
+    assert out["series"]["A"]["values"] == [0.0, 10.0, 20.0, 30.0]
+    assert out["series"]["B"]["values"] == [0.0, 0.0, 50.0, 50.0]
+    assert out["series"]["A"]["type"] == "portfolio"
+
+    full = performance.columnar(result, "1Y", today=today)
+    assert full["dates"][0] == "2026-03-09"
+    assert full["series"]["B"]["values"][0] is None
+
+
+def test_columnar_downsamples_long_ranges_within_budget():
+    idx = pd.bdate_range(end=date.today(), periods=1250)
+    result = _legacy(
+        {
+            name: {ts.isoformat(): 1 + 0.001 * i * (k + 1) for i, ts in enumerate(idx)}
+            for k, name in enumerate(["A", "B"])
+        }
+    )
+    out = performance.columnar(result, "5Y", max_points=200)
+    assert len(out["dates"]) <= 200
+    assert out["dates"][0] == idx[0].date().isoformat()
+    assert out["dates"][-1] == idx[-1].date().isoformat()
+    assert all(len(s["values"]) == len(out["dates"]) for s in out["series"].values())
+
+
+def test_columnar_stays_within_budget_with_many_series():
+    idx = pd.bdate_range(end=date.today(), periods=500)
+    # LTTB keeps 3 points per series: 40 series alone overshoot a budget of 20
+    walks = np.cumsum(np.random.default_rng(0).normal(0, 0.01, (len(idx), 40)), axis=0)
+    result = _legacy(
+        {
+            f"S{k}": {ts.isoformat(): 1 + float(walks[i, k]) for i, ts in enumerate(idx)}
+            for k in range(40)
+        }
+    )
+    out = performance.columnar(result, "5Y", max_points=20)
+    assert len(out["dates"]) == 20
+    assert out["dates"][0] == idx[0].date().isoformat()
+    assert out["dates"][-1] == idx[-1].date().isoformat()
+    assert all(len(s["values"]) == 20 for s in out["series"].values())
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    values = [0.0] * 100
+    values[37] = 10.0
+    kept = performance.lttb(values, 10)
+    assert len(kept) == 10
+    assert kept[0] == 0 and kept[-1] == 99
+    assert 37 in kept
+
+
+def test_tracked_version_names_the_cached_result(monkeypatch):
+    monkeypatch.setattr(performance, "_cached_at", {})
+    p1 = [TrackedPortfolio(name="P1", positions=[PortfolioPosition(ticker="AAPL", shares=1.0)])]
+    assert performance.tracked_version(p1) is None  # nothing computed yet
+    closes = _fake_closes(["AAPL", "SPY", "VTI"])
+    with patch("src.price_store.yf.download", return_value=closes):
+        tracked_portfolios_performance(p1)
+    version = performance.tracked_version(p1)
+    assert version is not None
+    p1[0].positions[0].shares = 2.0
+    assert performance.tracked_version(p1) is None
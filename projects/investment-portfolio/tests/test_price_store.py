@@ -0,0 +1,150 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src import price_store
+
+
+@pytest.fixture(autouse=True)
+def _isolated_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(price_store, "_STORE_DIR", tmp_path / "prices")
+
+
+def _closes(tickers, start, n, base=100.0):
+    idx = pd.date_range(start, periods=n, freq="D")
+    return pd.DataFrame({t: [base + i for i in range(n)] for t in tickers}, index=idx)
+
+
+def _expire_all() -> None:
+    index = price_store._load_index()
+    for meta in index.values():
+        meta["fetched_at"] = "2000-01-01T00:00:00+00:00"
+    price_store._save_index(index)
+
+
+def test_first_load_downloads_from_since():
+    since = date(2026, 1, 1)
+    with patch(
+        "src.price_store.yf.download", return_value=_closes(["AAPL"], since, 5)
+    ) as download:
+        closes = price_store.load_closes(["AAPL"], since)
+    assert download.call_args.kwargs["start"] == since
+    assert list(closes["AAPL"]) == [100, 101, 102, 103, 104]
+
+
+def test_fresh_store_does_not_download():
+    since = date(2026, 1, 1)
+    with patch("src.price_store.yf.download", return_value=_closes(["AAPL"], since, 5)):
+        price_store.load_closes(["AAPL"], since)
+    with patch("src.price_store.yf.download") as download:
+        closes = price_store.load_closes(["AAPL"], since + timedelta(days=2))
+    download.assert_not_called()
+    assert list(closes["AAPL"]) == [102, 103, 104]
+
+
+def test_expired_store_downloads_only_from_last_bar():
+    since = date(2026, 1, 1)
+    with patch("src.price_store.yf.download", return_value=_closes(["AAPL"], since, 5)):
+        price_store.load_closes(["AAPL"], since)
+    _expire_all()
+    last = since + timedelta(days=4)
+    with patch(
+        "src.price_store.yf.download", return_value=_closes(["AAPL"], last, 3, base=104)
+    ) as download:
+        closes = price_store.load_closes(["AAPL"], since)
+    assert download.call_args.kwargs["start"] == last
+    assert list(closes["AAPL"]) == [100, 101, 102, 103, 104, 105, 106]
+
+
+def test_adjusted_history_is_rescaled_when_overlap_moves():
+    since = date(2026, 1, 1)
+    with patch("src.price_store.yf.download", return_value=_closes(["AAPL"], since, 2)):
+        price_store.load_closes(["AAPL"], since)
+    _expire_all()
+    # 2-for-1 split: Yahoo now reports the stored last bar (101) as 50.5
+    split = pd.DataFrame(
+        {"AAPL": [50.5, 51.0]},
+        index=pd.date_range(since + timedelta(days=1), periods=2, freq="D"),
+    )
+    with patch("src.price_store.yf.download", return_value=split):
+        closes = price_store.load_closes(["AAPL"], since)
+    assert list(closes["AAPL"]) == [50.0, 50.5, 51.0]
+
+
+def test_unfinished_bar_is_not_stored_or_used_to_rescale():
+    since = date(2026, 1, 1)
+    today = since + timedelta(days=2)
+    mid_session = _closes(["AAPL"], since, 3)  # today's bar (102) is still moving
+    yesterday = today - timedelta(days=1)
+    with (
+        patch("src.price_store._last_completed_session", return_value=yesterday),
+        patch("src.price_store.yf.download", return_value=mid_session),
+    ):
+        closes = price_store.load_closes(["AAPL"], since)
+    assert list(closes["AAPL"]) == [100, 101]
+    _expire_all()
+    # After the close today settles at 110; history before it is unchanged
+    settled = pd.DataFrame(
+        {"AAPL": [100.0, 101.0, 110.0]}, index=pd.date_range(since, periods=3, freq="D")
+    )
+    with (
+        patch("src.price_store._last_completed_session", return_value=today),
+        patch(
+            "src.price_store.yf.download",
+            side_effect=lambda tickers, start, **kw: settled.loc[pd.Timestamp(start) :],
+        ) as download,
+    ):
+        closes = price_store.load_closes(["AAPL"], since)
+    assert download.call_args.kwargs["start"] == since + timedelta(days=1)
+    assert list(closes["AAPL"]) == [100, 101, 110]
+
+
+def test_last_completed_session_is_market_time():
+    before_close = datetime(2026, 3, 10, 19, 0, tzinfo=timezone.utc)  # 15:00 New York
+    after_close = datetime(2026, 3, 10, 21, 0, tzinfo=timezone.utc)  # 17:00 New York
+    assert price_store._last_completed_session(before_close) == date(2026, 3, 9)
+    assert price_store._last_completed_session(after_close) == date(2026, 3, 10)
+
+
+def test_market_open_is_weekday_regular_hours_in_new_york():
+    tuesday = datetime(2026, 3, 10, tzinfo=timezone.utc)
+    assert price_store._market_open(tuesday.replace(hour=14))  # 10:00 New York
+    assert not price_store._market_open(tuesday.replace(hour=13))  # 09:00
+    assert not price_store._market_open(tuesday.replace(hour=20, minute=30))  # 16:30
+    assert not price_store._market_open(datetime(2026, 3, 14, 15, tzinfo=timezone.utc))  # Sat
+
+
+def test_earlier_since_backfills():
+    since = date(2026, 1, 10)
+    with patch("src.price_store.yf.download", return_value=_closes(["AAPL"], since, 3)):
+        price_store.load_closes(["AAPL"], since)
+    earlier = since - timedelta(days=5)
+    with patch(
+        "src.price_store.yf.download", return_value=_closes(["AAPL"], earlier, 8)
+    ) as download:
+        closes = price_store.load_closes(["AAPL"], earlier)
+    assert download.call_args.kwargs["start"] == earlier
+    assert len(closes) == 8
+
+
+def test_concurrent_top_ups_keep_each_others_index_entries(tmp_path):
+    since = date(2026, 1, 1)
+    tickers = [f"T{i}" for i in range(8)]
+    barrier = threading.Barrier(len(tickers))
+
+    def download(group, start, **kwargs):
+        barrier.wait()  # every load has read the (empty) index before any saves
+        time.sleep(0.01)
+        return _closes(group, start, 3)
+
+    with patch("src.price_store.yf.download", side_effect=download):
+        with ThreadPoolExecutor(len(tickers)) as pool:
+            list(pool.map(lambda t: price_store.load_closes([t], since), tickers))
+
+    assert sorted(price_store._load_index()) == tickers
+    assert not list((tmp_path / "prices").glob("*.tmp"))
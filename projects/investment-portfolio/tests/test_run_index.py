@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src import config, runner
+from src.models import CommitteeRun, Pick, PortfolioHolding
+
+
+def _holding(ticker: str, weight: float, nominated_by: list[str]) -> PortfolioHolding:
+    return PortfolioHolding(
+        ticker=ticker,
+        company_name=ticker,
+        conviction="core",
+        weight=weight,
+        nominated_by=nominated_by,
+        rationale="",
+    )
+
+
+def _write_run(runs_dir, day: int) -> str:
+    ts = datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(days=day)
+    run = CommitteeRun(
+        run_id=f"run-{day}",
+        timestamp=ts,
+        claude_picks=[
+            Pick(ticker="AAPL", company_name="Apple", rationale="", conviction="core", member="claude")
+        ],
+        gpt_picks=[],
+        portfolio=[
+            _holding("AAPL", 60.0, ["claude", "gpt"]),
+            _holding("MSFT", 30.0, ["claude", "gemini"]),
+            _holding("SOLO", 10.0, ["gpt"]),
+        ],
+    )
+    key = ts.strftime("%Y%m%d_%H%M%S")
+    (runs_dir / f"{key}.json").write_text(run.model_dump_json())
+    return key
+
+
+@pytest.fixture
+def runs_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(runner, "RUNS_DIR", tmp_path / "runs")
+    config.update(tickers=[])
+    (tmp_path / "runs").mkdir()
+    return tmp_path / "runs"
+
+
+def test_list_runs_pages_summaries_newest_first(runs_dir):
+    keys = [_write_run(runs_dir, d) for d in range(3)]
+    page = runner.list_runs(limit=2, offset=0)
+    assert page["total"] == 3
+    assert [r["id"] for r in page["runs"]] == [keys[2], keys[1]]
+    summary = page["runs"][0]
+    assert summary["holding_count"] == 2  # single-nominee holding filtered like _filter_run
+    assert summary["top_tickers"] == ["AAPL", "MSFT"]
+    assert summary["pick_counts"] == {"claude": 1, "gpt": 0, "gemini": 0}
+
+
+def test_index_follows_files_and_exclusions(runs_dir, monkeypatch):
+    keys = [_write_run(runs_dir, d) for d in range(2)]
+    runner.list_runs()
+    (runs_dir / f"{keys[0]}.json").unlink()
+    config.update(tickers=["AAPL"])
+    page = runner.list_runs()
+    assert [r["id"] for r in page["runs"]] == [keys[1]]
+    assert page["runs"][0]["top_tickers"] == ["MSFT"]
+    assert page["runs"][0]["pick_counts"]["claude"] == 0
+
+
+def test_load_run_by_id(runs_dir):
+    key = _write_run(runs_dir, 0)
+    assert runner.load_run(key).run_id == "run-0"
+    assert runner.load_run("../../etc/passwd") is None
+    assert runner.load_run("20990101_000000") is None
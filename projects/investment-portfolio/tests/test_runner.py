@@ -0,0 +1,159 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from src import config, runner, store
+from src.committee import claude_member, gemini_member, gpt_member
+from src.models import Pick
+
+
+def _picks(member: str) -> list[Pick]:
+    return [
+        Pick(
+            ticker=f"{member.upper()}{i}",
+            company_name=f"{member} {i}",
+            rationale="",
+            conviction="moonshot" if i < 3 else "core",
+            member=member,
+        )
+        for i in range(13)
+    ]
+
+
+@pytest.fixture
+def fake_committee(tmp_path, monkeypatch):
+    prefetched: list[list[str]] = []
+
+    async def screen_universe():
+        await asyncio.sleep(0.05)
+        return [SimpleNamespace(ticker="AAA"), SimpleNamespace(ticker="BBB")]
+
+    async def get_research(client):
+        await asyncio.sleep(0.05)
+        return "macro briefing", []
+
+    def member(name, delay):
+        async def get_picks(client, screened_section="", research=""):
+            assert screened_section == "SCREENED"
+            if name == "claude":
+                assert research == "macro briefing"
+            await asyncio.sleep(delay)
+            return _picks(name)
+
+        return get_picks
+
+    async def prefetch(tickers):
+        prefetched.append(tickers)
+        return len(tickers)
+
+    async def enrich(picks):
+        return picks
+
+    monkeypatch.setattr(runner, "RUNS_DIR", tmp_path / "runs")
+    config.update(tickers=[])
+    monkeypatch.setattr(runner, "screen_universe", screen_universe)
+    monkeypatch.setattr(runner, "format_for_prompt", lambda screened: "SCREENED")
+    monkeypatch.setattr(runner, "prefetch", prefetch)
+    monkeypatch.setattr(runner, "enrich_picks_with_prices", enrich)
+    monkeypatch.setattr(claude_member, "get_research", get_research)
+    monkeypatch.setattr(claude_member, "get_picks", member("claude", 0.01))
+    monkeypatch.setattr(gpt_member, "get_picks", member("gpt", 0.03))
+    monkeypatch.setattr(gemini_member, "get_picks", member("gemini", 0.01))
+    return prefetched
+
+
+async def test_research_overlaps_screening_and_timeline_is_saved(fake_committee):
+    run = await runner.run_committee(None, None, None)
+
+    spans = {t.node: t for t in run.timeline}
+    assert spans["research"].start_s < spans["screen"].end_s
+    assert spans["gpt"].start_s >= spans["screen"].end_s
+    # Gemini does not wait for research or for the slower GPT member
+    assert spans["gemini"].end_s < spans["gpt"].end_s
+    assert spans["enrich"].start_s >= spans["gpt"].end_s
+    assert fake_committee == [["AAA", "BBB"]]
+    assert len(run.claude_picks) == len(run.gpt_picks) == len(run.gemini_picks) == 13
+    saved = runner.load_run(next(runner.RUNS_DIR.glob("*.json")).stem)
+    assert [t.node for t in saved.timeline] == [t.node for t in run.timeline]
+
+
+async def test_failed_member_is_excluded(fake_committee, monkeypatch):
+    async def broken(client, screened_section=""):
+        raise RuntimeError("provider down")
+
+    monkeypatch.setattr(gpt_member, "get_picks", broken)
+    run = await runner.run_committee(None, None, None)
+    assert run.gpt_picks == []
+    assert {t.node: t.status for t in run.timeline}["gpt"] == "failed"
+
+
+async def test_screening_failure_fails_the_run(fake_committee, monkeypatch):
+    async def broken():
+        raise ConnectionError("finviz down")
+
+    monkeypatch.setattr(runner, "screen_universe", broken)
+    with pytest.raises(ConnectionError):
+        await runner.run_committee(None, None, None)
+
+
+async def test_overrunning_members_cancelled_stale_picks_reused(fake_committee, monkeypatch):
+    cancelled = []
+
+    def stuck(name):
+        async def get_picks(client, screened_section=""):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(name)
+                raise
+
+        return get_picks
+
+    monkeypatch.setattr(gpt_member, "get_picks", stuck("gpt"))
+    monkeypatch.setattr(gemini_member, "get_picks", stuck("gemini"))
+    three_days_ago = (datetime.now(timezone.utc) - timedelta(days=3)).isoformat()
+    store.upsert(
+        "picks_cache",
+        "gpt",
+        {"cached_at": three_days_ago, "picks": [p.model_dump() for p in _picks("gpt")]},
+        three_days_ago,
+    )
+
+    run = await runner.run_committee(None, None, None, budget_s=0.3)
+
+    assert sorted(cancelled) == ["gemini", "gpt"]
+    assert len(run.claude_picks) == len(run.gpt_picks) == 13
+    assert run.gemini_picks == []
+    timings = {t.member: t for t in run.member_timings}
+    assert timings["claude"].outcome == "live"
+    assert timings["gpt"].outcome == "stale"
+    assert timings["gpt"].cache_age_s == pytest.approx(3 * 86400, abs=60)
+    assert timings["gemini"].outcome == "timed_out"
+    assert 0.1 < timings["gemini"].elapsed_s < 1
+    # Stale picks are not re-saved as fresh
+    assert store.get("picks_cache", "gpt")["cached_at"] == three_days_ago
+    saved = runner.load_run(next(runner.RUNS_DIR.glob("*.json")).stem)
+    assert saved.member_timings == run.member_timings
+
+
+async def test_member_slower_than_its_p95_is_hedged(fake_committee, monkeypatch):
+    calls = []
+
+    async def get_picks(client, screened_section=""):
+        calls.append(len(calls))
+        await asyncio.sleep(10 if len(calls) == 1 else 0.01)
+        return _picks("gpt")
+
+    monkeypatch.setattr(gpt_member, "get_picks", get_picks)
+    for day in range(1, 6):
+        store.upsert("run_index", f"202601{day:02d}_000000", {"latency": {"gpt": 0.05}})
+
+    run = await runner.run_committee(None, None, None, hedge=True)
+
+    timings = {t.member: t for t in run.member_timings}
+    assert calls == [0, 1]
+    assert timings["gpt"].hedged and timings["gpt"].elapsed_s < 1
+    assert not timings["gemini"].hedged  # no latency history
+    assert len(run.gpt_picks) == 13
@@ -0,0 +1,244 @@
+import asyncio
+import json
+import math
+import re
+
+import pandas as pd
+import pytest
+
+from src import config, screener
+from src.screener import _qualify
+
+
+def _merged(rows: list[dict]) -> pd.DataFrame:
+    return pd.DataFrame(rows)
+
+
+def test_roe_tiers_split_suggestions_and_fcf_candidates():
+    merged = _merged(
+        [
+            {"Ticker": "HIGH", "ROE": 0.35, "Company": "High Inc."},
+            {"Ticker": "NEG", "ROE": -0.05, "Company": "Neg Inc."},
+            {"Ticker": "MID", "ROE": 0.10, "Company": "Mid Inc."},
+            {"Ticker": "DEEP", "ROE": -0.40, "Company": "Deep Inc."},
+        ]
+    )
+    suggestions, needs_fcf = _qualify(merged)
+    assert [s.ticker for s in suggestions] == ["HIGH"]
+    assert [s.ticker for s in needs_fcf] == ["NEG"]
+    assert suggestions[0].tier == "suggestion"
+    assert needs_fcf[0].tier == "opportunity"
+
+
+def test_unparseable_roe_is_skipped():
+    merged = _merged(
+        [
+            {"Ticker": "BAD", "ROE": "n/a"},
+            {"Ticker": "NONE", "ROE": None},
+            {"Ticker": "OK", "ROE": "0.25"},
+        ]
+    )
+    suggestions, needs_fcf = _qualify(merged)
+    assert [s.ticker for s in suggestions] == ["OK"]
+    assert suggestions[0].roe == 0.25
+    assert needs_fcf == []
+
+
+def test_missing_cells_become_none_and_company_falls_back_to_ticker():
+    merged = _merged(
+        [
+            {
+                "Ticker": "AAPL",
+                "ROE": 0.5,
+                "Gross M": math.nan,
+                "Company": None,
+                "Industry": "",
+                "Earnings": math.nan,
+            }
+        ]
+    )
+    (stock,), _ = _qualify(merged)
+    assert stock.company_name == "AAPL"
+    assert stock.industry is None
+    assert stock.gross_margin is None
+    assert stock.earnings_date is None
+    assert stock.roic is None  # column absent entirely
+    assert isinstance(stock.roe, float)
+
+
+def _financial(rows: list[tuple[str, float]]) -> pd.DataFrame:
+    # Inside the default preset's bounds
+    passing = {"Gross M": 0.6, "Debt/Eq": 0.5, "Market Cap": 5e9, "PEG": 1.5}
+    return pd.DataFrame(
+        [{"Ticker": t, "ROE": roe, **passing} for t, roe in rows],
+        columns=["Ticker", "ROE", *passing],
+    )
+
+
+def _overview(tickers: list[str]) -> pd.DataFrame:
+    return pd.DataFrame(
+        [{"Ticker": t, "Company": f"{t} Inc.", "Sector": "Technology"} for t in tickers]
+    )
+
+
+def _expire(store_path) -> None:
+    data = json.loads(store_path.read_text())
+    data["cached_at"] = "2000-01-01T00:00:00+00:00"
+    store_path.write_text(json.dumps(data))
+
+
+@pytest.fixture
+def finviz(tmp_path, monkeypatch):
+    """Fake Finviz/yfinance that records every call screen_universe makes."""
+    calls = {"financial": 0, "overview": [], "fcf": []}
+    universe = {"rows": [("AAPL", 0.4), ("TURN", -0.05)]}
+
+    def financial():
+        calls["financial"] += 1
+        return _financial(universe["rows"])
+
+    def overview(tickers=None):
+        calls["overview"].append(tickers)
+        return _overview(tickers or [t for t, _ in universe["rows"]])
+
+    async def fetch_fcf(tickers):
+        calls["fcf"].extend(tickers)
+        return [(t, {"freeCashflow": 90, "ebitda": 100, "totalRevenue": 1000}) for t in tickers]
+
+    monkeypatch.setattr(screener, "_SCREENER_CACHE_PATH", tmp_path / "screener.json")
+    monkeypatch.setattr(screener, "_run_financial_screener", financial)
+    monkeypatch.setattr(screener, "_run_overview_screener", overview)
+    monkeypatch.setattr(screener, "_fetch_fcf_infos", fetch_fcf)
+    return calls, universe, tmp_path / "screener.json"
+
+
+async def test_cold_screen_fetches_everything(finviz):
+    calls, _, _ = finviz
+    stocks = await screener.screen_universe()
+    assert {(s.ticker, s.tier) for s in stocks} == {
+        ("AAPL", "suggestion"),
+        ("TURN", "opportunity"),
+    }
+    assert calls["overview"] == [None]
+    assert calls["fcf"] == ["TURN"]
+
+
+async def test_fresh_store_skips_network(finviz):
+    calls, _, _ = finviz
+    await screener.screen_universe()
+    await screener.screen_universe()
+    assert len(calls["overview"]) == 1
+    assert calls["fcf"] == ["TURN"]
+
+
+async def test_expired_store_refreshes_only_new_tickers(finviz):
+    calls, universe, store_path = finviz
+    await screener.screen_universe()
+    _expire(store_path)
+    universe["rows"].append(("NEWCO", 0.3))
+
+    stocks = await screener.screen_universe()
+    assert {s.ticker for s in stocks} == {"AAPL", "TURN", "NEWCO"}
+    assert calls["overview"] == [None, ["NEWCO"]]
+    assert calls["fcf"] == ["TURN"]  # verdict still fresh
+
+
+async def test_exclusions_apply_to_stored_universe(finviz, monkeypatch):
+    await screener.screen_universe()
+    config.update(tickers=["AAPL"])
+    stocks = await screener.screen_universe()
+    assert [s.ticker for s in stocks] == ["TURN"]
+
+
+async def test_presets_evaluate_locally_from_one_snapshot(finviz, monkeypatch):
+    calls, _, _ = finviz
+    monkeypatch.setitem(screener.PRESETS, "large", {"Market Cap": (1e10, None)})
+    screened = await screener.screen_presets(["default", "large"])
+    assert {s.ticker for s in screened["default"]} == {"AAPL", "TURN"}
+    assert screened["large"] == []
+
+    monkeypatch.setitem(screener.PRESETS, "default", {"Gross M": (0.7, None)})
+    assert await screener.screen_universe() == []
+    assert calls["financial"] == 1
+
+
+async def test_concurrent_screens_share_one_crawl(finviz):
+    calls, _, _ = finviz
+    first, second = await asyncio.gather(
+        screener.screen_universe(), screener.screen_universe()
+    )
+    assert {s.ticker for s in first} == {s.ticker for s in second} == {"AAPL", "TURN"}
+    assert calls["financial"] == 1
+
+
+async def test_filtered_store_from_before_the_snapshot_is_recrawled(finviz):
+    calls, _, store_path = finviz
+    await screener.screen_universe()
+    data = json.loads(store_path.read_text())
+    del data["format"]
+    store_path.write_text(json.dumps(data))
+
+    await screener.screen_universe()
+    assert calls["financial"] == 2
+    assert calls["overview"] == [None]  # profiles kept
+    assert calls["fcf"] == ["TURN"]  # so are FCF verdicts
+
+
+async def test_empty_crawl_backs_off_and_keeps_the_previous_snapshot(finviz, monkeypatch):
+    calls, universe, store_path = finviz
+    await screener.screen_universe()
+    _expire(store_path)
+    universe["rows"].clear()
+
+    for _ in range(3):
+        stocks = await screener.screen_universe()
+        assert {s.ticker for s in stocks} == {"AAPL", "TURN"}
+    assert calls["financial"] == 2
+
+    monkeypatch.setattr(screener, "_EMPTY_CRAWL_RETRY_SECONDS", -1)
+    universe["rows"].append(("NEWCO", 0.3))
+    stocks = await screener.screen_universe()
+    assert [s.ticker for s in stocks] == ["NEWCO"]
+    assert calls["financial"] == 3
+
+
+def _stock(ticker: str, roe: float, industry: str = "Software", roic=None) -> screener.ScreenedStock:
+    return screener.ScreenedStock(
+        ticker=ticker,
+        company_name=f"{ticker} Holdings Inc.",
+        industry=industry,
+        gross_margin=0.6,
+        roe=roe,
+        roic=roic,
+        operating_margin=None,
+        earnings_date="Feb 26/a",
+        tier="suggestion" if roe >= 0 else "opportunity",
+    )
+
+
+def test_prompt_table_groups_by_industry_and_leads_rows_with_tickers():
+    stocks = [
+        _stock("MSFT", 0.34, "Software", roic=0.3),
+        _stock("TURN", -0.05, "REIT - Retail"),
+        _stock("NVDA", 1.1, "Semiconductors"),
+    ]
+    text = screener.format_for_prompt(stocks)
+    lines = text.splitlines()
+    assert "NVDA|NVDA Holdings|60|110|||Feb 26/a" in lines
+    assert lines.index("## Semiconductors") < lines.index("## Software")
+    assert lines.index("## Software") < lines.index("## REIT - Retail")  # suggestions first
+    # Only stock rows may start with a ticker-like token (the fake providers rely on it)
+    ticker_re = re.compile(r"^([A-Z][A-Z0-9.\-]{0,6})\b", re.MULTILINE)
+    assert ticker_re.findall(text) == ["NVDA", "MSFT", "TURN"]
+    assert "omitted" not in text
+
+
+def test_prompt_budget_truncates_lowest_ranked_deterministically():
+    stocks = [_stock(f"T{i:03d}", 0.2 + i / 1000, f"Industry {i % 7}") for i in range(300)]
+    text = screener.format_for_prompt(stocks, max_tokens=1000)
+    assert screener.estimate_tokens(text) <= 1000
+    kept = {line.split("|")[0] for line in text.splitlines() if line.startswith("T")}
+    assert 0 < len(kept) < 300
+    assert kept == {f"T{i:03d}" for i in range(300 - len(kept), 300)}  # highest ROE
+    assert f"({300 - len(kept)} lower-ranked screened stocks omitted for length.)" in text
+    assert screener.format_for_prompt(list(reversed(stocks)), max_tokens=1000) == text
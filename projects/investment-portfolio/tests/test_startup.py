@@ -0,0 +1,51 @@
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.lazy import lazy_import
+
+_ROOT = Path(__file__).parent.parent
+_HEAVY = ("anthropic", "openai", "google.genai", "yfinance", "pandas", "numpy", "finvizfinance", "openpyxl")
+
+
+def test_importing_the_app_loads_no_heavy_dependencies():
+    # Lazy modules sit in sys.modules as placeholders until first use
+    code = (
+        "import sys, types, api\n"
+        f"print(','.join(m for m in {_HEAVY!r} if type(sys.modules.get(m)) is types.ModuleType))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=_ROOT, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_lazy_module_loads_on_first_attribute_access():
+    code = (
+        "import sys, types\n"
+        "from src.lazy import lazy_import\n"
+        "mod = lazy_import('csv')\n"
+        "assert type(sys.modules['csv']) is not types.ModuleType\n"
+        "assert mod.reader is not None and type(mod) is types.ModuleType\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=_ROOT, check=True)
+
+
+def test_lazy_module_first_access_from_many_threads(tmp_path, monkeypatch):
+    # Slow enough that every thread arrives while the first is still importing
+    (tmp_path / "slow_lazy_mod.py").write_text("import time\ntime.sleep(0.2)\nVALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    mod = lazy_import("slow_lazy_mod")
+    barrier = threading.Barrier(30)
+
+    def touch(_):
+        barrier.wait()
+        return mod.VALUE
+
+    try:
+        with ThreadPoolExecutor(30) as pool:
+            assert list(pool.map(touch, range(30))) == [42] * 30
+    finally:
+        sys.modules.pop("slow_lazy_mod", None)
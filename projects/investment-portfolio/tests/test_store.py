@@ -0,0 +1,55 @@
+import json
+import threading
+
+from src import store
+
+
+def test_upsert_replaces_single_row():
+    store.upsert("advisor_cache", "AAPL", {"v": 1}, "2026-01-01T00:00:00+00:00")
+    store.upsert("advisor_cache", "MSFT", {"v": 2})
+    store.upsert("advisor_cache", "AAPL", {"v": 3})
+    assert store.get("advisor_cache", "AAPL") == {"v": 3}
+    assert store.get_many("advisor_cache", ["AAPL", "MSFT", "NOPE"]) == {
+        "AAPL": {"v": 3},
+        "MSFT": {"v": 2},
+    }
+    assert store.get("advisor_cache", "NOPE") is None
+
+
+def test_concurrent_writers_do_not_lose_updates():
+    def write(worker: int) -> None:
+        for i in range(25):
+            store.upsert("enrichment_cache", f"T{worker}_{i}", {"i": i})
+            store.log_append({"timestamp": f"{worker}-{i}", "ticker": f"T{worker}"})
+
+    threads = [threading.Thread(target=write, args=(w,)) for w in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(store.get_many("enrichment_cache", [f"T{w}_{i}" for w in range(4) for i in range(25)])) == 100
+    assert len(store.log_entries()) == 100
+
+
+def test_legacy_json_imported_once():
+    data_dir = store._db_path().parent
+    data_dir.mkdir(parents=True)
+    (data_dir / "portfolios.json").write_text(
+        json.dumps([{"name": "Legacy", "positions": []}])
+    )
+    (data_dir / "advisor_log.json").write_text(
+        json.dumps([{"timestamp": "2026-01-01", "ticker": "AAPL", "recommendation": "buy"}])
+    )
+    (data_dir / "picks_cache").mkdir()
+    (data_dir / "picks_cache" / "gpt.json").write_text(
+        json.dumps({"cached_at": "2026-01-01T00:00:00+00:00", "picks": []})
+    )
+
+    assert list(store.all_items("portfolios")) == ["Legacy"]
+    assert store.log_entries()[0]["ticker"] == "AAPL"
+    assert store.get("picks_cache", "gpt")["picks"] == []
+
+    # Deleting the last row must not resurrect it from the legacy file
+    store.delete("portfolios", "Legacy")
+    store._local.conns.clear()
+    assert store.all_items("portfolios") == {}
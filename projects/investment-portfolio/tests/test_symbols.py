@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from src import advisor, screener, store, symbols
+
+
+@pytest.fixture(autouse=True)
+def universe(tmp_path, monkeypatch):
+    path = tmp_path / "screener.json"
+    path.write_text(
+        json.dumps(
+            {
+                "cached_at": None,
+                "universe": [],
+                "tickers": {
+                    "AAPL": {"row": {"Company": "Apple Inc."}},
+                    "APP": {"row": {"Company": "AppLovin Corporation"}},
+                    "AMAT": {"row": {"Company": "Applied Materials, Inc."}},
+                    "MSFT": {"row": {"Company": "Microsoft Corporation"}},
+                    "META": {"row": {"Company": "Meta Platforms, Inc."}},
+                },
+            }
+        )
+    )
+    monkeypatch.setattr(screener, "_SCREENER_CACHE_PATH", path)
+    symbols.invalidate()
+    yield
+    symbols.invalidate()
+
+
+def test_resolve_exact_symbol_and_company_name():
+    assert symbols.resolve("aapl") == "AAPL"
+    assert symbols.resolve("Apple") == "AAPL"
+    assert symbols.resolve("microsoft corp") == "MSFT"
+    assert symbols.resolve("Nonexistent Widgets") is None
+
+
+def test_search_ranks_exact_then_prefix_then_fuzzy():
+    results = symbols.search("APP")
+    assert results[0] == {"symbol": "APP", "name": "AppLovin Corporation", "match": "exact"}
+    assert {r["symbol"] for r in results} >= {"AAPL", "AMAT"}  # name prefix "app…"
+    assert [r["symbol"] for r in symbols.search("applied mat")] == ["AMAT"]
+    assert symbols.search("MSTF")[0] == {
+        "symbol": "MSFT",
+        "name": "Microsoft Corporation",
+        "match": "fuzzy",
+    }
+
+
+def test_index_includes_run_names():
+    store.upsert(
+        "run_index",
+        "20260101_000000",
+        {"holdings": [["NVDA", "core", 10.0, 2]], "picks": {}, "names": {"NVDA": "NVIDIA Corporation"}},
+    )
+    symbols.invalidate()
+    assert symbols.resolve("nvidia") == "NVDA"
+
+
+async def test_network_search_only_on_miss_and_cached(monkeypatch):
+    calls = []
+
+    async def search(query):
+        calls.append(query)
+        return [{"symbol": "TSM", "quoteType": "EQUITY", "longname": "Taiwan Semiconductor"}]
+
+    monkeypatch.setattr(advisor.market_data, "search", search)
+    assert await advisor._resolve_ticker("AAPL") == "AAPL"
+    assert calls == []
+    assert await advisor._resolve_ticker("taiwan semi") == "TSM"
+    assert await advisor._resolve_ticker("taiwan semi") == "TSM"
+    assert calls == ["taiwan semi"]
+    symbols.invalidate()
+    assert symbols.resolve("TSM") == "TSM"  # searched symbols join the index